@@ -3,27 +3,37 @@
 __version__: str = '1.0'
 
 from nyeda.exceptions import NYEDAException, NYEDASEG
-from nyeda.features.encdec import base64tools, encrypter
+from nyeda.features.encdec import base64tools, encrypter, kdftools, Cryptogram
 from nyeda.features.bundler import bundler
+from nyeda.features.payload import payloadtools
 from nyeda.types.archive import ArchByte
 
 from argpi import PathWays, Definition
 
 from colorama import init as col_i, deinit as col_di, Fore as col
 
+from PIL import Image
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Union, List, Dict, Set, Tuple, Any, Callable
 
 import subprocess
 import tempfile
-import pickle
+import plistlib
+import platform
+import hashlib
 import shutil
+import json
+import glob
+import time
 import sys
 import pwd
 import os
 
 CONFIGURATION = Path('~/Library/Application Support/NYEDA').expanduser().resolve()
 
-class _Main(bundler, encrypter, base64tools):
+class _Main(bundler, encrypter, base64tools, payloadtools):
     def __init__(
             self,
             source: Path,
@@ -32,53 +42,105 @@ class _Main(bundler, encrypter, base64tools):
             encrypt: bool = False,
             passkey: bytes = base64tools.encode(b'password!'),
             salt: bytes = base64tools.encode(os.urandom(16)),
+            literal: bool = False,
+            icon: Union[Path, None] = None,
+            workers: Union[int, None] = None,
+            codec: str = 'gzip',
+            level: Union[int, None] = None,
+            kdf: Union[Tuple[int, int, int, int], None] = None,
+            normalize: bool = True,
     ) -> None:
-        # Generalize the source and destination
+        # Generalize the source and destination (a batch passes the
+        # destination it has already normalized and reserved)
         __source__ = source.expanduser().resolve()
-        __destination__ = self.normalizer(destination.expanduser().resolve())
+        __destination__ = destination.expanduser().resolve()
+        if normalize:
+            __destination__ = self.normalizer(__destination__)
 
         # Check the existence of the source
         if not __source__.exists(): return NYEDASEG(NYEDAException, f'{__source__} does not exist.')
 
-        # Bundle the source into archbyte
-        __bundled__ = self.bundle(__source__)
-
-        # Encrypt the bundle if instructed.
+        # Check the passkey and salt
         if encrypt is True:
-            # Check the passkey and salt
             if not self.is_urlsafe_b64encoded(passkey): return NYEDASEG(NYEDAException, 'passkey must be url-safe base64 encoded bytes.')
             if not self.is_urlsafe_b64encoded(salt): return NYEDASEG(NYEDAException, 'salt must be url-safe base64 encoded bytes.')
 
-            # encrypt the bundled archive
-            __bundled__ = self.encrypt(__bundled__, passkey, salt)
-
-            # dump the cryptogram into bytes
-            __bundled__ = pickle.dumps(__bundled__)
-
-            # encode the dumped cryptogram into base64
-            __bundled__ = self.encode(__bundled__)
-        
+        # In literal mode, the data is written into the source itself and
+        # the container is frozen for this archive alone, else a copy of
+        # the prebuilt stub is made and the data is embedded into it as a
+        # binary payload. A binary payload is streamed straight into the
+        # container (through the cipher if encrypted), so the bundle is
+        # never held in memory.
+        if literal is True:
+            # Bundle the source into archbyte.
+            __bundled__ = self.bundle(__source__, workers, codec, level)
+
+            # Encrypt the bundle (as it is, no pickle) and dump the
+            # cryptogram into its binary container (raw ciphertext behind
+            # a small header, no base64) if instructed.
+            if encrypt is True:
+                __bundled__ = Cryptogram.dump(self.encrypt(__bundled__, passkey, salt, kdf))
+
+            self._app = self.freeze(__destination__.name, self.literalize(__bundled__), __destination__.parent)
+        elif encrypt is True:
+            __bundled__ = lambda target: self.bundle_encrypted_to(__source__, target, passkey, salt, kdf, workers, codec, level)
+            self._app = self.assemble(__destination__, __bundled__, icon, self.KIND_CRYPTOGRAM)
+        else:
+            __bundled__ = lambda target: self.bundle_to(__source__, target, workers, codec, level)
+            self._app = self.assemble(__destination__, __bundled__, icon)
+
+        # Apply permissions to the resultant file
+        # As this script must be run with sudo priviledges
+        # The `SUDO_USER` env var must be present
+        __user__ = os.environ.get('SUDO_USER', os.popen('whoami').read().replace('\n', ''))
+        self.arecp(self._app, pwd.getpwnam(__user__))
+    
+    def bundle_encrypted_to(
+            self,
+            source: Path,
+            target: Path,
+            passkey: bytes,
+            salt: bytes,
+            kdf: Union[Tuple[int, int, int, int], None],
+            workers: Union[int, None],
+            codec: str,
+            level: Union[int, None],
+    ) -> int:
+        # The bundle is streamed into a temporary file and from there
+        # through the cipher into the target (a batch of chunks at a
+        # time), the temporary file is removed right after.
+        __fd__, __plain__ = tempfile.mkstemp(prefix='nyeda-', suffix='.bundle')
+        os.close(__fd__)
+        try:
+            self.bundle_to(source, Path(__plain__), workers, codec, level)
+            return self.encrypt_file(Path(__plain__), target, passkey, salt, kdf, workers)
+        finally:
+            os.remove(__plain__)
+
+    def literalize(self, bundled: Union[ArchByte, bytes]) -> str:
         # decide the data adder
-        if isinstance(__bundled__, ArchByte):
-            __adder__ = f'DATA: Union[ArchByte[ArchByteInt], bytes] = ArchByte({[x for x in __bundled__]})'
+        if isinstance(bundled, ArchByte):
+            __adder__ = f'DATA: Union[ArchByte[ArchByteInt], bytes] = ArchByte({bytes(bundled)!r})'
         else:
-            __adder__ = f'DATA: Union[ArchByte[ArchByteInt], bytes] = {__bundled__}'
-        
+            __adder__ = f'DATA: Union[ArchByte[ArchByteInt], bytes] = {bundled}'
+
         # Prepare the transformative content
         with open(Path(CONFIGURATION, '.new.py'), 'r') as ref:
-            __newpy__ = ref.read().replace(
+            return ref.read().replace(
                 'DATA: Union[ArchByte[ArchByteInt], bytes]',
                 __adder__
             )
-        
+
+    @staticmethod
+    def freeze(name: str, newpy: str, output: Path) -> Path:
         # Use a temporary directory to do the deeds
         with tempfile.TemporaryDirectory(prefix='NYEDA-', delete=False) as __workdir__:
             # Move into the workdir
             os.chdir(__workdir__)
 
             # Create the transformative content generator
-            with open(Path(__workdir__, __destination__.name + '.py'), 'w') as ref:
-                ref.write(__newpy__)
+            with open(Path(__workdir__, name + '.py'), 'w') as ref:
+                ref.write(newpy)
             
             # Make the build script for pyinstaller
             __buildcmd__ = [
@@ -91,7 +153,7 @@ class _Main(bundler, encrypter, base64tools):
                 '--noconfirm',
                 '--noconsole',
                 '--name',
-                __destination__.name,
+                name,
                 '--icon',
                 str(Path(CONFIGURATION, '.ico')),
                 '--distpath',
@@ -100,27 +162,80 @@ class _Main(bundler, encrypter, base64tools):
                 str(Path(__workdir__, 'build')),
                 '--specpath',
                 str(Path(__workdir__)),
-                str(Path(__workdir__, __destination__.name + '.py'))
+                str(Path(__workdir__, name + '.py'))
             ]
 
             # Try to run the command as a subprocess.
             try: subprocess.check_call(__buildcmd__)
             except subprocess.CalledProcessError as e: return NYEDASEG(NYEDAException, 'Build Error:', str(e))
 
-            # copy the .app from __workdir__/dist/__destination__.name.app
-            os.system(f'sudo cp -r \"{Path(__workdir__, 'dist', __destination__.name + '.app')}\" \"{Path(__destination__.parent)}\"')
+            # copy the .app from __workdir__/dist/name.app
+            os.system(f'sudo cp -r \"{Path(__workdir__, 'dist', name + '.app')}\" \"{output}\"')
+        
+        os.system(f'sudo rm -rf {__workdir__}')
+        return Path(output, name + '.app')
+
+    @staticmethod
+    def stub() -> Path:
+        # The stub is the container frozen without any data. It is built
+        # once per platform, version and container template and reused
+        # for every archive afterwards.
+        with open(Path(CONFIGURATION, '.new.py'), 'r') as ref:
+            __newpy__ = ref.read()
+        
+        __template__ = hashlib.sha256(__newpy__.encode()).hexdigest()[:16]
+        __stubs__ = Path(CONFIGURATION, 'stubs', f'{sys.platform}-{platform.machine()}-{__version__}-{__template__}')
+
+        if not Path(__stubs__, 'container.app').exists():
+            __stubs__.mkdir(parents=True, exist_ok=True)
+            _Main.freeze('container', __newpy__, __stubs__)
+        
+        return Path(__stubs__, 'container.app')
 
-            # Apply permissions to the resultant file
-            # As this script must be run with sudo priviledges
-            # The `SUDO_USER` env var must be present
-            __user__ = os.environ.get('SUDO_USER', os.popen('whoami').read().replace('\n', ''))
-            self.arecp(Path(__destination__.parent, __destination__.name + '.app'), pwd.getpwnam(__user__))
+    def assemble(self, destination: Path, bundled: Union[ArchByte, bytes, Callable[[Path], int]], icon: Union[Path, None] = None, kind: int = payloadtools.KIND_BUNDLE) -> Path:
+        __app__ = Path(destination.parent, destination.name + '.app')
 
-            self._app = Path(__destination__.parent, __destination__.name + '.app')
-            self.__workdir__ = __workdir__
+        # copy the stub (symlinks inside the .app must stay symlinks)
+        shutil.copytree(self.stub(), __app__, symlinks=True)
+
+        # Embed the binary payload as a raw resource of the .app, as
+        # appending to the executable itself breaks its code signature.
+        # A callable writes the payload (of the given kind) into the
+        # resource by itself.
+        if callable(bundled):
+            bundled(Path(__app__, *self.RESOURCE))
+            self.seal(Path(__app__, *self.RESOURCE), 0, kind)
+        else:
+            self.embed(
+                Path(__app__, *self.RESOURCE),
+                bundled,
+                self.KIND_BUNDLE if isinstance(bundled, ArchByte) else self.KIND_CRYPTOGRAM,
+            )
+
+        # Rename the bundle and swap the icon if a new one is given
+        with open(Path(__app__, 'Contents', 'Info.plist'), 'rb') as ref:
+            __plist__ = plistlib.load(ref)
         
-        os.system(f'sudo rm -rf {self.__workdir__}')
-    
+        __plist__['CFBundleName'] = destination.name
+        __plist__['CFBundleDisplayName'] = destination.name
+
+        if icon is not None:
+            __iconfile__ = Path(__app__, 'Contents', 'Resources', __plist__.get('CFBundleIconFile', 'icon-windowed.icns'))
+            Image.open(icon.expanduser().resolve()).save(__iconfile__.with_suffix('.icns'), format='ICNS')
+            __plist__['CFBundleIconFile'] = __iconfile__.with_suffix('.icns').name
+        
+        with open(Path(__app__, 'Contents', 'Info.plist'), 'wb') as ref:
+            plistlib.dump(__plist__, ref)
+        
+        # Re-sign (ad-hoc) as the contents of the bundle have changed, an
+        # app that could not be signed is removed (it would not launch)
+        try: subprocess.check_call(['codesign', '--force', '--deep', '--sign', '-', str(__app__)], stdout=subprocess.DEVNULL)
+        except (subprocess.CalledProcessError, OSError) as e:
+            shutil.rmtree(__app__, ignore_errors=True)
+            return NYEDASEG(NYEDAException, 'Signing Error:', str(e))
+
+        return __app__
+
     @property
     def transformed(self) -> Path:
         return self._app
@@ -139,10 +254,13 @@ class _Main(bundler, encrypter, base64tools):
                 os.system(f"sudo chown {uid_gid} '{Path(root, file)}'")
 
     
-    def normalizer(self, path: Path) -> Path:
+    @staticmethod
+    def normalizer(path: Path, reserved: Union[Set[Path], None] = None) -> Path:
         # Create all intermediate directories if necessary
         # but not the last part of the path.
         path.parent.mkdir(parents=True, exist_ok=True)
+        # paths already taken by others (not on disk yet)
+        reserved = set() if reserved is None else reserved
 
         # set a count:
         count = 1
@@ -152,8 +270,8 @@ class _Main(bundler, encrypter, base64tools):
         # store the path as original path
         original = Path(path)
 
-        # While the path (dest/name.app) or (dest/name) exists
-        while Path(path.parent, path.name + extension).exists() or path.exists():
+        # While the path (dest/name.app) or (dest/name) exists or is reserved
+        while Path(path.parent, path.name + extension).exists() or path.exists() or path in reserved:
             # set path to (dest/name_count.app)
             path = Path(original.parent, original.name + f'_{count}')
             count += 1 # update the count
@@ -161,27 +279,154 @@ class _Main(bundler, encrypter, base64tools):
         # return the resultant path
         return path
 
+class _Batch:
+    def __init__(self, jobs: List[Dict[str, Any]], *, workers: int, literal: bool = False, codec: str = 'gzip', level: Union[int, None] = None, kdf: Union[Tuple[int, int, int, int], None] = None) -> None:
+        # Shared build environment: the stub is prepared once here,
+        # before any worker needs it.
+        if literal is False:
+            _Main.stub()
+
+        # Normalize and reserve the destinations up-front (against the
+        # disk and each other) so that parallel jobs never end up with
+        # the same name, the workers use them as they are.
+        __reserved__ = set()
+        for __job__ in jobs:
+            __destination__ = _Main.normalizer(Path(__job__['destination']).expanduser().resolve(), __reserved__)
+            __reserved__.add(__destination__)
+            __job__['destination'] = __destination__
+
+        self.built: List[Path] = []
+        self.failed: List[Path] = []
+        __bytes__ = 0
+        __started__ = time.perf_counter()
+
+        col_i()
+        with ProcessPoolExecutor(max_workers=workers) as __pool__:
+            # the cores are shared between the jobs for compression
+            __threads__ = max(1, (os.cpu_count() or 1) // workers)
+            __futures__ = {__pool__.submit(_Batch.run, __job__, literal, __threads__, codec, level, kdf): __job__ for __job__ in jobs}
+
+            for __index__, __future__ in enumerate(as_completed(__futures__), 1):
+                __job__ = __futures__[__future__]
+                __prefix__ = f'[{__index__:>{len(str(len(jobs)))}}/{len(jobs)}]'
+                try:
+                    __app__, __size__, __elapsed__ = __future__.result()
+                except BaseException as e:
+                    self.failed.append(Path(__job__['source']))
+                    print(__prefix__, col.RED + 'FAIL' + col.RESET, __job__['source'], '-', type(e).__name__, e)
+                    continue
+                self.built.append(__app__)
+                __bytes__ += __size__
+                print(__prefix__, col.GREEN + 'OK  ' + col.RESET, __app__, f'({__size__ / 2**20:.1f} MB in {__elapsed__:.2f}s)')
+        
+        __elapsed__ = time.perf_counter() - __started__
+        print(
+            col.BLUE + 'Summary:' + col.RESET,
+            f'{len(self.built)}/{len(jobs)} built,',
+            f'{len(self.failed)} failed in {__elapsed__:.2f}s',
+            f'| {__bytes__ / 2**20:.1f} MB at {__bytes__ / 2**20 / max(__elapsed__, 1e-9):.1f} MB/s',
+            f'| {len(self.built) * 60 / max(__elapsed__, 1e-9):.1f} archives/min',
+        )
+        col_di()
+    
+    @staticmethod
+    def run(job: Dict[str, Any], literal: bool, threads: int, codec: str = 'gzip', level: Union[int, None] = None, kdf: Union[Tuple[int, int, int, int], None] = None) -> Tuple[Path, int, float]:
+        __started__ = time.perf_counter()
+        __source__ = Path(job['source']).expanduser().resolve()
+        __size__ = sum(f.stat().st_size for f in __source__.rglob('*') if f.is_file())
+
+        # a manifest job may pick its own codec
+        codec, level = job.get('codec', codec), job.get('level', level)
+
+        # every job gets its own salt.
+        if job.get('passkey', None) is not None:
+            __main__ = _Main(
+                __source__,
+                job['destination'],
+                encrypt=True,
+                passkey=base64tools.encode(job['passkey'].encode()),
+                salt=base64tools.encode(os.urandom(16)),
+                literal=literal,
+                icon=Path(job['icon']) if job.get('icon', None) else None,
+                workers=threads,
+                codec=codec,
+                level=level,
+                kdf=kdf,
+                normalize=False,
+            )
+        else:
+            __main__ = _Main(
+                __source__,
+                job['destination'],
+                literal=literal,
+                icon=Path(job['icon']) if job.get('icon', None) else None,
+                workers=threads,
+                codec=codec,
+                level=level,
+                normalize=False,
+            )
+        
+        return __main__.transformed, __size__, time.perf_counter() - __started__
+
+    @staticmethod
+    def manifest(batch: str, destination: Path, passkey: Union[str, None], icon: Union[Path, None]) -> List[Dict[str, Any]]:
+        # A json manifest is a list of jobs:
+        # [{"source": ..., "destination": ..., "passkey": ..., "icon": ..., "codec": ..., "level": ...}]
+        # where passkey, icon, codec and level are optional.
+        if batch.endswith('.json') and Path(batch).expanduser().is_file():
+            with open(Path(batch).expanduser(), 'r') as ref:
+                __jobs__ = json.load(ref)
+            if not isinstance(__jobs__, list) or not all(isinstance(j, dict) and 'source' in j and 'destination' in j for j in __jobs__):
+                return NYEDASEG(NYEDAException, 'manifest must be a list of jobs with source and destination.')
+            return __jobs__
+
+        # else it is a glob of source directories, all of which are
+        # built into the destination directory.
+        return [
+            {'source': __source__, 'destination': str(Path(destination, Path(__source__).name)), 'passkey': passkey, 'icon': icon}
+            for __source__ in sorted(glob.glob(str(Path(batch).expanduser()))) if Path(__source__).is_dir()
+        ]
+
 # Script configurations (Arguments)
 class ScriptCFG:
     source: Path
     destination: Path = Path(Path.cwd(), 'archive')
     encrypt: bool = False
     passkey: bytes = base64tools.encode(b'password!')
+    literal: bool = False
+    icon: Union[Path, None] = None
+    batch: Union[str, None] = None
+    workers: int = os.cpu_count() or 1
+    codec: str = 'gzip'
+    level: Union[int, None] = None
+    kdf: Union[Tuple[int, int, int, int], None] = None
     
     parser: PathWays
 
     def __init__(self) -> None:
-        args = [{}, {}, {}]
+        args = [{}, {}, {}, {}, {}, {}, {}, {}, {}]
         args[0] = {'name': 'Bundle Source', 'value': 'create-from', 'short': '-src'}
         args[1] = {'name': 'Destination', 'value': 'move', 'short': '-dest'}
         args[2] = {'name': 'Encryption', 'value': 'set-encryption-with', 'short': '-e'}
+        args[3] = {'name': 'Payload Mode', 'value': 'payload-mode', 'short': '-pm'}
+        args[4] = {'name': 'Icon', 'value': 'set-icon', 'short': '-i'}
+        args[5] = {'name': 'Batch', 'value': 'batch', 'short': '-b'}
+        args[6] = {'name': 'Jobs', 'value': 'jobs', 'short': '-j'}
+        args[7] = {'name': 'Compression', 'value': 'compression', 'short': '-c'}
+        args[8] = {'name': 'Key Derivation', 'value': 'key-derivation', 'short': '-k'}
         self.parser = PathWays(Definition(args))
         self.parser.register('create-from', self.src, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
         self.parser.register('move', self.dest, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
         self.parser.register('set-encryption-with', self.enc, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
+        self.parser.register('payload-mode', self.mode, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
+        self.parser.register('set-icon', self.seticon, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
+        self.parser.register('batch', self.setbatch, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
+        self.parser.register('jobs', self.setjobs, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
+        self.parser.register('compression', self.setcompression, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
+        self.parser.register('key-derivation', self.setkdf, 'EXEC', what_value_expected='Single', ignore_if_not_present=True)
         self.parser.orchestrate
 
-        if self.parser.if_exec('create-from') is False:
+        if self.parser.if_exec('create-from') is False and self.parser.if_exec('batch') is False:
             return self.helptext()
     
     def src(self, _: str) -> None:
@@ -194,6 +439,37 @@ class ScriptCFG:
         self.encrypt = True
         self.passkey = base64tools.encode(p.encode())
     
+    def mode(self, m: str) -> None:
+        if m not in ('binary', 'literal'): return NYEDASEG(NYEDAException, 'payload mode must be either binary or literal.')
+        self.literal = m == 'literal'
+    
+    def seticon(self, _: str) -> None:
+        self.icon = Path(_)
+    
+    def setbatch(self, _: str) -> None:
+        self.batch = _
+    
+    def setjobs(self, n: str) -> None:
+        if not n.isdigit() or int(n) < 1: return NYEDASEG(NYEDAException, 'jobs must be a positive integer.')
+        self.workers = int(n)
+    
+    def setcompression(self, c: str) -> None:
+        # <codec> or <codec>:<level>
+        __codec__, _, __level__ = c.partition(':')
+        if __codec__ not in ('none', 'gzip', 'zstd', 'lz4'): return NYEDASEG(NYEDAException, 'codec must be one of none, gzip, zstd or lz4.')
+        if __level__ and not __level__.lstrip('-').isdigit(): return NYEDASEG(NYEDAException, 'compression level must be an integer.')
+        if __level__ and __codec__ in ('none', 'lz4'): return NYEDASEG(NYEDAException, f'{__codec__} takes no compression level.')
+        self.codec = __codec__
+        self.level = int(__level__) if __level__ else None
+    
+    def setkdf(self, k: str) -> None:
+        # <kdf> or <kdf>:<target ms>, the parameters are calibrated on
+        # this host once (batch jobs share them)
+        __kdf__, _, __target__ = k.partition(':')
+        if __kdf__ not in ('scrypt', 'argon2id'): return NYEDASEG(NYEDAException, 'key derivation must be either scrypt or argon2id.')
+        if __target__ and (not __target__.isdigit() or int(__target__) < 1): return NYEDASEG(NYEDAException, 'key derivation target must be a positive number of milliseconds.')
+        self.kdf = kdftools.calibrate(int(__target__) if __target__ else 500, kdf=__kdf__)
+    
     def helptext(self) -> None:
         col_i()
         print(col.BLUE + "Not Your Every-Day Archive (NYEDA)" + col.RESET, f'v{__version__}')
@@ -201,6 +477,15 @@ class ScriptCFG:
         print('1. Set source directory:                            create-from | -src <dir>')
         print('2. Set destination (default: current-dir/archive):  move | -dest <dir>/<name>')
         print('3. Encrypt the contents before embedding:           set-encryption-with | -e <pass>')
+        print('4. Payload mode (default: binary):                  payload-mode | -pm <binary|literal>')
+        print('5. Set archive icon (binary mode only):             set-icon | -i <file>')
+        print('6. Batch build from a manifest or a glob of dirs:   batch | -b <manifest.json|glob>')
+        print('   (glob sources are built into the move dir)')
+        print('7. Parallel batch jobs (default: cpu count):        jobs | -j <n>')
+        print('8. Compression (default: gzip):                     compression | -c <none|gzip|zstd|lz4>[:level]')
+        print('   (media and archives inside the source are stored as they are)')
+        print('9. Key derivation (default: scrypt, fixed cost):    key-derivation | -k <scrypt|argon2id>[:ms]')
+        print('   (calibrated on this host to take about ms, default: 500)')
         col_di()
         sys.exit(0)
     
@@ -212,11 +497,23 @@ if __name__ == '__main__':
     # set configuration for the script
     cfg = ScriptCFG()
 
+    # Batch mode, jobs run in a bounded process pool
+    if cfg.batch is not None:
+        _ = _Batch(
+            _Batch.manifest(cfg.batch, cfg.destination, bytes(base64tools.decode(cfg.passkey)).decode() if cfg.encrypt else None, cfg.icon),
+            workers=cfg.workers,
+            literal=cfg.literal,
+            codec=cfg.codec,
+            level=cfg.level,
+            kdf=cfg.kdf,
+        )
+        sys.exit(1 if _.failed else 0)
+
     # If helptext is not triggered by lack of arguments, move further
     if cfg.encrypt:
-        _ = _Main(cfg.source, cfg.destination, encrypt=True, passkey=cfg.passkey)
+        _ = _Main(cfg.source, cfg.destination, encrypt=True, passkey=cfg.passkey, literal=cfg.literal, icon=cfg.icon, codec=cfg.codec, level=cfg.level, kdf=cfg.kdf)
     else:
-        _ = _Main(cfg.source, cfg.destination)
+        _ = _Main(cfg.source, cfg.destination, literal=cfg.literal, icon=cfg.icon, codec=cfg.codec, level=cfg.level)
     
     col_i()
     print(col.BLUE + 'Built:' + col.RESET, _.transformed)
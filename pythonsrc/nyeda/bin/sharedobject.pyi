@@ -1,6 +1,7 @@
-
-from typing import Type, Dict, List
+from typing import Any, Callable, Type, Dict, List, Optional, Tuple
 from typing import TYPE_CHECKING
+from collections.abc import Buffer as ReadableBuffer
+from collections.abc import Buffer as WriteableBuffer
 import sys
 
 if TYPE_CHECKING:    
@@ -20,9 +21,21 @@ if TYPE_CHECKING:
             def __init__(self) -> None:
                 """Initialize the bundler for bundling any source directory
                 of the current system."""
-            def create(self, source: str, version: int, /) -> List[int]:
+            def create(self, source: str, version: int, workers: Optional[int] = None, codec: str = 'gzip', level: Optional[int] = None, /) -> memoryview:
                 """Create a bundle from given source and specified engine
-                version."""
+                version. The compression is block parallel over `workers`
+                threads (default: all cores).
+
+                Version 2 records `codec` (`none`, `gzip`, `zstd` or `lz4`)
+                and `level` (`none` and `lz4` take no level, `ValueError`
+                if one is given) in the header, version 1 only supports gzip.
+                Version 3 additionally indexes every entry, so that single
+                files can be read without decompressing the rest.
+                Incompressible files are stored raw."""
+            def create_to(self, source: str, output: str, version: int, workers: Optional[int] = None, codec: str = 'gzip', level: Optional[int] = None, /) -> int:
+                """Same as `create`, but the bundle is streamed into the
+                `output` file with bounded memory. Returns the number of
+                bytes written."""
 
         class _4385504876945014275:
             """Dismantle [`class`].
@@ -31,13 +44,20 @@ if TYPE_CHECKING:
             form which can be globally used across the `sharedobject`
             module contents.
             """
-            def __init__(self, data: List[int], /) -> None:
+            def __init__(self, data: ReadableBuffer, /) -> None:
                 """Dismantle the archive data into separate system
                 interpretable form."""
-            def export(self, output: str, /) -> bool:
+            def export(self, output: str, patterns: Optional[List[str]] = None, threads: Optional[int] = None, sync: str = 'none', paths: Optional[List[str]] = None, /) -> bool:
                 """Re-combine necessary parts and export the archive into
-                its original source form."""
-            def get(self) -> List[int]:
+                its original source form. Only the entries matching the
+                glob `patterns` or the literal `paths` (with everything
+                beneath them) are exported if given. Files are written by
+                `threads` writers (default: all cores) and synced as per
+                `sync` (`none`, `end` or `per-file`)."""
+            @property
+            def version(self) -> int:
+                """Engine version of the archive."""
+            def get(self) -> memoryview:
                 """Returns system interpretable part of the archive data."""
             def get_meta(self) -> str:
                 """Returns the archive metadata hash string."""
@@ -49,8 +69,129 @@ if TYPE_CHECKING:
             metadata from any given archive data.
             """
             @staticmethod
-            def get(data: List[int]) -> Dict[str, bytes]:
-                """Returns a partial metadata based on the archive data given."""
+            def get(data: ReadableBuffer, version: int) -> Dict[str, bytes]:
+                """Returns a partial metadata based on the archive data given
+                (see `Dismantle.get`) of a bundle of engine `version`."""
+
+        class _1730256948271935460:
+            """Buffer [`class`].
+            
+            ... read-only bytes owned by the `sharedobject` module and
+            exported through the buffer protocol (wrapped in a
+            `memoryview` when returned).
+            """
+            def __len__(self) -> int: ...
+            def __buffer__(self, flags: int, /) -> memoryview: ...
+
+        class _2298417653340917826:
+            """Entry [`class`].
+
+            ... metadata of a single archive entry.
+            """
+            @property
+            def path(self) -> str: ...
+            @property
+            def kind(self) -> str:
+                """`file` or `directory`."""
+            @property
+            def size(self) -> int: ...
+            @property
+            def mode(self) -> int: ...
+
+        class _7419962650183125557:
+            """Entries [`class`].
+
+            ... iterator over the entry metadata of an archive. Tar based
+            archives are scanned lazily, as the iteration goes.
+            """
+            def __iter__(self) -> '_7419962650183125557': ...
+            def __next__(self) -> '_2298417653340917826': ...
+
+        class _4871920365518842093:
+            """PathTree [`class`].
+
+            ... path trie over the entries of an archive. Every node has
+            an integer id (the root `/` is `0`), children are listed per
+            directory (directories first, then by name).
+            """
+            def __len__(self) -> int: ...
+            def children(self, id: int = 0, /) -> List[Tuple[int, str, bool]]:
+                """Returns `(id, name, is directory)` of every child of the
+                node."""
+            def path(self, id: int, /) -> str:
+                """Returns the full path of the node."""
+            def name(self, id: int, /) -> str: ...
+            def parent(self, id: int, /) -> int: ...
+            def is_dir(self, id: int, /) -> bool: ...
+            def size(self, id: int, /) -> int:
+                """Returns the size of the file (`0` for directories)."""
+
+        class _6021843575190284391:
+            """ArchiveHandle [`class`].
+            
+            ... parses any bundled archive once (header and metadata
+            check) and provides views over the same borrowed data
+            without copying or re-validating it.
+            """
+            def __init__(self, data: ReadableBuffer, /) -> None:
+                """Parse the archive data and check its metadata against
+                the current system."""
+            @property
+            def valid(self) -> bool:
+                """`True` if the archive metadata matches the current
+                system."""
+            @property
+            def version(self) -> int:
+                """Engine version of the archive."""
+            @property
+            def codec(self) -> str:
+                """Codec the archive data was compressed with."""
+            @property
+            def level(self) -> int:
+                """Compression level of the archive data."""
+            def get_meta(self) -> str:
+                """Returns the archive metadata hash string."""
+            def bytes(self) -> memoryview:
+                """Returns system interpretable part of the archive data
+                as a view over the source."""
+            def entries(self) -> Dict[str, bytes]:
+                """Returns a partial metadata based on the archive data."""
+            def __iter__(self) -> '_7419962650183125557':
+                """Iterates over the metadata (path, kind, size and mode) of
+                every entry, the contents are never read. Tar based
+                (version 1 and 2) archives are scanned only as far as the
+                iteration goes."""
+            def listing(self) -> Dict[str, int]:
+                """Returns the size of every file in the archive without
+                reading the contents (from the index alone if the archive
+                is indexed)."""
+            def tree(self) -> '_4871920365518842093':
+                """Builds the path trie of the entries (skipping hidden
+                ones) from the entry metadata alone."""
+            def read(self, path: str, offset: int = 0, length: Optional[int] = None, /) -> memoryview:
+                """Returns `length` bytes (default: the rest) of a single
+                file from `offset` on. Indexed archives decompress only the
+                blocks the range spans. Tar based archives look the file up
+                once per handle; afterwards version 2 skips the blocks before
+                the range without decoding them, while the gzip stream of
+                version 1 is decompressed from its start on every read
+                (a read costs O(`offset`)). Raises `KeyError` if the file
+                is not in the archive."""
+            def export(self, output: str, patterns: Optional[List[str]] = None, threads: Optional[int] = None, sync: str = 'none', paths: Optional[List[str]] = None, /) -> bool:
+                """Re-combine necessary parts and export the archive into
+                its original source form. Only the entries matching the
+                glob `patterns` or the literal `paths` (compared as they
+                are, never as globs) are exported if given. Indexed
+                archives decode only the blocks of the selected files.
+
+                This thread decompresses while `threads` writers (default:
+                all cores) preallocate and write the files, which are
+                synced as per `sync` (`none`, `end` or `per-file`)."""
+        ArchiveHandle: Type[_6021843575190284391]
+        Entries: Type[_7419962650183125557]
+        Entry: Type[_2298417653340917826]
+        PathTree: Type[_4871920365518842093]
+        Buffer: Type[_1730256948271935460]
         Structure: Type[_8947704719820868688]
         Dismantle: Type[_4385504876945014275]
         Bundle: Type[_5160603462204636848]
@@ -69,15 +210,94 @@ if TYPE_CHECKING:
             """
             def __init__(self) -> None: ...
             @staticmethod
-            def validate_meta(data: List[int], /) -> bool:
+            def validate_meta(data: ReadableBuffer, /) -> bool:
                 """Validates the given archive data against the current
                 system."""
             @staticmethod
             def validate_meta_hash(version: int, hash: str, /) -> bool:
                 """Validates the archive metadata hash against the current
                 system."""
+            @staticmethod
+            def refresh_fingerprint() -> None:
+                """Drops the cached host fingerprint, the host is probed
+                again on the next validation or bundle."""
+            @staticmethod
+            def set_fingerprint_ttl(seconds: Optional[float] = None, /) -> None:
+                """Sets how long the cached host fingerprint stays valid
+                (`None` keeps it for the lifetime of the process)."""
         Validation: Type[_3256342104921716572]
     
+    class crypto:
+        """crypto [`Module`].
+
+        Contains the `Cipher` class for chunked authenticated encryption.
+        """
+        class _8830146527719345012:
+            """Cipher [`class`].
+
+            ... encrypts any data in fixed-size chunks with AES-256-GCM or
+            ChaCha20-Poly1305. Every chunk is sealed on its own (per-chunk
+            nonce, its index and a final flag authenticated along with it),
+            so chunks are processed in parallel, any range can be decrypted
+            alone and reordering or truncation is detected. A stream has
+            at most `2**32` chunks.
+            """
+            def __init__(self, key: ReadableBuffer, algorithm: str = 'aes-256-gcm', chunk_size: int = 1048576, /) -> None:
+                """Create a cipher over a 32 byte `key`. The `algorithm`
+                (`aes-256-gcm` or `chacha20-poly1305`) and `chunk_size`
+                apply to encryption, decryption reads them from the data."""
+            @property
+            def algorithm(self) -> str: ...
+            @property
+            def chunk_size(self) -> int: ...
+            def encrypt(self, data: ReadableBuffer, workers: Optional[int] = None, /) -> memoryview:
+                """Encrypts the data on `workers` threads (default: all
+                cores)."""
+            def decrypt(self, data: ReadableBuffer, workers: Optional[int] = None, /) -> memoryview:
+                """Decrypts the data on `workers` threads (default: all
+                cores). Raises `OSError` if any chunk is not authentic. The
+                returned memory is zeroized once released."""
+            @staticmethod
+            def size(data: ReadableBuffer, /) -> int:
+                """Returns the plaintext size of the encrypted data."""
+            def decrypt_into(self, data: ReadableBuffer, output: WriteableBuffer, workers: Optional[int] = None, /) -> None:
+                """Decrypts the data into `output` (a writable buffer of
+                exactly `size(data)` bytes, such as a bytearray) on
+                `workers` threads. Raises `OSError` if any chunk is not
+                authentic, `output` is zeroized then."""
+            def read(self, data: ReadableBuffer, offset: int = 0, length: Optional[int] = None, /) -> memoryview:
+                """Decrypts `length` bytes (default: the rest) of the
+                plaintext from `offset` on, only the chunks the range spans
+                are decrypted. The returned memory is zeroized once
+                released."""
+            def encrypt_file(self, source: str, output: str, workers: Optional[int] = None, /) -> int:
+                """Streams the `source` file encrypted into `output` (it
+                is appended to). Returns the bytes written."""
+            def decrypt_file(self, source: str, output: str, offset: int = 0, workers: Optional[int] = None, /) -> int:
+                """Streams the encrypted data of `source` (from `offset`
+                on) decrypted into `output`. Returns the bytes written."""
+        Cipher: Type[_8830146527719345012]
+    
+    class encoding:
+        """encoding [`Module`].
+
+        Contains the `Base64` class for url-safe base64 encoding.
+        """
+        class _2715048369102457186:
+            """Base64 [`class`].
+
+            ... validates and decodes url-safe base64 (padded, canonical)
+            in a single pass.
+            """
+            @staticmethod
+            def decode(data: ReadableBuffer, /) -> memoryview:
+                """Returns the decoded data. Raises `ValueError` if it is
+                empty or not url-safe base64 encoded."""
+            @staticmethod
+            def encode(data: ReadableBuffer, /) -> memoryview:
+                """Returns the url-safe base64 encoded data."""
+        Base64: Type[_2715048369102457186]
+    
     class secure_delete:
         """secure_delete [`Module`].
         
@@ -88,11 +308,47 @@ if TYPE_CHECKING:
             """Secure Delete ['class'].
             
             ... securely deletes any file or folder (recursively) using
-            `DoD 5220.22-M` secure delete standard.
+            `DoD 5220.22-M` secure delete standard. Files are overwritten
+            in parallel through large aligned buffers, the outcome is
+            kept as a report.
             """
-            def __init__(self, path: str, overwrites: int, /) -> None:
+            def __init__(
+                    self,
+                    path: str,
+                    overwrites: int,
+                    policy: str = 'legacy',
+                    workers: Optional[int] = None,
+                    sync: str = 'pass',
+                    progress: Optional[Callable[[int, int, int], Any]] = None,
+                    /,
+            ) -> None:
                 """securely deletes any file or folder (recursively) using
-                `DoD 5220.22-M` secure delete standard."""
+                `DoD 5220.22-M` secure delete standard.
+
+                The passes of the `policy` are cycled for `overwrites`
+                passes: `legacy` (`00`, `ff`, `aa`, `55`), `dod` (`00`,
+                `ff`, random), `zero`, `random` or a comma separated list
+                of hex bytes and `random`. Files are synced as per `sync`
+                (`pass`, `end` or `none`).
+
+                The tree is walked and wiped by `workers` threads (default:
+                all cores), symlinks are removed without being followed.
+                `progress` is called with (files deleted, bytes written,
+                bytes to write) every 100ms, an error raised by it cancels
+                the rest. Errors are collected, not raised."""
+            @property
+            def ok(self) -> bool:
+                """`True` if everything was deleted."""
+            @property
+            def files(self) -> int: ...
+            @property
+            def directories(self) -> int: ...
+            @property
+            def bytes(self) -> int:
+                """Bytes written over all passes."""
+            @property
+            def errors(self) -> List[Tuple[str, str]]:
+                """`(path, error)` of everything that failed."""
         SecureDelete: Type[_6494856343047591817]
     
     if sys.platform == 'darwin':
@@ -132,6 +388,8 @@ if TYPE_CHECKING:
                     """Kill if any screencapture app is found in this instant."""
             WindowsSRCD: Type[_3859921643423807587]
 else:
+    crypto: object
+    encoding: object
     secure_delete: object
     validation: object
     bundle: object
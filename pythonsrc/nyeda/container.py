@@ -9,6 +9,7 @@ if sys.platform == 'win32':
     ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
 
 from nyeda.features.interface.segmenter import segmenter
+from nyeda.features.payload import payloadtools
 from nyeda.types import ArchByte, ArchByteInt
 from typing import Union
 from pathlib import Path
@@ -25,4 +26,16 @@ class container:
         else:
             return file
 
-if __name__ == '__main__': _ = segmenter(DATA, container.__file__(), 5)
\ No newline at end of file
+    @staticmethod
+    def __data__() -> Union[ArchByte[ArchByteInt], bytes]:
+        # DATA is only present if it was written into the source
+        # (literal mode), else the data is embedded as a binary payload,
+        # either as a raw resource of the .app (macos) or appended to the
+        # executable itself.
+        if 'DATA' in globals():
+            return globals()['DATA']
+        if sys.platform == 'darwin' and Path(container.__file__(), *payloadtools.RESOURCE).exists():
+            return payloadtools.locate(Path(container.__file__(), *payloadtools.RESOURCE))
+        return payloadtools.locate(Path(os.path.abspath(sys.executable)))
+
+if __name__ == '__main__': _ = segmenter(container.__data__(), container.__file__(), 5)
\ No newline at end of file
@@ -3,10 +3,15 @@ from nyeda.bin.sharedobject import bundle
 from nyeda.types.archive import ArchByte, ArchByteInt
 from nyeda.exceptions import NYEDASEG, NYEDAException
 from nyeda.types.abc import Feature
+from typing import Union
 from pathlib import Path
 
 class bundler(Feature):
-    def bundle(self, source: Path) -> ArchByte[ArchByteInt]:
+    # The bundle engine probes the host for metadata when it is created,
+    # therefore only one is created per process and reused afterwards.
+    __engine__ = None
+
+    def bundle(self, source: Path, workers: Union[int, None] = None, codec: str = 'gzip', level: Union[int, None] = None) -> ArchByte[ArchByteInt]:
         # make source completely absolute to support relate
         # paths as parameters
         source = source.expanduser().resolve()
@@ -18,7 +23,26 @@ class bundler(Feature):
             return NYEDASEG(NYEDAException, 'source path must be a directory! (via. bundler)')
         
         # create the bundle using bundle module.
-        __bundle__ = bundle.Bundle().create(str(source), 1)
+        if bundler.__engine__ is None:
+            bundler.__engine__ = bundle.Bundle()
+        # version 3 records the codec and level in the header and
+        # indexes every entry for random access.
+        __bundle__ = bundler.__engine__.create(str(source), 3, workers, codec, level)
 
         # return the bundle in ArchBytes Format
-        return ArchByte(__bundle__)
\ No newline at end of file
+        return ArchByte(__bundle__)
+
+    def bundle_to(self, source: Path, target: Path, workers: Union[int, None] = None, codec: str = 'gzip', level: Union[int, None] = None) -> int:
+        # same checks as bundle
+        source = source.expanduser().resolve()
+
+        if not source.exists():
+            return NYEDASEG(NYEDAException, 'source path does not exist! (via. bundler)')
+        if source.is_file():
+            return NYEDASEG(NYEDAException, 'source path must be a directory! (via. bundler)')
+
+        if bundler.__engine__ is None:
+            bundler.__engine__ = bundle.Bundle()
+
+        # the bundle is streamed into the target, never held in memory.
+        return bundler.__engine__.create_to(str(source), str(target), 3, workers, codec, level)
\ No newline at end of file
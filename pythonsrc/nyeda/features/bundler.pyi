@@ -1,6 +1,7 @@
 
 from nyeda.types.archive import ArchByte, ArchByteInt
 from nyeda.types.abc import Feature
+from typing import Union
 from pathlib import Path
 
 class bundler(Feature):
@@ -12,6 +13,15 @@ class bundler(Feature):
     Boasts a `Rust` backend for enhanced speed (as compared to python
     code).
     """
-    def bundle(self, source: Path) -> ArchByte[ArchByteInt]:
+    def bundle(self, source: Path, workers: Union[int, None] = None, codec: str = 'gzip', level: Union[int, None] = None) -> ArchByte[ArchByteInt]:
         """Rapidly bundles a source directory into `ArchByte` format using
-        a `Rust` backend."""
\ No newline at end of file
+        a `Rust` backend.
+        
+        The compression runs on `workers` threads (default: all cores)
+        with `codec` (`none`, `gzip`, `zstd` or `lz4`) at `level` (default:
+        the codec's own). Already compressed files are stored raw."""
+    def bundle_to(self, source: Path, target: Path, workers: Union[int, None] = None, codec: str = 'gzip', level: Union[int, None] = None) -> int:
+        """Same as `bundle`, but the bundle is streamed into the `target`
+        file with bounded memory, no matter how large the source is.
+
+        Returns the number of bytes written."""
\ No newline at end of file
@@ -1,14 +1,12 @@
-
 from nyeda.types.abc import Feature
-from typing import TypeVar, Dict, List
-
-M = TypeVar('METADATA')
+from nyeda.bin.sharedobject import bundle
 
 class dirtools(Feature):
     """[`dirtools`] Feature.
     
-    This feature provides a tool for generating directory map from
-    a metadata generator.
+    This feature provides a tool for generating the directory tree
+    of an archive from its metadata.
     """
-    def generate_dirmap(self, metadata: M) -> Dict[str, List[str]]:
-        """Creates a directory mapping from a given archive metadata factory."""
\ No newline at end of file
+    def generate_tree(self, handle: bundle.ArchiveHandle) -> bundle.PathTree:
+        """Creates the path trie of an archive handle, node ids map to
+        full paths and children in constant time."""
@@ -1,21 +1,31 @@
 
-from nyeda.bin.sharedobject import validation, bundle
+from nyeda.bin.sharedobject import bundle
 from nyeda.types.archive import ArchByte, ArchByteInt
 from nyeda.types.abc import Feature
 
 class dismantler(Feature):
+    def handle(self, content):
+        # the content is parsed and validated only once, every
+        # dismantling afterwards reuses the same handle.
+        if getattr(self, '__handlesource__', None) is not content:
+            setattr(self, '__handle__', bundle.ArchiveHandle(content))
+            setattr(self, '__handlesource__', content)
+        return getattr(self, '__handle__')
+
     def dismantle(self, content) -> ArchByte[ArchByteInt]:
-        if validation.Validation().validate_meta(content):
+        __handle__ = self.handle(content)
+        if __handle__.valid:
             setattr(self, '__dismantlefailure__', False)
-            return ArchByte(bundle.Dismantle(content).get())
+            return ArchByte(__handle__.bytes())
         else:
             setattr(self, '__dismantlefailure__', True)
             return None
     
-    def dismantle2(self, content, ext) -> bool:
-        if validation.Validation().validate_meta(content):
+    def dismantle2(self, content, ext, patterns=None, threads=None, sync='none', paths=None) -> bool:
+        __handle__ = self.handle(content)
+        if __handle__.valid:
             setattr(self, '__dismantlefailure__', False)
-            return bundle.Dismantle(content).export(ext)
+            return __handle__.export(ext, patterns, threads, sync, paths)
         else:
             setattr(self, '__dismantlefailure__', True)
             return False
\ No newline at end of file
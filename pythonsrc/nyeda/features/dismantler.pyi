@@ -1,6 +1,8 @@
 
 from nyeda.types.archive import ArchByte, ArchByteInt
 from nyeda.types.abc import Feature
+from nyeda.bin.sharedobject import bundle
+from typing import Any, List, Union
 
 class dismantler(Feature):
     """[`dismantler`] Feature.
@@ -8,5 +10,25 @@ class dismantler(Feature):
     This feature provides the `dismantle` method to break archive data
     into system interpretable format.
     """
+    def handle(self, content: ArchByte[ArchByteInt]) -> 'bundle.ArchiveHandle':
+        """Returns the archive handle for the content. The content is
+        parsed and validated only once and the handle is reused for the
+        same content."""
     def dismantle(self, content: ArchByte[ArchByteInt]) -> ArchByte[ArchByteInt]:
-        """Dismantle archive data into system readable format."""
\ No newline at end of file
+        """Dismantle archive data into system readable format."""
+    def dismantle2(
+            self,
+            content: ArchByte[ArchByteInt],
+            ext: Any,
+            patterns: Union[List[str], None] = None,
+            threads: Union[int, None] = None,
+            sync: str = 'none',
+            paths: Union[List[str], None] = None,
+    ) -> bool:
+        """Dismantle archive data and export it into the given
+        location. Only the entries matching the glob `patterns` or the
+        literal `paths` (with everything beneath them) are exported if
+        given.
+
+        Files are written by `threads` writers (default: all cores) and
+        synced to disk as per `sync` (`none`, `end` or `per-file`)."""
\ No newline at end of file
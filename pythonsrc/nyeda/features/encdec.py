@@ -1,72 +1,232 @@
+from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
 from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from cryptography.hazmat.backends import default_backend
 from base64 import urlsafe_b64encode, urlsafe_b64decode
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.exceptions import InvalidSignature
 from nyeda.exceptions import NYEDASEG, NYEDAException
-from typing import Any, TypeGuard, TypedDict
-from nyeda.bin.sharedobject import secure_delete
+from typing import Any, Optional, Tuple, TypeGuard, TypedDict
+from nyeda.bin.sharedobject import secure_delete, crypto, encoding
 from nyeda.types.abc import Feature
 from pathlib import Path
 import pickle
-import re
+import struct
+import time
+import os
 
 class base64tools(Feature):
     @staticmethod
-    def is_urlsafe_b64encoded(data: bytes) -> TypeGuard[bytes]:
+    def try_decode(data: Any) -> Optional[memoryview]:
+        # validates and decodes in a single pass (sharedobject), None if
+        # the data is not url-safe base64 encoded bytes.
         if not isinstance(data, bytes):
-            return False
-        
-        # all characters must be in b64
-        if not re.fullmatch(b"[A-Za-z0-9_-]+={0,2}", data):
-            return False
-            
-        # must be multiple of 4
-        if len(data) % 4 != 0:
-            return False
-            
-        # try decoding
+            return None
         try:
-            urlsafe_b64decode(data)
-            return True
-        except Exception:
-            return False
+            return encoding.Base64.decode(data)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def is_urlsafe_b64encoded(data: Any) -> TypeGuard[bytes]:
+        # prefer try_decode wherever the decoded data is needed too
+        return base64tools.try_decode(data) is not None
     
     @staticmethod
     def encode(content: bytes) -> bytes:
         return urlsafe_b64encode(content)
     
     @staticmethod
-    def decode(content: bytes) -> bytes:
-        if base64tools.is_urlsafe_b64encoded(content):
-            return urlsafe_b64decode(content)
-        return NYEDASEG(NYEDAException, 'content given is not url-safe base64 encoded to begin with! (via. decode)')
+    def decode(content: bytes) -> memoryview:
+        __decoded__ = base64tools.try_decode(content)
+        if __decoded__ is None:
+            return NYEDASEG(NYEDAException, 'content given is not url-safe base64 encoded to begin with! (via. decode)')
+        return __decoded__
 
-class Cryptogram(TypedDict):
+class Cryptogram(TypedDict, total=False):
     ctext: bytes
     salt: bytes
     intervention: bool
+    # 2: chunked AEAD (crypto.Cipher), raw ctext.
+    # missing (1): Fernet, url-safe base64 encoded ctext.
+    version: int
+    # kdf id and its three parameters (scrypt: n, r, p; argon2id:
+    # iterations, memory in KiB, lanes), missing for the defaults of
+    # the decrypter.
+    kdf: Tuple[int, int, int, int]
+
+    # binary container (little endian, 34 bytes + salt + ctext):
+    # magic (8) | version (1) | kdf id (1) | kdf params (3 x 4) | flags (1)
+    # | salt length (1) | reserved (2) | ctext length (8) | salt | ctext
+    HEADER = struct.Struct('<8sBB3IBB2xQ')
+    MAGIC = b'NYEDACG2'
+    FLAG_INTERVENTION = 1
+    KDF_SCRYPT = 1
+    KDF_ARGON2ID = 2
 
     @staticmethod
     def validate(other: Any) -> TypeGuard['Cryptogram']:
-        if not isinstance(other, dict) or not len(other) == 3:
+        if not isinstance(other, dict):
+            return False
+        __version__ = other.get('version', 1)
+        if not {'ctext', 'salt', 'intervention'} <= other.keys() <= {'ctext', 'salt', 'intervention', 'version', 'kdf'} \
+            or __version__ not in (1, 2):
             return False
-        if not isinstance(other.get('ctext', None), bytes):
+        if not isinstance(other.get('ctext', None), bytes if __version__ == 1 else (bytes, memoryview)):
             return False
         if not isinstance(other.get('salt', None), bytes):
             return False
         if not isinstance(other.get('intervention', None), bool):
             return False
-        # additional base64 encoded check (internally only urlsafe)
-        # base64 encoded bytes are sent in ctext and salt
-        if not base64tools.is_urlsafe_b64encoded(other.get('ctext')) \
-            or not base64tools.is_urlsafe_b64encoded(other.get('salt')):
+        if 'kdf' in other and not (isinstance(other['kdf'], tuple) and len(other['kdf']) == 4 \
+                                   and all(isinstance(x, int) for x in other['kdf'])):
+            return False
+        # additional base64 encoded check (internally only urlsafe) of
+        # the salt, the ctext of version 1 is checked once when it is
+        # decoded for decryption.
+        if not base64tools.is_urlsafe_b64encoded(other.get('salt')):
             return False
         return True
-    
+
+    @staticmethod
+    def is_packed(data: Any) -> bool:
+        # binary container, checked by its magic alone
+        try:
+            return memoryview(data)[:len(Cryptogram.MAGIC)] == Cryptogram.MAGIC
+        except TypeError:
+            return False
+
+    @staticmethod
+    def header(version: int, kdf: Tuple[int, int, int, int], intervention: bool, salt: bytes, length: int) -> bytes:
+        # the container up to the ctext (header and raw salt)
+        return Cryptogram.HEADER.pack(
+            Cryptogram.MAGIC,
+            version,
+            *kdf,
+            Cryptogram.FLAG_INTERVENTION if intervention else 0,
+            len(salt),
+            length,
+        ) + salt
+
+    @staticmethod
+    def dump(cryptogram: 'Cryptogram') -> bytes:
+        __ctext__ = memoryview(cryptogram['ctext']).cast('B')
+        return b''.join((
+            Cryptogram.header(
+                cryptogram.get('version', 1),
+                cryptogram.get('kdf', (0, 0, 0, 0)),
+                cryptogram['intervention'],
+                urlsafe_b64decode(cryptogram['salt']),
+                len(__ctext__),
+            ),
+            __ctext__,
+        ))
+
+    @staticmethod
+    def load(data: Any) -> Optional['Cryptogram']:
+        # parses the binary container in place, the ctext is a view
+        # over the data. None if it is malformed.
+        __view__ = memoryview(data).cast('B')
+        if len(__view__) < Cryptogram.HEADER.size:
+            return None
+
+        __magic__, __version__, __kdfid__, __a__, __b__, __c__, __flags__, __saltlength__, __length__ = \
+            Cryptogram.HEADER.unpack_from(__view__)
+        __start__ = Cryptogram.HEADER.size + __saltlength__
+        if __magic__ != Cryptogram.MAGIC or __version__ != 2 or __start__ + __length__ != len(__view__):
+            return None
+
+        __cryptogram__ = Cryptogram(
+            ctext=__view__[__start__:],
+            salt=urlsafe_b64encode(__view__[Cryptogram.HEADER.size:__start__]),
+            intervention=bool(__flags__ & Cryptogram.FLAG_INTERVENTION),
+            version=__version__,
+        )
+        if __kdfid__:
+            __cryptogram__['kdf'] = (__kdfid__, __a__, __b__, __c__)
+        return __cryptogram__
+
     def __setattr__(self, key, value, /):
         raise TypeError(f"{self.__class__.__name__} is immutable and cannot be modified")
 
+class kdftools(Feature):
+    # calibration starts from these and doubles the memory
+    SCRYPT_MIN_COST = 2**14
+    SCRYPT_BLOCKSIZE = 8
+    ARGON2_MIN_MEMORY = 2**13
+    ARGON2_MAX_LANES = 16
+    # nothing derives with more (kdf parameters are read from untrusted
+    # cryptograms)
+    MAX_MEMORY = 2**32
+    MAX_ITERATIONS = 2**12
+    SCRYPT_MAX_BLOCKSIZE = 32
+    SCRYPT_MAX_PARALLEL = 16
+
+    @staticmethod
+    def check(kdf: Any) -> bool:
+        # True if the kdf is known and its parameters are in range
+        if not (isinstance(kdf, tuple) and len(kdf) == 4 and all(isinstance(x, int) for x in kdf)):
+            return False
+        __kdfid__, __a__, __b__, __c__ = kdf
+        if __kdfid__ == Cryptogram.KDF_SCRYPT:
+            # n must be a power of two above 1
+            return __a__ > 1 and __a__ & (__a__ - 1) == 0 \
+                and 1 <= __b__ <= kdftools.SCRYPT_MAX_BLOCKSIZE and 1 <= __c__ <= kdftools.SCRYPT_MAX_PARALLEL \
+                and 128 * __a__ * __b__ * __c__ <= kdftools.MAX_MEMORY
+        if __kdfid__ == Cryptogram.KDF_ARGON2ID:
+            # memory is in KiB, at least 8 KiB per lane
+            return 1 <= __a__ <= kdftools.MAX_ITERATIONS and 1 <= __c__ <= kdftools.ARGON2_MAX_LANES \
+                and 8 * __c__ <= __b__ <= kdftools.MAX_MEMORY // 1024
+        return False
+
+    @staticmethod
+    def derive(kdf: Tuple[int, int, int, int], salt: bytes, password: bytes, length: int = 32) -> bytearray:
+        # salt and password are raw bytes, the key is a bytearray so
+        # that it can be zeroized.
+        if not kdftools.check(kdf):
+            raise ValueError(f'invalid kdf: {kdf}')
+        __kdfid__, __a__, __b__, __c__ = kdf
+        if __kdfid__ == Cryptogram.KDF_SCRYPT:
+            __kdf__ = Scrypt(salt, length, __a__, __b__, __c__, default_backend())
+        else:
+            __kdf__ = Argon2id(salt=salt, length=length, iterations=__a__, memory_cost=__b__, lanes=__c__)
+        return bytearray(__kdf__.derive(password))
+
+    @staticmethod
+    def __measure__(kdf: Tuple[int, int, int, int]) -> float:
+        # milliseconds a single derivation takes on this host
+        __started__ = time.perf_counter()
+        kdftools.derive(kdf, bytes(16), b'calibration')
+        return (time.perf_counter() - __started__) * 1000
+
+    @staticmethod
+    def calibrate(target_ms: float = 500, max_memory: int = 2**30, kdf: str = 'argon2id') -> Tuple[int, int, int, int]:
+        # The memory is doubled while a derivation still fits in the
+        # budget (the time grows linearly with it), argon2id then spends
+        # what is left of the budget on iterations. Argon2id fills one
+        # lane per core (up to ARGON2_MAX_LANES).
+        max_memory = min(max_memory, kdftools.MAX_MEMORY)
+        if kdf == 'scrypt':
+            __n__, __r__ = kdftools.SCRYPT_MIN_COST, kdftools.SCRYPT_BLOCKSIZE
+            __elapsed__ = kdftools.__measure__((Cryptogram.KDF_SCRYPT, __n__, __r__, 1))
+            while 128 * __r__ * __n__ * 2 <= max_memory and __elapsed__ * 2 <= target_ms:
+                __n__ *= 2
+                __elapsed__ = kdftools.__measure__((Cryptogram.KDF_SCRYPT, __n__, __r__, 1))
+            return (Cryptogram.KDF_SCRYPT, __n__, __r__, 1)
+
+        if kdf != 'argon2id':
+            raise ValueError(f'unknown kdf: {kdf}')
+
+        __lanes__ = min(os.cpu_count() or 1, kdftools.ARGON2_MAX_LANES)
+        # memory_cost is in KiB and at least 8 KiB per lane
+        __memory__ = max(kdftools.ARGON2_MIN_MEMORY, 8 * __lanes__)
+        __elapsed__ = kdftools.__measure__((Cryptogram.KDF_ARGON2ID, 1, __memory__, __lanes__))
+        while __memory__ * 2 * 1024 <= max_memory and __elapsed__ * 2 <= target_ms:
+            __memory__ *= 2
+            __elapsed__ = kdftools.__measure__((Cryptogram.KDF_ARGON2ID, 1, __memory__, __lanes__))
+
+        __iterations__ = min(max(1, int(target_ms // max(__elapsed__, 1e-3))), kdftools.MAX_ITERATIONS)
+        return (Cryptogram.KDF_ARGON2ID, __iterations__, __memory__, __lanes__)
+
 class encrypter(Feature):
     
     ENCRYPT_PARAM_ERROR_MESSAGE = "'encrypt' method takes {} as url-safe base64 encoded format."
@@ -75,49 +235,56 @@ class encrypter(Feature):
     BLOCKSIZE = 8
     PARALLEL = 1
     BACKEND = default_backend()
+    ALGORITHM = 'aes-256-gcm'
+    VERSION = 2
+    # default kdf, see kdftools.calibrate for host specific ones
+    KDF = (Cryptogram.KDF_SCRYPT, MEMORY_COST, BLOCKSIZE, PARALLEL)
 
-    def encrypt(self, content: Any, password: bytes, salt: bytes) -> Cryptogram:
+    def __newcipher__(self, password: bytes, salt: bytes, kdf: Optional[Tuple[int, int, int, int]]) -> Tuple[Any, Tuple[int, int, int, int]]:
         # only accept password and salt if it is url-safe base64 encoded.
-        if not base64tools.is_urlsafe_b64encoded(password):
+        __password__ = base64tools.try_decode(password)
+        if __password__ is None:
             return NYEDASEG(NYEDAException, self.ENCRYPT_PARAM_ERROR_MESSAGE.format('password'))
-        if not base64tools.is_urlsafe_b64encoded(salt):
+        __salt__ = base64tools.try_decode(salt)
+        if __salt__ is None:
             return NYEDASEG(NYEDAException, self.ENCRYPT_PARAM_ERROR_MESSAGE.format('salt'))
-        
-        # check encryption runtime pickling.
-        # if the content is not bytes, __preprocessing__ is True.
+
+        # the kdf (and its parameters) is recorded in the cryptogram
+        __kdf__ = self.KDF if kdf is None else tuple(kdf)
+        if not kdftools.check(__kdf__):
+            return NYEDASEG(NYEDAException, f'invalid kdf: {__kdf__}')
+
+        # create the chunked AEAD cipher with a key derived using the
+        # kdf (Scrypt or Argon2id), the key is zeroized once the cipher
+        # holds it.
+        __key__ = kdftools.derive(__kdf__, bytes(__salt__), bytes(__password__), self.KEY_LENGTH)
+        __cipher__ = crypto.Cipher(__key__, self.ALGORITHM)
+        __key__[:] = bytes(len(__key__))
+        return __cipher__, __kdf__
+
+    def encrypt(self, content: Any, password: bytes, salt: bytes, kdf: Optional[Tuple[int, int, int, int]] = None) -> Cryptogram:
+        # check encryption runtime pickling. Buffers (bytes, ArchByte,
+        # memoryview, ...) are encrypted as they are (no copy), any
+        # other object is pickled and __preprocessing__ is True.
         __preprocessing__ = False
-        if not isinstance(content, bytes):
+        try:
+            memoryview(content)
+        except TypeError:
             content = pickle.dumps(content)
             __preprocessing__ = True
-        
+
+        __cipher__, __kdf__ = self.__newcipher__(password, salt, kdf)
+
         # for code cleanup use a try-finally block
         try:
-            # create a key derivation function (Scrypt)
-            __kdf__ = Scrypt(
-                urlsafe_b64decode(salt),
-                self.KEY_LENGTH,
-                self.MEMORY_COST,
-                self.BLOCKSIZE,
-                self.PARALLEL,
-                self.BACKEND
-            )
-            
-            # create the Fernet object with a key derived using
-            # the Scrypt kdf
-            __fernet__ = Fernet(
-                urlsafe_b64encode(
-                    __kdf__.derive(
-                        urlsafe_b64decode(password)
-                    )
-                ),
-                self.BACKEND
-            )
-
-            # create a cryptogram object
+            # create a cryptogram object (the ctext is a view over the
+            # memory the cipher sealed into)
             __encrypted__ = Cryptogram(
-                ctext=urlsafe_b64encode(__fernet__.encrypt(content)),
+                ctext=__cipher__.encrypt(content),
                 salt=salt,
-                intervention=__preprocessing__
+                intervention=__preprocessing__,
+                version=self.VERSION,
+                kdf=tuple(__kdf__),
             )
 
             # return the final result
@@ -125,10 +292,30 @@ class encrypter(Feature):
         finally:
             # cleanup all variables
             del __preprocessing__
-            del __fernet__
+            del __cipher__
             del __kdf__
             del __encrypted__
 
+    def encrypt_file(self, source: Path, target: Path, password: bytes, salt: bytes, kdf: Optional[Tuple[int, int, int, int]] = None, workers: Optional[int] = None) -> int:
+        # streams the source file (raw plaintext, such as a bundle
+        # written by bundler.bundle_to) as a binary cryptogram appended
+        # to the target, only a batch of chunks per core is in memory at
+        # a time. Returns the bytes written.
+        __cipher__, __kdf__ = self.__newcipher__(password, salt, kdf)
+        __salt__ = urlsafe_b64decode(salt)
+
+        with open(target, 'ab') as ref:
+            __offset__ = ref.seek(0, 2)
+            ref.write(Cryptogram.header(self.VERSION, __kdf__, False, __salt__, 0))
+
+        __length__ = __cipher__.encrypt_file(str(source), str(target), workers)
+
+        # the ctext length (last field of the header) is known now
+        with open(target, 'rb+') as ref:
+            ref.seek(__offset__ + Cryptogram.HEADER.size - 8)
+            ref.write(struct.pack('<Q', __length__))
+        return Cryptogram.HEADER.size + len(__salt__) + __length__
+
 class decrypter(Feature):
 
     KEY_LENGTH = 32
@@ -148,52 +335,89 @@ class decrypter(Feature):
             self.FILE = Path(file)
         self.OVERWRITES = overwrites
     
-    def decrypt(self, cryptogram: Cryptogram, password: bytes) -> Any:
+    def decrypt(self, cryptogram: Cryptogram, password: Optional[bytes]) -> Any:
         # validate cryptogram to be authentic
         if not Cryptogram.validate(cryptogram):
             return NYEDASEG(self.decrypErr, self.decrypErr.DECRYPT_ERROR_MESSAGE)
+        # without a password, the key verified earlier in this session
+        # (for the same salt) is used.
+        __cached__ = password is None and getattr(self, '__sessionsalt__', None) == cryptogram['salt']
         # also accept password in urlsafe-base64 encoded format only.
-        if not base64tools.is_urlsafe_b64encoded(password):
+        __password__ = None if __cached__ else base64tools.try_decode(password)
+        if not __cached__ and __password__ is None:
             return NYEDASEG(NYEDAException, self.DECRYPT_PARAM_ERROR_MESSAGE.format('password'))
         
         # use a try-finally block to clear variables after use
+        __kdf__ = None
+        __fernet__ = None
         try:
-            # create a key derivation function (Scrypt)
-            __kdf__ = Scrypt(
-                urlsafe_b64decode(cryptogram['salt']),
-                self.KEY_LENGTH,
-                self.MEMORY_COST,
-                self.BLOCKSIZE,
-                self.PARALLEL,
-                self.BACKEND
-            )
-
-            # create the Fernet object with the key derived
-            # from the __kdf__
-            __fernet__ = Fernet(
-                urlsafe_b64encode(
-                    __kdf__.derive(
-                        urlsafe_b64decode(password)
-                    )
-                ),
-                self.BACKEND
-            )
-
             ## try to decrypt the ctext
             try:
+                if __cached__:
+                    __key__ = getattr(self, '__sessionkey__')
+                else:
+                    # derive the key with the kdf (and parameters) of the
+                    # cryptogram if it records them, kept as a bytearray so
+                    # that it can be zeroized. Unknown or out of range
+                    # parameters are tampering like a forged token.
+                    __kdf__ = cryptogram.get('kdf', (Cryptogram.KDF_SCRYPT, self.MEMORY_COST, self.BLOCKSIZE, self.PARALLEL))
+                    if not kdftools.check(__kdf__):
+                        raise InvalidToken
+                    try:
+                        __key__ = kdftools.derive(__kdf__, urlsafe_b64decode(cryptogram['salt']), bytes(__password__), self.KEY_LENGTH)
+                    except ValueError as e:
+                        raise InvalidToken from e
+
+                if cryptogram.get('version', 1) == 2:
+                    # chunked AEAD, decrypted in parallel straight into a
+                    # bytearray (zeroized by the session, a single copy
+                    # of the plaintext)
+                    __cipher__ = crypto.Cipher(__key__)
+                    __plain__ = bytearray(__cipher__.size(cryptogram['ctext']))
+                    __cipher__.decrypt_into(cryptogram['ctext'], __plain__)
+                else:
+                    # create the Fernet object with the key derived
+                    # from the __kdf__
+                    # (the ctext is checked and decoded in one pass, an
+                    # invalid one fails like a forged token)
+                    __fernet__ = Fernet(urlsafe_b64encode(__key__), self.BACKEND)
+                    __ctext__ = base64tools.try_decode(cryptogram['ctext'])
+                    if __ctext__ is None:
+                        raise InvalidToken
+                    __plain__ = __fernet__.decrypt(bytes(__ctext__))
+
                 if cryptogram['intervention'] is True:
-                    return pickle.loads(__fernet__.decrypt(urlsafe_b64decode(cryptogram['ctext'])))
+                    __decrypted__ = pickle.loads(__plain__)
+                    if isinstance(__plain__, bytearray):
+                        __plain__[:] = bytes(len(__plain__))
                 else:
-                    return __fernet__.decrypt(urlsafe_b64decode(cryptogram['ctext']))
-            except (InvalidToken, InvalidSignature):
+                    __decrypted__ = __plain__
+            except (InvalidToken, InvalidSignature, OSError):
                 if self.FILE == Path(''):
                     return NYEDASEG(self.decrypErr, self.decrypErr.DECRYPT_ERROR_MESSAGE)
                 else:
-                    secure_delete.SecureDelete(str(self.FILE), self.OVERWRITES)
+                    __report__ = secure_delete.SecureDelete(str(self.FILE), self.OVERWRITES)
+                    if not __report__.ok:
+                        return NYEDASEG(self.decrypErr, f'{self.FILE} could not be fully deleted ({len(__report__.errors)} errors).')
                     return NYEDASEG(self.decrypErr, f'{self.FILE} has been deleted as a security measure.')
             finally:
                 __kdf__ = None
                 __fernet__ = None
+
+            # the key is verified now, keep it for the session
+            setattr(self, '__sessionkey__', __key__)
+            setattr(self, '__sessionsalt__', cryptogram['salt'])
+            return __decrypted__
         finally:
             del __kdf__
-            del __fernet__
\ No newline at end of file
+            del __fernet__
+
+    def __clearkey__(self) -> None:
+        # zeroize the key of the session (copies made by the crypto
+        # backend itself are out of reach)
+        __key__ = getattr(self, '__sessionkey__', None)
+        if isinstance(__key__, bytearray):
+            __key__[:] = bytes(len(__key__))
+        for __attr__ in ('__sessionkey__', '__sessionsalt__'):
+            if hasattr(self, __attr__):
+                delattr(self, __attr__)
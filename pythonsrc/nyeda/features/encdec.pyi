@@ -1,5 +1,8 @@
 
-from typing import TypeGuard, TypedDict, Any
+from typing import TypeGuard, TypedDict, Any, Optional, Tuple
+from collections.abc import Buffer as ReadableBuffer
+import struct
+from pathlib import Path
 from nyeda.types.abc import Feature
 
 class base64tools(Feature):
@@ -8,6 +11,12 @@ class base64tools(Feature):
     This feature provides tools to work with the base64 library within
     NYEDA's Context.
     """
+    @staticmethod
+    def try_decode(data: Any) -> Optional[memoryview]:
+        """Validates and decodes url-safe base64 encoded bytes in a single
+        pass (see `encoding.Base64`). Returns `None` if the data is not
+        url-safe base64 encoded bytes."""
+
     @staticmethod
     def is_urlsafe_b64encoded(data: Any) -> TypeGuard[bytes]:
         """Returns `True` if given data is urlsafe_b64encoded else `False`.
@@ -25,35 +34,106 @@ class base64tools(Feature):
         """Returns url-safe base64 encoded value."""
     
     @staticmethod
-    def decode(content: bytes) -> bytes:
+    def decode(content: bytes) -> memoryview:
         """Returns url-safe base64 decoded value if the content is
         encoded in the same format else raises partially secret error."""
 
-class Cryptogram(TypedDict):
+class Cryptogram(TypedDict, total=False):
     """Frozen ciphertext and metadata container."""
     ctext: bytes
     salt: bytes
     intervention: bool
+    version: int
+    kdf: Tuple[int, int, int, int]
+
+    HEADER: struct.Struct
+    MAGIC: bytes
+    FLAG_INTERVENTION: int
+    KDF_SCRYPT: int
+    KDF_ARGON2ID: int
 
     @staticmethod
     def validate(other: Any) -> TypeGuard['Cryptogram']:
         """Validates any given data to check if it is a valid Cryptogram."""
+    @staticmethod
+    def is_packed(data: Any) -> bool:
+        """Returns `True` if the data is a binary cryptogram container
+        (checked by its magic alone)."""
+    @staticmethod
+    def header(version: int, kdf: Tuple[int, int, int, int], intervention: bool, salt: bytes, length: int) -> bytes:
+        """Packs the binary container up to the ciphertext (the header
+        and the raw `salt`) for a ciphertext of `length` bytes."""
+    @staticmethod
+    def dump(cryptogram: 'Cryptogram') -> bytes:
+        """Packs a (version 2) cryptogram into its binary container: a
+        fixed header (magic, version, kdf id and parameters, flags, salt
+        length and ciphertext length) followed by the raw salt and the
+        raw ciphertext."""
+    @staticmethod
+    def load(data: ReadableBuffer) -> Optional['Cryptogram']:
+        """Parses a binary cryptogram container in place (the ciphertext
+        is a view over the data). Returns `None` if it is malformed."""
+
+class kdftools(Feature):
+    """[`kdftools`] Feature.
+
+    This feature provides the key derivation functions of NYEDA. A kdf is
+    described by a tuple of its id and three parameters:
+
+    - `(Cryptogram.KDF_SCRYPT, n, r, p)`
+    - `(Cryptogram.KDF_ARGON2ID, iterations, memory in KiB, lanes)`
+    """
+    SCRYPT_MIN_COST: int
+    SCRYPT_BLOCKSIZE: int
+    ARGON2_MIN_MEMORY: int
+    ARGON2_MAX_LANES: int
+    MAX_MEMORY: int
+    MAX_ITERATIONS: int
+    SCRYPT_MAX_BLOCKSIZE: int
+    SCRYPT_MAX_PARALLEL: int
+    @staticmethod
+    def check(kdf: Any) -> bool:
+        """Returns `True` if the kdf is known and its parameters are in
+        range: at most `MAX_MEMORY` bytes, `MAX_ITERATIONS` argon2id
+        iterations and `ARGON2_MAX_LANES` lanes, a power of two scrypt
+        `n`. Parameters read from a cryptogram are untrusted."""
+    @staticmethod
+    def derive(kdf: Tuple[int, int, int, int], salt: bytes, password: bytes, length: int = 32) -> bytearray:
+        """Derives a key of `length` bytes from the raw salt and
+        password. Raises `ValueError` for an invalid kdf (see
+        `check`)."""
+    @staticmethod
+    def calibrate(target_ms: float = 500, max_memory: int = 2**30, kdf: str = 'argon2id') -> Tuple[int, int, int, int]:
+        """Benchmarks this host and returns the strongest parameters of
+        the `kdf` (`argon2id` or `scrypt`) whose derivation takes about
+        `target_ms` milliseconds within `max_memory` bytes.
+
+        The memory is doubled while it fits the budget. Argon2id uses
+        one lane per core (up to `ARGON2_MAX_LANES`) and spends the rest
+        of the budget on iterations."""
 
 class encrypter(Feature):
     """[`encrypter`] Feature.
     
-    This feature provides an `encrypt` method to encrypt any python object.
+    This feature provides an `encrypt` method to encrypt any python object
+    and an `encrypt_file` method to stream a file into a cryptogram.
 
     The `encrypt` method returns a `Cryptogram` which is a frozen ciphertext
     and metadata container.
     """
+    ALGORITHM: str
+    VERSION: int
+    KDF: Tuple[int, int, int, int]
     def encrypt(
             self,
             content: Any,
             password: bytes,
             salt: bytes,
+            kdf: Optional[Tuple[int, int, int, int]] = None,
     ) -> Cryptogram:
         """Encrypts any given python object and returns a `Cryptogram`.
+        Buffers (`bytes`, `ArchByte`, `memoryview`, ...) are encrypted as
+        they are, any other object is pickled first (`intervention`).
 
         The password and salt must be url-safe base64 encoded bytes for this
         method to accept it.
@@ -75,7 +155,29 @@ class encrypter(Feature):
         - Prevents BruteForce Attacks.
         - Based on PBKDF2 and Salsa20/8 core.
         - Freezes the ciphertext to avoid tampering of data.
+
+        The content is encrypted in chunks with `ALGORITHM` (AES-256-GCM,
+        see `crypto.Cipher`) in parallel across all cores, cryptograms
+        are of version `VERSION` (`2`). Version 1 (Fernet) cryptograms
+        are still decrypted.
+
+        The key is derived with `kdf` (default: `KDF`, scrypt), which is
+        recorded in the cryptogram. See `kdftools.calibrate` for
+        Argon2id parameters fitted to the host.
         """
+    def encrypt_file(
+            self,
+            source: Path,
+            target: Path,
+            password: bytes,
+            salt: bytes,
+            kdf: Optional[Tuple[int, int, int, int]] = None,
+            workers: Optional[int] = None,
+    ) -> int:
+        """Streams the `source` file (raw plaintext, such as a bundle)
+        through the cipher as a binary cryptogram appended to `target`,
+        on `workers` threads. Only a batch of chunks is held in memory at
+        a time. Returns the bytes written."""
 
 class decrypter(Feature):
     """[`decrypter`] Feature.
@@ -83,10 +185,13 @@ class decrypter(Feature):
     This feature provides the `decrypt` method to decrypt a `Cryptogram`
     object.
     """
-    def decrypt(self, cryptogram: Cryptogram, password: bytes) -> Any:
+    def decrypt(self, cryptogram: Cryptogram, password: Optional[bytes]) -> Any:
         """Decrypts a cryptogram and returns the decrypted original object.
         
         The password must be url-safe base64 encoded bytes for this method
-        to accept it.
+        to accept it. The derived key is kept for the session once it is
+        verified, with `password=None` it is reused for the same salt.
         """
+    def __clearkey__(self) -> None:
+        """Zeroizes and drops the key kept for the session."""
     def __decryptionfailsafe__(self, file: str, overwrites: int) -> None: ...
\ No newline at end of file
@@ -16,8 +16,9 @@ __segmenticon__: bytes = b'iVBORw0KGgoAAAANSUhEUgAAAgAAAAIACAYAAAD0eNT6AAAACXBIW
 __fileicon__: bytes = b'iVBORw0KGgoAAAANSUhEUgAAAgAAAAIACAYAAAD0eNT6AAAABHNCSVQICAgIfAhkiAAAAAlwSFlzAAAOxAAADsQBlSsOGwAAABl0RVh0U29mdHdhcmUAd3d3Lmlua3NjYXBlLm9yZ5vuPBoAACAASURBVHic7d13eFRV4sbxN70BIdQUJAmg9K406YoIKCoqAgIWcC2rYsP2s6wN7Lju2hsKdnTtgCACUlSsIAjSpYQWWkgv8_tjdNdGSGbu3HPn3u_neWb1Wbn3vBOSOW9uOTdC8LJ0Sd0ltZDURFJTSRmSkiTFS0qRVCSpUNJ-SXmSNkha_8s_v_nlVWJ3cAAAUHU1JY2QNF3SJkk-C16Fkj6TdIek9ra9EwAAUKloSWdKel_-ydqKSb-y1zpJkyRl2_HmAADA79WTdKukrQr9pP9Xr3JJ70kaEOo3CgAA_Ofvb5D_nL2Jif-vXksk9QvlmwYAwKsiJF0kabfMT_iHe70nKStE7x8AAM9pKmmuzE_wVXnly3-EIiokXwkAADziYtlzcZ_Vr0Xy33IIAACqIV7SMzI_kQfz2i1poNVfGAAA3CpN0rcyP4Fb8SqTdIW1Xx4AANyniaS1Mj9xW_26V_4LGQEAwB-0lbRT5ifrUL2eECUAAIDfaSJpu8xP0qF-_dOqLxgAAOEuTf4H8JienO163WjNlw0AgPAVI_8tc6YnZTtfFZLOsuKLBwD4a5xvdb4nJF0S4jFWSZon6XtJayRtlv_Rvwfkf5hQDfmPQmRJaifpOPmX9q0dwkwHJXX5JQ8AAJ4yWqH7LXu5pGsV-GI80ZL6S3pB0qEQZfxBUkKA-QAACEtpkvbK-kn1U1n_hL4USbeFKO99FmcFAMDR_iNrJ9INkk4Jcea6kh6T_1HAVuUulf-UAwAArne6rJ38H5e9h9J7S9poYf7vJEXamB8AANtFS1otaybOfEnD7Y3_X_UlLa1Cxqq-zrM3PgAA9rpU1kyYeyX1tDn7H8VJelXWvJ-t4oJAAIBLxUrapuAny32S2tuc_XAi5b9TwIoSwEODAACuZMVtfwWSetkd_Ahi5b_7INj3tlZcCwAAcKEvFfwkeaHtqaumjvyL-gT7_kJ9JwMAALY6TsFPjtNsT109bSSVKLj3ONP21AAAhNDDCm5i3CP_ffhOd5-Ce5-lkhrYnhoAgBCIkH_9_WAmxvNsTx2YJAX_Xi-yPTUAACHQVcFNiKsUXhfHDVdw73e2_ZEBALDezQpuQhxjf-SgRMpfWgJ9vwXy31kAAEBY-0iBT4a7FZ6T4RUKrvT0sD8yAADWiZK0X4FPhP-0P7Il6koqVuDv-3r7IwOAe0SYDhBG6koaIv8iO23kf1xvLQv2GyGpdhDb95K0yIIcv2or_1oCfSSlK7RHF5IV-LULxfKfCkB4K5Z_2eqtkpZJWiBpnvxPlAQAo5pKelnB_bYaqleepBiL3mesrH-ULy9egbxyJN0lKUUAYECypH8p-IVrQvmy6mr4aEmzHPB-ePH67WufpIvFkUoANmqm4K5St-v1kEXvd5ID3gsvXod7vSuphgBYKpzuHbfL8ZK-kNTSdJAqWGPBPtIlXW3BfoBQGSr_dQH1TAcB3IQC8HtN5f9to47pIFW0zYJ9nCkp3oL9AKF0nPw_m3yvAhahAPxPTfk_YMJhPf1f5Vmwj64W7AOwQw_5r8sBYIFo0wEc5DZJrU2HqI5X_nX6WSOHtukezD5a9HviuDUbcq2KBITaOEmvS5prOggQ7igAfo0lXW46RHW1aFL_CvmCu0C6Y-tUUQAQRiIkfSDWgHCKEkmHJP0s6Qf513GY_cv_B4ejAPjdJo-eW-zYOlWvvb_SdAygOuJ-ecEZGsp__VQ_-Zf4zpc0Tf61HLYbzIUj4BoA_7n_EaZDmHLW4JaKjubbAIBlkiRdIukn-UuAJ3-5Cgd88ksnyv8N60lNGqfowuEdTMcA4D5Jkm6RNF_-pdPhMBQA_1r6nvbwLSepUxt-PgGERFf5n_PQ1nQQ_B4FQGplOoBpSYkxmvfqGJ1ywtGmowBwpwz5L95saDoI_ocCwKEpSVJyzTi9_9wIfTR1pM4c1FJ1aieYjgTAXRpLeltcwOkY3AUQxPn_uU8NVqeWwa0b1Pdvs7R89e6g9mGlQX2baVDfZpKkwqIyFRWXGU4EN7v3icW6_8klpmPAPj0kTZB0v-kgoABIQRwFadKoplJqBVdmoyKdexAmIT5aCfF8iyB0jkqrZToC7HeTpOcksQCJYc6dfQAAblRb0kTTIUABAADY7wJJMaZDeB0FAABgtwbiQWTGUQAAACb0MR3A6ygAAAATPL8Gi2kUAACACemmA3gd93gBCEujzx2tf9z-D9MxPG3hZwt14bgLA928ppVZUH0UAABhKS4uTrVr1zYdw9Oys7KD2Zwj0IbxFwAAgAdRAAAA8CAKAAAAHkQBAADAgygAAAB4EAUAAAAPogAAAOBBrAOAoBUVl2npN1v15Xfb9dPGXK3btFf5haXad6BIcbFRSkqMUWr9GmrepK5aNqun3l0ydXR2HdOxAcDTKAAISGFRmd6ds0bT3l6ueUs2qai47IjbfPDJ2v_--1FptXT2kFYae2Y7tW_ZMJRRAQB_gQKAajmQV6zHXlqmR577Qrv3FgS8ny05B_Xws5_r4Wc_V5-umfq_y3tqQK8mFiYFAFSGAoAq8fmkaW8v18RJc7UrN9_SfS_4YrMWfLFZ_bpn6bG7Bqlls3qW7h8A8GdcBIgj2rH7kAaMnq7zrn3X8sn_tz5dukmdhjyjf7-4LGRjAAD8KACo1KJlW9Rh0NP6ZPFGW8YrKi7TFbfP0tmXzVBBYaktYwKAF1EAcFgffLJWJ42Zrp17Qvdb_-HM-OhH9R85TXuCuM4AAHB4FAD8pQ_nrdUZF7-hwqIjX90fKl98t00njJqu_QeLjGUAALfiIkD8ydJvtmr4399SWVmF6Shavnqnzr5shj6aOkox0fRVwEVaSVof5D7KJR2UtFXSKkkLJc2XxG8NVUABwO_s2Vug4X9_y1Hn3-cu2qhbHvxU9914gukoAKwTJ8mqe387SzpN0k2S9kl6SdI9knZbtH9X4lcq_M4FE9_T1pyDpmP8yQNPLdHHn20wHQOA86VImiD_0YVbJcWbjeNcFAD815sfrvrdan1O4vNJl93yUZVWHAQASTUl3SnpU0lphrM4EgUAkvy3311z9xzTMSq1fvM-PfTM56ZjAAgv3SR9Kamd6SBOQwGAJOn5N75z5KH_P3r42c-Vl19iOgaA8NJI0ixJGaaDOAkFAKqo8OnBp5eajlEle_cX6plXvzEdA0D4SZM0Q_6LDyHuAoD8S_Bu3LLfkn11aJWq4ae0UreOGUqtX0MFhaXatHW_Zi1Yrzc_XKUDecVBj_H8G9_pmvHdLEgLwGO6Sbpe0l2mgzgBBQCa9vaKoPeR1qCG_n3nIJ0xsIUiIn7_3zq3TdOZg1rq3htO0G0Pz9fj074KaqyVP-3Wd6t2qEOr1KD2A8CTJkp6StIu00FM4xSAx_l80sefBbcWR5vmDfTlu-M07OQ_T_6_VTclQY_dNUgvPDhUkZGV_MEqmLUg2PVDAHhUTUk3mw7hBBQAj1uzYY9ydh0KePsGdZP0wfMj1CitVpW3Of-s9po0sX_AY0rSvCWbgtoegKeNFesDUAC87usVOUFtf--N_ZWZkVzt7SZe3F0dWwd-CP-bH4LLDcDTUiT1NR3CNAqAx63ZkBvwtpkZyRo7rH1A20ZGRujWK3sFPHbuvkKeFAggGH1MBzCNAuBxm7YeCHjb005qrqiowM_ln9ynmRITYgLePpjsADyvjekAplEAPC7vUOC35XVqE9xV-Anx0WrZrF7A2x8MIjsAz2tkOoBp3AbocYcKAl9VL7V-jaDHT2sQ-D7y8ikAQLhq0iJdU968Kqh9rP5-s24Y_Vigmwf_ARbmKAAeV1HhC3jbmOiooMePjQl8H-XlgWcHYFZMXIwysusHtY_KbjuuguA_wMIcpwAAAPAgCgAAAB5EAQAAwIMoAAAAeBAFAAAAD6IAAADgQRQAAEBAIoJ4qmeQt_DBAhQAAEBA6qTUCXjblHo1LUyCQFAAAAABadiwoVJSUgLatknLDIvToLooAACAgERFRWnwoMEBbXvC6cdanAbVRQEAAATs6quuVmxsbLW26X5iG7Xr2ixEiVBVFAAAQMCysrL00IMPVfnP122YrFsfuzCEiVBVFAAAQFBGjhipKQ9POeKRgCYtM_TsnJvVICOw6wZgLQoAACBoY0aP0dIlSzVmzBjVrVP3d_-teftMXffAKL28-B86qkkDQwnxRzwO2OMigrgZNzKIe4ABuE9m40xNeWiKHnrgIe3evVubS5YoKb1USTUTTEfDX6AAeFzdlMB_MOvXSbQwSXjILyjV27N-1NzFG7Vpy37lF5aajlSp5Jpxyj4qRYP6NtXQAc0VE81Bv1Dy-XxasHCBZs6cqU2bNmlP7p6g9peQkKC0tDT17tlbp556qmrXrm1R0tCKjIxUw4YNFRGXoYKonabj4DAoAB7X-uj6AW2XEB-t7KPC48PIKm9-uEoT7pitnF2HTEeppk167vVv1Syrjp6aNET9e2SZDuRKP67-UVdOuFLffvut5fv-z3_-ozvuukP_d_P_6YLzL7B8__Amfh3wuGEntwhoSc5BfZspMSHG-kAO9eDTS3XO5W-F4eT_P-s27dXAsS_rlXd_MB3Fdb748gsNGjwoJJP_r_bv36-J10_ULbfeErIx4C0UAI9r07yBzhzUslrbREZG6LYJvUOUyHlmzl-nG-79RD6f6STBKyur0Ljr39f3P3JY1iq7d-_Weeefp0OH7CmHTz71pF559RVbxoK7UQCgJ-8ZoqaZVb8tZ_L1_dW-ZcMQJnKOigqfrrlrjioqXDD7_6KouEwTJ801HcM1HnzoQe3ZE9y5_uq68647VVBQYOuYcB8KAFQ3JUHzXh2jjq1TK_1z0dGRevD_Buj6S3rYlMy8xV9t0er19n6422HOZxu0aet-0zHCXmlpqWa8NcP2cffs2aPZH8-2fVy4CwUAkqTG6cn64t1xevzuwerUJu13_y25ZpxGn9FWy2ddrGsv6mYooRmLvtpiOkLILHbxe7PLqlWrdODAASNjL1261Mi4cA_uAsB_xURH6tLRnXXp6M46kFesbTsOqlaNODWsX8Ozt4_t2B2-F_0dSThf0OgUu3btMjb2zp1cx4HgUADwl5Jrxim5ZmC3CLpJjcTqPeQknNSqEWc6QthLSkoyNnatWrWMjQ138OavdUAVtTq6nukIIdMqwDUg8D9HH320IiPNfIwec8wxRsaFe1AAgEoM7ne0EuLdd6AsrUENde_UyHSMsFe_fn116dLF9nEjIyM1ZPAQ28eFu1AAgEqkJMfrivPt_4APtVuu6KWoKJ7lYIWJ1020fcwzh52pJk2a2D4u3IUCABzBHVf3UdcOGaZjWObkPk118ajOpmO4Rp_efXTZpZfZNl5m40zdfffdto0H96IAAEcQHxetj6aO1AnHZ5uOErSRQ9vo7aeG89u_xf5x-z804coJQT1dsyratWun995970-P2wUCQQEAqqBO7QR9PO1cTX_kdHXrmBFWj0KOjo5U_x5Z-vCFkXrl0TNceU2DaZGRkbr1lls1e-ZsDR40WPHx8Zbuv02bNnrg_gc0e-ZsZWS452gUzOKTAEYFs75-iH_Z-pPIyAide3pbnXt6Wx3IK9bWnIMqKi6zN0Q1JSbEKDMj2VMPbjKpU6dOeunFl1RSUqKtW7cqLy8vqP3FxMYoLTVNKSlVX6obqCoKgGHBfDAXOPxZ9FURzHtIiDc3qbFOAioTGxvr2Yv0VqxYoQ8-_ECrV6_W_qIcJTeMV8cex6j_aZ2VXKeG6Xj4DQqAYTUSA5_EDhWUWJjEjLz84oC3ZSEbwDl27dqla667RrNmzfrTf_vo1SV65ObX9bebT9Ooy08K-bUSqBoKgGE1kwJfaW53bvg_DSyY9xDM1w6AdTb_vFlDTxuqbdu2HfbP5OcVaspNr2n9qq269fELKQEOwEWAhtWsEfgk9tPGXAuT2K-ktFwbg3giXTBfOwDWKCkp0ejRoyud_H_rvWmLNP1RnmToBBQAw7IykgPedvX68C4A6zbtVVlZRUDbxkRHKiOVtdAB01586UX9uPrHam3zzKR3tHf3wRAlQlVRAAw7JrtOwNsuWvZzUFfRm_bZssAfR9ukcYpnn1AIOMn06dOrvU1BfrHmvPVlCNKgOvgENaxF08AX9MjZdUir1--xMI29Pl2yKeBtmwfxdQNgjf3792vlqpUBbfv1Z2ssToPqogAYdkxWSlCrsr07Jzx_iIqKyzR74fqAt2_ZzL1P6QPCxc6dOwPednfOPguTIBAUAMMSE2LUsXVqwNu_9NZyC9PY5705P2n_waKAt-95bGML0wAIRElJ4Lcilzh8ES0voAA4QP8ega8x_-O6PVoUxLl0U5557ZuAt42OjlTvrhQAAAgGBcAB-nXPCmr7yY8vsiaITb78frvmLtoY8PbHtk1jESAACBIFwAF6Hdc4qAe0zJy_Tl98V7V7cJ3gtofmB7X9gF7eXGIVAKxEAXCApMQYnTagecDb-3zS32-dqfJy598T-Pas1UFd_CdJo05rY1EaAPAuCoBDjD2zXVDbf70iR49OdfZ9tfsPFumqO4JbAey49ulq0ZQ7AAAgWBQAhxjQs4lS6wf3pKwbJs_V598691TAuOvf15ac4Fb_GjssuKIEAPCjADhEdHSk_jaqU1D7KC2r0Kgr39bOPfkWpbLOfU8s0duzVge1j1o14nTu6W0tSgQA3kYBcJAJF3QJ-gl3G7fs14DR04O6x95qr7z7g266_5Og9_P3sccqJTnegkQAAAqAg9SpnaCLz-0c9H5WrN6lQee9otx9hRakCs5Lby3X-de-G_QzCxITYnTVuK7WhAIAUACc5tqLuqmGBc-5__zbbep19lRt3BL443aD4fNJ9z6xWOdf965KA3zi329dOrqzGtRNsiAZAECiADhOav0auvWKXpbs68d1e9Rh0NN644NVluyvqg4eKtY5l7-lm-6bZ8nTChvWS9ItFn1NAAB-FAAHunp8N7U6ur4l-zp4qFgjrnhL5137ri0XB8746Ee1HvCk3vzQutLx0C0DVLsW5_4BwEoUAAeKiY7U43cPUkTgDwn8HZ_Pfy6-Rf_HNfnxxTp4qNiaHf_G4q-2aMDo6Tr7shnaGuStfr_Vr3uWRp3Glf8AYDUKgEP16Zqpay_qbuk-9x8s0s33z1PW8Y_q-slz9cOaXUHtr6CwVC-_s0L9RryknmdNDWp9_79Sp3aCpj401LIiBAD4n8AXoEfITbq-vxZ_tUVLv9lq6X73HSjSA08t1QNPLVXbFg00oGcT9euepfatGuqotFqH3a6wqEyr1-_R4q-2aN6STZq7aIPy8gN_HGhlIiKkqQ8OVeP05JDsHwC8jgLgYDHRkXrt38PUcfAz2rs_NLf0rVi9SytW79LDz34uSaqRFKvMjGTVTIpVjaRYlZf7dPBQsXbtydfWHQctuaivKq69qLtOPfEYewarhrKyCs1ZtEEfL9ygLTkHdSDPOest_JW6tROV2ShZg_s1U-8umRxNscGKFSs0c9ZMbdy4Ubt375YviB-apKQkZWRk6Pjjj9eAEwcoLo6nYMI6FACHa5yerI-mjtQJo6Ypv6A05OMdyi_Ryp92h3ycypx64jGafH1_oxn-ytxFG3X5bTO1ZkOu6SjVdv-TS3RsuzQ9ec8QdW6bZjqOK_285WdNnDhRn8wLftGrP3rm2WeUnp6uu-68S6cNPc3y_cObuAYgDHTtkKHX_nWmoqPd_9fVrWOGXvvXMMe91-ff-E4nn_dyWE7-v_pqeY56nT1VH326znQU1_lh5Q86aeBJIZn8f7V9-3aNv2i8Hp7ycMjGgLc461MWh3XKCUfrmXtPUWSke4_htm_ZUDNfHKXEhBjTUX7nsy9_1sU3fxgWj1s-ksKiMo24_C39tDF8i4zT7N-_X6PHjNaePXtCPpbP59PkeyfrvfffC_lYcD8KQBg5_6z2mvHEWYqPc9-Zm24dM_TJK2Mcd7-_zydNuGO2yixYzdAp8vJLdP2k0P2m6jX_fPSf2rrV2gt1K-Pz-XTrbbequNj623nhLRSAMHPGwBb6aOpI1arhnouBhg44RvNeHau6KQmmo_zJsuXb9e3KHaZjWO79T35Szq5DpmOEvfLycr3yyiu2j7tt27aQnm6AN1AAwlC_7lla-OZ5apZVx3SUoERESNdf0kNvPzlcCfHOPKoxf-km0xFCoqLCpwVfbDYdI-z9-OOPyt1r5nTKokWLjIwL96AAhKn2LRvqmw8v0sihbUxHCUjdlAS9_9wI3XfjCYqKcu51Ddt35ZmOEDLbdrj3vdllxw5zR4e2b99ubGy4AwUgjNVMitUrj56hJycNUXLN8DklcGLPbH370d80pP_RpqMcUWK8sy5ItFJSonvfm13i481ds5KUxNMxERwKgAtcPKqTVs-7TGOGtXP0Qi9pDWroxYdO08fTRle64qCTHNOkrukIIdPcxe_NLk2bNlWEoR-6pk2bGhkX7kEBcInU-jX00sOn6ZNXxqhrhwzTcX6nRlKsrr-kh1bPu0xjz3R2Sfmjwf2aKcZhaxJYoW5Kgnoe19h0jLCXlpamDh06GBl70KBBRsaFe7jvk83j-nXP0ufvXKjP3jxfp5xg9hB7zaRYXXlBF62d_3fdd-MJYXnnQoO6SfrbqE6mY1juxkuPd2WxMeGaq6-xfcwhg4eoZYuWto8Ld-ETwKV6HneU3n9uhL54d5wuG3Os6tS25xa7iAipR-dGeuKewdry-VX65-0DlVq_hi1jh8rkG05Qm-YNTMewTM_jjtKVF3QxHcM1Bp08SGPGjLFtvIYNG2rypMm2jQf3cua9V7BMl_bp6tI-XVNuO0kfzlurdz5eo3lLNmlrzkHLxoiNiVLXjhk6qVcTjRzaRk0zUyzbtxPUTIrVrBdH6fS_va6vlueYjhOUgb2b6rV_D1NsTJTpKK5y3-T7JJ80bfq0kI7TpEkTvTztZaWnp4d0HHgDBcAjYmOidMbAFjpjYAtJ0k8bc_Xp0s36buUO_bQxV2s25FbptrD4uGg1b1JXxzSpqxZN6-r4Y49Sz2Mbu_6K8ozUmlr81gV6YtrX-vdLy7Ru017TkaqlXYuGuvaibhp9RltXLydtSmxsrKY8PEVDhgzRI488oi-XfamKCutWj8zIyNCY0WN02aWXKTEx0bL9wtsoAB51THZdHZP9-6vACwpLtXNPvg7ll-hQQYnyC0oVFRWhWjXilFwzTkmJsWpYL8mzE0hsTJQmXNhFEy7soo1b9mtLzkGVlJSbjlWp-LhoZR9VWxmpNU1H8YQTTzhRJ55wovbu26v169eroKAgqP1FR0UrNTVVTZo0MXa3AdyLAmCag54vk5gQo-yjapuOERayj6rN1wqHVSeljuocG94rdcL9uAjQOAc1AACAZ1AAjKMAAADsRwEwjfkfAGAABcA49zxnHgAQPigApvkoAAAA-1EATKvgHAAAwH4UANM4AgAAMIACYFqFsxeSAQC4EwXANAoAAMAACoBpFAAAgAEUAON8lAAAgO0oAE5QUWY6AQDAYygATlDOEQAAgL0oAE5QXmo6AQDAYygATlBBAQAA2IsC4ARlpeKpQAAAO1EAnKKMCwEBAPahADhFWYnpBAAAD6EAOEU5BQAAYB8KgFNwBAAAYCMKgFP4KigBAADbUACcpLTYdAIAgEdQAJykjAIAALBHtOkA-I3yUv-ywFFRAe-irKxCC7_8WQu_3Kydu_NV4WN9AS-Li41S4_RkDe7XTK2Orm86jids2bpFc-bM0fr161VYVBjUvqIio9SgQQP16tlLXbp0UWQkv7PBOhQApykrlKJqBLTp-3N_0jV3z9G6TXstDoVwN3HSXJ3cp6ke_cfJOjq7juk4rpSbm6tbb7tVM96aoYqKCkv3fd_996lF8xaaPGmyevXqZem-4V3USacpKQpos_ueWKLTLnqdyR-HNWvBenU9_TktWrbFdBTX2bhxowacNEBvvPmG5ZP_r1avWa2zhp-lqS9ODcn-4T0UAKcpL632w4Fe_2Clbrr_E3G0H0ey70CRzrj4Df28_YDpKK6Rn5-vUaNH6ectP4d8rPLyct1w4w2a9-m8kI8F96MAOFFJ1c8b5heU6uo7P2byR5Xt2Vugm-5jArHK4088rrVr19o2Xnl5uW686UaVlvIQMQSHAuBE1SgAb8_6UTm7DoUwDNzo9Q9Was_eAtMxwl5FRYWRQ_IbNmzQggULbB8X7kIBcCJfhVRatWsBPlm8KbRZ4Erl5T7N_3yz6Rhhb_Wa1dq5c6eRsRcspAAgOBQApyrOr9If27rjYIiDwK225PC9E6zt27cbG3vbtm3GxoY7UACcqqykSksDx8YEvmYAvC0ulu-dYMXGxpobO87c2HAHCoCTVeEoQLOsFBuCwI2aZbEeQLCys7ONjd0ku4mxseEOFAAnKyuSyssq_SOnnnCMTWHgJrVqxKlP10zTMcLeUY2OUquWrYyMPfCkgUbGhXtQAJzMJ6m48iv8T-zZRN06ZtiTB65xzfhunAKwyIQrJ9g-Zr--_dS-fXvbx4W7UACcrrSw0qMAERHSU5OHqEYS5wNRNZ3bpun6S3qYjuEaw4YN0ylDTrFtvDopdfTA_Q_YNh7ciwLgdD5JRXmV_pF2LRrq_edGqG5Kgj2ZELa6dsjQB8-PUEI8jwGxSkREhJ54_AkNGTwk5GOlpqbq9ddeV1ZWVsjHgvtRAMJBadERlwfu2y1T38-8WONHdFRiQoxNwRAuMlJr6sH_G6AFb5yn1PqBPWwKh5eQkKCpL0zVY_9-TM2aNbN8_zVr1tRF4y_Sgk8XqGPHjpbvH97ErwHhovCgVKNupX8kI7Wmnrn3FD36j5P11fLt2pJzUIfyj3wrIdyrQb0kZTVKVvuWqYqIMJ3G3SIiInTO8HN0zvBztG7dOq1fv167du-SryLwdbpr1qypjEYZ6tC-g9FbDuFOz1Gs3wAAGZVJREFUFIBwUVbivx4g5siH-RPio9WrS2MbQgH4K82aNQvJkQDASpwCCCcFefJfFAAAQHAoAOHEVy4VVn5BIAAAVUEBCDfF-VVaIhgAgMpQAMJR4QHTCQAAYY4CEI7Ky_x3BQAAECAKQLgqzpdKi02nAACEKQpAOCvcL_kqTKcAAIQhCkA4q6iQ8vdxZyAAoNooAOGurEQq5noAAED1UADcoCjf_7wAAACqiALgFgX7jvjAIAAAfkUBcAufpEN7pYpy00kAAGGAAuAmvl8vCuSqQABA5SgAblNeKh3KFbcGAAAqQwFwo_JS_-kAjgQAAA6DAuBWZSX-0wEcCQAA_AUKgJuVFfuPBFACAAB_QAFwu7IS_zUBLBkMAPgNCoAXlP1yTUAFJQAA4EcB8IryUunQbhYLAgBIogB4S0WFlJfrvzYAAOBpFADP8flPBxTxACEA8DIKgFcV5bNqIAB4WLTpADCotEjK2yMlJkvRsabTAK5w8OBBzV8wX2vXrlV-fn5Q-4qJiVFqaqp69eylZs2aWZQQ8KMAeF1FmZSfK8UlSfG1TKcBwtahQ4d0_wP369nnnlVJSYnl--_evbvuuesetWvXzvJ9w5s4BQD_OkFF-f6jAdwlAFRbTk6OBg8ZrMefeDwkk78kLV26VIOGDNJ_3vlPSPYP76EA4H_KS_0lgAsEgSorLi7W6LGjterHVbaM9ffL_64vvvwi5GPB_SgA-LNfjwZwuyBwRM88-4y-__5728YrKSnRxIkTVV5ebtuYcCcKAP7ar08UzM_ltABwGD6fT888-4zt4676cZUWL1ls-7hwFwoAKlda4j8aUHiQ5wkAf7B27Vpt27bNyNjz5s0zMi7cg7sAUDXF-VJJgRSbKMXXkCLojsDWbVvNjb3V3NhwBwoAqs7n8xeB4gIpLtF_62BklOlUgDGRkeaKcGQUJRzBoQAgAL8UgZJ8KTreXwRYSAgelNk405Njwx2okAicT_7VBA_lSgd3--8e4JHD8JDs7Gw1bdrUyNgDBgwwMi7cgwIAa1SU-dcPOLjL_4yB0iKeMwBPuPyyy20fs3Onzjru2ONsHxfuQgGAxXz-yT9_n3Rwp_-fJQUcGYBrjRw5Ur179bZtvKSkJE2ZMkURERG2jQl3ogAgdHy_lIGCA_4y8Osqg6VFFAK4RnR0tJ5_7nn16NEj5GMlJydr2kvT1Kplq5CPBfejAMA-5aX_ewzxwZ1S3m5_OSjO9686yDoDCFO1a9fWW2--pTv_cafq1atn-f6jo6M1bNgwfTrvU1uPNsDduAsA5pSX-V-_FRnpv7UwMtr_7xHRUkTEL_8e6f_3iAj9t7tG_Pd_AKNiYmJ02WWX6eKLL9ayZcu0YeMG7dmzJ6h9JiQkqFGjRurWtZtSUlIsSgr4UQDgLBUVv5weYPlhTyh034OnoqKi1K1bN3Xr1s10FKBSnAIAAMCDKAAAAHgQBQAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwIAoAAAAeRAEAAMCDKAAAAHgQBQAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwoGjTARygMNAN73r6WzXPSrYyC-Ap73y6OeBtY2NjLUwCeA8FQNoX6IYvvPuTlTkAVEOtWrVMRwDCGqcApJ9NBwBQfdlZ2aYjAGGNAiAtMx0AQPW1a9fOdAQgrFEApHmmAwConvT0dB1zzDGmYwBhjQIgfS_pB9MhAFTdGaefYToCEPYoAH5Pmg4AoGpiY2M1btw40zGAsEcB8HtG0kbTIQAc2fhx49X4qMamYwBhjwLgVyLpSkk-00EAHF7dOnV11VVXmY4BuAIF4H8-kPSE6RAA_lpMTIyee_Y51UmpYzoK4AoUgN-bIH8RAOAw99x9j3r27Gk6BuAaFIDfK5M0XNJbpoMA8IuJidHDDz6sCy-40HQUwFUoAH9WKH8JuF1SqeEsgKfVq1dPb894W2PHjjUdBXAdCsBfq5B0p6RjJe01nAXwnISEBF014Sp9-fmX6t69u-k4gCvxMKDKLZeUK4mrjgAbNGvWTGecfobGjhmrtLQ003EAV6MAhNDw4eeodnLgjwuOjIxSbGyMhYkAZ0lMTFRSUpKaZDdR27ZtlZ6ebjoS4BkUgBAaf-E4ZQXxxLKYmBjVrFnDwkQAAPhxDQAAAB5EAQAAwIMoAAAAeBAFAAAAD6IAAADgQRQAAAA8iAIAAIAHUQAAAPAgCgAAAB5EAQAAwIMoAAAAeBAFAAAAD6IAAADgQRQAAAA8iAIAAIAHUQAAAPAgCgAAAB5EAQAAwIMoAAAAeBAFAAAAD6IAAADgQRQAAAA8iAIAAIAHRZsOAPvl5eVp2VfLtHPnTpWWlAa1r9optdW0aVO1btXaonTBKyoq0rJly7Q9Z7uKi4pNxwECFhsXq9TUVHU5rosSExNNx4HLUAA85OctP2vS5El67733VFJSYum-s7KydO0112rEOSMUERFh6b6ras-ePXrgwQf06muvqqCgwEgGIBTi4-N11pln6Ybrb1BaWprpOHAJTgF4xPwF89Wvfz_NmDHD8slfkjZt2qQrrrxCF1x4gYqKiizf_5EsX75c_U7op-eef47JH65TVFSk6S9PV9_-ffX5F5-bjgOXoAB4wIoVKzRm7BgdOHAg5GN98OEHuuLKK0I-zm9t2bpFw0cMV05Ojq3jAnbLzc3VqHNHae3ataajwAUoAC7n8_l01TVXqbCw0LYx__POf_TRzI9sG-_Gm27Unj17bBsPMOngwYO65rprTMeAC1AAXG7BwgX6_vvvbR_3X__6ly3jrF27VrNnz7ZlLMApli5dqq-_-dp0DIQ5CoDLzZkzx8i4X3_ztXJzc0M-jqn3B5jG9z6CRQFwuQ0bNxgZt6KiQps3bw75OKbeH2Daxk0bTUdAmKMAuFxFeYWxsUvLgltjoCrKK8pDPgbgRGWlZaYjIMxRAFwuPSPd2NiNMhqFfIyM9IyQjwE4UUYjvvcRHAqAy_Xt09fIuM2bN1dGRug_oPr27RvyMQAn6te3n-kICHMUAJcbdPIgZWZm2j7u-HHjbRmnc6fOOu7Y42wZC3CKZs2aqVfPXqZjIMxRAFwuNjZWk-6epMhI-_6qj-18rEafO9qWsSIiInTP3fcoNjbWlvEA06Kjo_Xg_Q8qOpqV3BEcCoAHDBw4UJPumaSoqKiQj9WqZSu9OPVFxcTEhHysX3Xq1ElPPfmU4uLibBsTMCEmJkZTHp6inj17mo4CF6AAeMT4ceM1440ZatWyVUj2Hxsbq0suvkQzP5qphg0bhmSMypx6yqma-eFMde3S1faxATt06NBB777zrkaOGGk6ClyCY0ge0qtXL83_dL6-_e5bLV68WDt27FBRcXAP7qlXt56aNm2qAQMGqE5KHYuSBqZdu3b68IMPtXLVSi1cuFBbt25VYZF9SyADVouPi1d6erp69eyldu3aGXvSJtyJAuAxkZGR6typszp36mw6Ssi0btVarVu1Nh0DAByNUwAAAHgQBQAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwIAoAAAAeRAEAAMCDKAAAAHgQBQAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwIAoAAAAeRAEAAMCDKAAAAHgQBQAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwIAoAAAAeFG06AOxXVlamlStXaseOHSoqLgpqX_Xr1Vd2drbS0tIsShe8iooKrV6zWtu2blNBYYHpOEDAEuITlJ6erpYtWyoqKsp0HLgMBcBDcvfm6uGHH9brb7yu_fv3W7bfiIgIderYSddec61OOukky_ZbXfn5-Xrs8cc09cWp2rVrl7EcgNXq1qmrc889VxOunKDk5GTTceASnALwiG---Ua9-_TWU08_ZenkL0k-n09ff_O1Ro0epauvvVqlpaWW7r8q1q9fr_4n9tf9D9zP5A_Xyd2bq0f_9aj69uurlatWmo4Dl6AAeMC6des0fMRw7dy5M-RjTZs2TddNvC7k4_xW7t5cDR8xXOvXr7d1XMBuW7Zu0bBhw7R582bTUeACFAAPmHDVBMt_66_My6-8rPkL5ts23o033cgHIjwjd2-ubrjpBtMx4AIUAJdbunSpvvjyC9vHnfLIFFvG2bx5s9555x1bxgKcYu7cufrhhx9Mx0CYowC43MzZM42M-_nnn9ty1GHW7Fny-XwhHwdwmpmzzPxswz0oAC5n6rx4eXm5Nm3aFPJxOO8Pr9qwYYPpCAhzFACXKy2x_4r8XwW7xkBVmLjjAHCCoqLQ_3zB3SgALmdygZ709PSQj-GkBYgAO9nx8wV3owC4XK-evYyMm5WVpcZHNQ75OKbeH2Ban959TEdAmKMAuNzgwYPVoEED28e94PwLbBmnS5cuatmipS1jAU6R2ThTffv2NR0DYY4C4HKJiYm66467bB2zZYuWGj9uvC1jRUVFafKkyYqOZlVreENERIQm3TNJsbGxpqMgzFEAPODMM8_UDdfbs3BIZuNMTZ8-XXFxcbaMJ0k9e_bUA_c_QAmA60VGRurOO-7UwIEDTUeBC1AAPGLidRP1wvMvqFGjRiHZf2RkpM4-62x9_PHHymycGZIxKjNm9BjNeGOGmjdvbvvYgB2ys7P1yvRXdOkll5qOApfgVyYPOfWUUzXwpIFasGCBFi1epJ27dgZ9m2By7WQd3exoDR40WJmZ9k_8v9WzZ08tnL9QS5Ys0YKFC7R9-3YVFxcbzQQEIyY2Rmmpaerdu7d6Ht9TMTExpiPBRSgAHhMbG6sBAwZowIABpqOERFRUlHr16qVevbg7AAAqwykAAAA8iAIAAIAHUQAAAPAgCgAAAB5EAQAAwIMoAAAAeBAFAAAAD6IAAADgQRQAAAA8iAIAAIAHUQAAAPAgCgAAAB5EAQAAwIMoAAAAeBAFAAAAD6IAAADgQRQAAAA8iAIAAIAHUQAAAPAgCgAAAB5EAQAAwIMoAAAAeBAFAAAAD4o2HQBmbNu2TdtztqugoCDgfURGRKp-g_o6qtFRSkpKsjBd8Hbu3Klt27Yp71Ce6SgIQu3k2srIyFC9evVMRwFchwLgIQUFBXryqSf18isva_PmzZbtNzY2Vn379tU1V1-jYzsfa9l-q6u0tFQvvvSipk6dqtVrVhvLAeu1bdtW48eN14hzRigqKsp0HMAVOAXgET_99JP69OujSZMnWTr5S1JJSYk-_vhjDRo8SPdMukcVFRWW7r8qcnJyNGjIIN14041M_i60YsUKTbhqgk4fdrpy9-aajgO4AgXAA3bs2KEzzz5TGzduDOk4Pp9PUx6Zosn3Tg7pOH-Ul5ens4efre---87WcWG_pUuX6qyzz1JhYaHpKEDYowB4wJUTrlROTo5t4z3yz0f05bIvbRvvtttv47d-D1mxYoUeePAB0zGAsEcBcLlvvvlG8z6dZ-uYPp9PDz30kC1jbd--Xa--9qotY8E5nn7maR04cMB0DCCsUQBc7qOZHxkZd-FnC5WXF_or8GfNnqWysrKQjwNnKSoq0rx59hZbwG0oAC73008_GRm3tLQ05NccSNLatWtDPgacae06_u6BYFAAXM7kxVL5-fkhHyOYdQwQ3g7lHzIdAQhrFACXa9CggbGxU1NTQz5Gw4YNQz4GnCm1Yei_vwA3owC43PHHH29k3LS0NGVlZYV8HFPvD-b16tnLdAQgrFEAXG7I4CFKSUmxfdwxo8coIiIi5OP06N5D2dnZIR8HztKuXTu1adPGdAwgrFEAXC45OVk333SzrWNmZmbq75f93ZaxYmJidPedd9tSNuAM0dHRmnT3JP7OgSBRADzggvMv0Phx420Zq169epo-bbqtDwcaOHCgbrv1NiYED4iMjNT9996vbt26mY4ChD0KgEfcO_lePfjAgyE9HdC_X3_N_XiuWrZoGbIxDueKy6_Q8889r_T0dNvHhj0yMzP16iuvauzYsaajAK7A0wA95PzzztewM4bpw48-1JIlS7Rz506Vl5cHtc-kpCQ1b95cg04epE6dOlmUNDCnnnKqBpw4QLNmz9KCBQuUk5Oj0tJSo5kQnJjYGDXKaKR-_fppwIkDFBsbazoS4BoUAI-pVauWRo4YqZEjRpqOEhLx8fE6_bTTdfppp5uOAo_y-XzKycnR3n17VV4WXMF2unXr1pmOgCBQAAAgSJt_3qwZM2bo0_mf6rvvvlNRUZHpSI7HJTvmUQAAIEDbtm3TQ1Me0ssvvxz06TSviU_gdI5pFAAAqKby8nJNvneyHn_icZWUlJiOE5YSa8SbjuB5FAAAqIZDhw7p4ksv1uzZs01HCWv10-1foAy_RwEAgCrat2-fThl6itasWWM6Sthr3JTneJjGOgAAUAVlZWUaf9F4Jn-LNGvdyHQEz6MAAEAV3HHnHVqwcIHpGK4QGRWp9t2PNh3D8ygAAHAEq9es1tPPPG06hmu07pytGrUSTMfwPAoAABzBHXfewW1-FjrprK6mI0AUAACo1PLlyzVnzhzTMVwjOiZKJ53ZxXQMiAIAAJV67fXXTEdwlUHndFfdhsmmY0AUAACo1CfzPjEdwTUioyJ13jWDTcfALygAAHAY-_bt0_r1603HcI2zxvdT1jFppmPgFxQAADiMdet52p1V6jSopUtuPcN0DPwGKwECwGHs27sv4G1jYmLUtm1bRYThY--WL1-u0tJSy_YXGRmhu579m2rVTrJsnwgeBQAADqOwqDDgbU899VS99dZbFqaxx-23366vv_7a0n2Ov3GouvZvbek-ETxOAQDAYfh8voC3jYmJsTCJPW6__Xbdeeedlu5z8Ijuuuim0yzdJ6zBEQAAgG677Tbdddddlu6z39DOuv3J8WF5GsQLOAIAAB53--23Wz759zy5ve554RJFRTPNOBV_MwDgYaE47N_z5Pa6_-XLFRvHQWYnowAAgEcx-XsbBQAAPIjJHxQAAPAYJn9IFAAA8BQmf_yKAgAAHsHkj9-iAACABzD5448oAADgckz--CsUAABwMSZ_HA4FAABciskflaEAAIALMfnjSCgAAOAyTP6oCgoAALgIkz-qigIAAC7B5I_qoAAAgAsw-aO6KAAAEOaY_BEICgAAhDEmfwSKAgAAYYrJH8GgAABAGGLyR7AoAAAQZpj8YQUKAACEESZ_WIUCAABhgskfVqIAAEAYYPKH1SgAAOBwTP4IBQoAADgYkz9ChQIAAA7F5I9QogAAgAMx-SPUKAAA4DBM_rADBQAAHITJH3ahAACAQzD5w04UAABwACZ_2I0CAACGMfnDBAoAABjE5A9TKAAAYAiTP0yiAACAAUz-MI0CAAA2Y_KHE1AAAMBGTP5wCgoAANiEyR9OQgEAABsw-cNpKAAAEGJM_nAiCgAAhBCTP5yKAgAAIcLkDyfjOwgAQmDmzJl6_fXXLd1nv6GdNfnFSxUdE2XpfuFNHAEAgBA4ePCgpfvreXJ73fPCJUz-sAwFAAAcjsP-CAUKAAA4GJM_QoUCAAAOxeSPUKIAAIADMfkj1CgAAOAwTP6wAwUAAByEyR92oQAAgEMw-cNOFAAAcAAmf9iN77Qjqwh0wy1btyqlTp2AB46JjlF5eVnA2wMITkFBgS3jsMIfTKAAHFnAnwDjxl9oZQ4ALsQKfzCFUwBHtt10AADuxGF_mEQBOLKVpgMAcJ9-QzvrwVevYPKHMRSAI_vMdAAA7sJhfzgBBeDI5knKMx0CgDtw2B9OQQE4sgJJL5sOASD8cdgfTkIBqJq7FMTdAADAYX84DQWgarZL-qfpEADCE4f94UQUgKqbJGm56RAAwsvgkT047A9HogBU3SFJp0nabToIAOeLiIjQBdcN0R1Pj-ewPxyJSlo9myQNlfS-pHpmowBwquQ6NXT7k-PUe3AH01GAw-IIQPV9LqmTpG9MBwHgLBERERo8sofe_OoeJn84HkcAArNFUl9Jd0i6TFKc0TQAjIqIiFDvIR104XWnqPWxTUzHAaqEAhC4PEnXSHpU_iIwXFK80UQAbJWRXV8nD--mwSN6KPPoVNNxgGqhAARvk6TzJE2QNEhSH0ltJKVLqm3B_msqwL-nxBrxio7m4iMgWEm14pWQGKeGjeqocbNUNW_XWJ16NVej7AamowEBowBYZ7-kV395WekLSV0C2fCJDyZyOBIA8Je4CBAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwIAoAAAAeRAEAAMCDKAAAAHgQBQAAAA-iAAAA4EEUAAAAPIgCAACAB1EAAADwIAoAAAAeRAEAAMCDKADO5wt0w_25h6zMAQCOEuRnXIVVOcJVhOkAOKJPJPU3HQIAXOZ7SR1MhzCJIwDOt8N0AABwIc9_tlIAnO9H0wEAwIVWmQ5gGgXA-T4zHQAAXGih6QCmcQ2A88VK2iapnukgAOASBZJSJeWZDmISRwCcr0TSNNMhAMBF3pTHJ3-JIwDhor6kdZJqmQ4CAGGuRFIrSetNBzGNIwDhYbekh0yHAAAXeFxM_pI4AhBOEiUtktTRdBAACFNrJXWRtN90ECegAISXdEnLfvknAKDq8iR1l7TSdBCn4BRAeNkuaZikXNNBACCM5Mn_2cnk_xsUgPDzhfyHsPhGBoAj2yKpr6S5hnM4TpTpAAjIPknTJSXLv5Y1f48A8HsVkl6UdJa46O8vcQ1A-Dta0t3yH96KNpwFAEyrkPShpP-TtMJwFkejALhHA0mnyX-oq7WkxpJqi79jAO62T_7ro36QtEDSe_Kvnooj-H-TfSiArxODcAAAAABJRU5ErkJggg=='
 # endregion
 
-from customtkinter import CTk, CTkToplevel, CTkLabel, CTkEntry, CTkFrame, StringVar
-from typing import Union, Tuple, List
+from customtkinter import CTk, CTkToplevel, CTkLabel, CTkEntry, CTkFrame, CTkTextbox, CTkScrollbar, CTkSwitch, StringVar
+from typing import Union, Tuple, List, Callable
+from bisect import bisect_left
 from types import SimpleNamespace
 from tkinterdnd2.TkinterDnD import Tk
 from tkinter.ttk import Treeview, Style
@@ -183,6 +184,180 @@ class FilesystemTree(Treeview):
         style.configure("Treeview", font=("Fira Code", 13))
         style.configure("Treeview.Heading", font=('', 14, 'italic'))
 
+class FileViewer(CTkFrame):
+    # bytes of the file held in the widget at a time
+    WINDOW = 1 << 16
+    # bytes looked at to tell text from binary content
+    SAMPLE = 1 << 13
+    # longer lines (minified files, long records) are wrapped, so that a
+    # window always spans many rows
+    LINEWIDTH = 1 << 10
+
+    def __init__(self, master, reader: Callable[[int, int], bytes], size: int, *args, **kwargs) -> None:
+        super().__init__(master, *args, **kwargs)
+
+        # the file is never read whole, only windows of it (reader
+        # takes an offset and a length) as the view moves. a window of
+        # a version 1 (gzip) bundle costs O(offset), its stream is
+        # decompressed from the start on every read.
+        self.__reader__ = reader
+        self.__size__ = size
+        self.__offset__ = 0
+        self.__windowend__ = 0
+        self.__rows__: List[int] = []
+
+        # binary content opens in hex mode
+        __sample__ = bytes(reader(0, self.SAMPLE))
+        self.__hexmode__ = b'\x00' in __sample__
+        if not self.__hexmode__:
+            try:
+                __sample__.decode()
+            except UnicodeDecodeError as e:
+                # a character cut at the end of the sample is fine
+                self.__hexmode__ = e.start < len(__sample__) - 3
+
+        self.__switch__ = CTkSwitch(self, text='Hex', command=self.__togglehex__)
+        self.__switch__.pack(side='top', anchor='e', padx=4, pady=4)
+        if self.__hexmode__:
+            self.__switch__.select()
+
+        # scrolling is virtual: the scrollbar spans the whole file while
+        # the textbox holds only the current window.
+        self.__scrollbar__ = CTkScrollbar(self, command=self.__scroll__)
+        self.__scrollbar__.pack(side='right', fill='y')
+        self.__text__ = CTkTextbox(self, wrap='none', activate_scrollbars=False, font=("Fira Code", 13))
+        self.__text__.pack(side='left', fill='both', expand=True)
+
+        self.__text__.bind('<MouseWheel>', self.__wheel__)
+        self.__text__.bind('<Button-4>', self.__wheel__)
+        self.__text__.bind('<Button-5>', self.__wheel__)
+        self.__text__.bind('<Configure>', lambda event: self.__sync__())
+
+        self.__render__(0)
+
+    def __render__(self, offset: int, align: bool = False) -> None:
+        # loads the window starting at offset (the start of a line,
+        # found from offset on if align is set).
+        if self.__hexmode__:
+            offset -= offset % 16
+        __data__ = bytes(self.__reader__(offset, self.WINDOW))
+
+        __rows__, __lines__ = [], []
+        if self.__hexmode__:
+            for __at__ in range(0, len(__data__), 16):
+                __chunk__ = __data__[__at__:__at__ + 16]
+                __ascii__ = ''.join(chr(__byte__) if 32 <= __byte__ < 127 else '.' for __byte__ in __chunk__)
+                __rows__.append(offset + __at__)
+                __lines__.append(f'{offset + __at__:08x}  {__chunk__.hex(" "):<47}  {__ascii__}')
+        else:
+            if align and offset > 0:
+                __cut__ = __data__.find(b'\n')
+                if __cut__ != -1:
+                    offset += __cut__ + 1
+                    __data__ = __data__[__cut__ + 1:]
+            # the last line is left for the next window unless the file ends
+            if offset + len(__data__) < self.__size__:
+                __cut__ = __data__.rfind(b'\n')
+                if __cut__ != -1:
+                    __data__ = __data__[:__cut__ + 1]
+
+            __position__ = offset
+            for __line__ in __data__.split(b'\n'):
+                while True:
+                    __cut__ = self.__wrap__(__line__)
+                    __rows__.append(__position__)
+                    __lines__.append(__line__[:__cut__].decode(errors='replace').rstrip('\r'))
+                    __position__ += __cut__
+                    __line__ = __line__[__cut__:]
+                    if not __line__:
+                        break
+                __position__ += 1
+            if __data__.endswith(b'\n'):
+                __rows__.pop()
+                __lines__.pop()
+
+        self.__offset__ = offset
+        self.__windowend__ = offset + len(__data__)
+        self.__rows__ = __rows__
+
+        self.__text__.configure(state='normal')
+        self.__text__.delete('1.0', 'end')
+        self.__text__.insert('1.0', '\n'.join(__lines__))
+        self.__text__.configure(state='disabled')
+        self.__sync__()
+
+    def __wrap__(self, line: bytes) -> int:
+        # length of the first row of the line, cut at a character
+        # boundary if it is longer than LINEWIDTH
+        if len(line) <= self.LINEWIDTH:
+            return len(line)
+        __cut__ = self.LINEWIDTH
+        while __cut__ > self.LINEWIDTH - 3 and line[__cut__] & 0xC0 == 0x80:
+            __cut__ -= 1
+        return __cut__
+
+    def __row__(self, y: int) -> int:
+        # window row at the given height of the textbox
+        return int(self.__text__.index(f'@0,{y}').split('.')[0]) - 1
+
+    def __sync__(self) -> None:
+        # places the scrollbar as per the visible rows
+        if not self.__rows__ or not self.__size__:
+            self.__scrollbar__.set(0.0, 1.0)
+            return None
+
+        __top__ = min(self.__row__(0), len(self.__rows__) - 1)
+        __bottom__ = self.__row__(self.__text__.winfo_height()) + 1
+        __last__ = self.__rows__[__bottom__] if __bottom__ < len(self.__rows__) else self.__windowend__
+        self.__scrollbar__.set(self.__rows__[__top__] / self.__size__, __last__ / self.__size__)
+        return None
+
+    def __scrollby__(self, units: int) -> None:
+        self.__text__.yview('scroll', units, 'units')
+        __top__, __bottom__ = self.__text__.yview()
+
+        if units > 0 and __bottom__ >= 1.0 and self.__windowend__ < self.__size__:
+            # move the window on, starting at the top visible row (or
+            # past the rows in view if the window is in view as a whole)
+            __next__ = self.__rows__[min(self.__row__(0), len(self.__rows__) - 1)]
+            if __next__ <= self.__offset__:
+                __next__ = self.__rows__[-1] if len(self.__rows__) > 1 else self.__windowend__
+            self.__render__(__next__)
+        elif units < 0 and __top__ <= 0.0 and self.__offset__ > 0:
+            # move the window back, keeping the top visible row in view
+            __anchor__ = self.__offset__
+            self.__render__(max(0, __anchor__ - self.WINDOW // 2), align=True)
+            __index__ = bisect_left(self.__rows__, __anchor__)
+            self.__text__.yview('moveto', max(0, __index__ + units) / max(len(self.__rows__), 1))
+        self.__sync__()
+        return None
+
+    def __scroll__(self, *args) -> None:
+        # scrollbar command: moveto fraction or scroll n units/pages
+        if args[0] == 'moveto':
+            self.__render__(int(float(args[1]) * self.__size__), align=True)
+        elif args[0] == 'scroll':
+            __units__ = int(args[1])
+            if args[2] == 'pages':
+                __units__ *= max(self.__row__(self.__text__.winfo_height()) - self.__row__(0), 1)
+            self.__scrollby__(__units__)
+        return None
+
+    def __wheel__(self, event=None, /) -> str:
+        if getattr(event, 'num', None) in (4, 5):
+            __units__ = -3 if event.num == 4 else 3
+        else:
+            __units__ = -3 if event.delta > 0 else 3
+        self.__scrollby__(__units__)
+        return 'break'
+
+    def __togglehex__(self) -> None:
+        # the same position in the other mode
+        __top__ = self.__rows__[min(self.__row__(0), len(self.__rows__) - 1)] if self.__rows__ else 0
+        self.__hexmode__ = bool(self.__switch__.get())
+        self.__render__(__top__, align=True)
+        return None
+
 class DropFrame(CTkFrame):
     __filesystem__: List[Path] = []
     def __init__(self, master, *args, **kwargs) -> None:
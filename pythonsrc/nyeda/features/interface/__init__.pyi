@@ -122,6 +122,21 @@ class FilesystemTree(ttk.Treeview):
     def __init__(self, *args, **kwargs) -> None:
         """Createa Filesystem Tree."""
 
+class FileViewer(CTkFrame):
+    """[`File Viewer`] View.
+
+    This is a derived form of `customtkinter.CTkFrame` which shows
+    a file of any size page by page. Only a window of the file (about
+    `WINDOW` bytes) is read and held at a time, it moves as the view
+    is scrolled. Binary content is shown in hex mode.
+    """
+    WINDOW: int
+    SAMPLE: int
+    def __init__(self, master, reader: Callable[[int, int], bytes], size: int, *args, **kwargs) -> None:
+        """Create a File Viewer over a file of `size` bytes. The
+        `reader` returns the bytes of the file at a given offset and
+        length."""
+
 class DropFrame(CTkFrame):
     """[`Drop Frame`].
     
@@ -1,14 +1,16 @@
 
-from nyeda.features.interface import mastertools, FilesystemTree, icons
+from nyeda.features.interface import mastertools, FilesystemTree, FileViewer, icons
 from nyeda.bin.sharedobject import bundle, secure_delete
 from nyeda.features.dismantler import dismantler
 from nyeda.features.direngine import dirtools
 from nyeda.features.preproc import preproc
+from nyeda.features.worker import worker
+from nyeda.exceptions import NYEDAException, NYEDASEG
 from typing import Any
 
 from tkinter.ttk import Panedwindow, Separator
 from tkinter.filedialog import askdirectory
-from customtkinter import CTkFrame, CTkButton, CTkTextbox
+from customtkinter import CTkFrame, CTkButton, CTkLabel, CTkProgressBar
 
 from pathlib import Path
 
@@ -20,7 +22,10 @@ if sys.platform == 'darwin':
 if sys.platform == 'win32':
     from nyeda.bin.sharedobject import windows
 
-class segmenter(preproc, dismantler, dirtools, mastertools):
+# items inserted into the navigator per event loop turn
+BATCHSIZE = 500
+
+class segmenter(preproc, dismantler, dirtools, worker, mastertools):
     def __init__(self, content: Any, thisfile: str, overwrites: int = 5) -> None:
         # set the global class variable
         setattr(self, '__thisfile__', thisfile)
@@ -65,17 +70,39 @@ class segmenter(preproc, dismantler, dirtools, mastertools):
         # Since this is the view options, there must be a
         # new menu at the top asking for export (Do it Later)
 
-        __processed__ = self.preproc(self.__content__)
+        __decrypt__ = self.prepare(self.__content__)
 
         # the window needs to deinconify cause of preproc
         self.__master__.deiconify()
 
-        __dismantled__ = self.dismantle(__processed__)
+        def __dismantle__(processed):
+            self.dismantle(processed)
+            return processed
+
+        def __trie__(processed):
+            # Generate the path trie to show (paths and sizes only, the
+            # contents are read when a file is selected)
+            if getattr(self, '__dismantlefailure__', True):
+                return None
+            return self.generate_tree(self.handle(processed))
+
+        # the slow stages run in the background, the view is built
+        # once they are done
+        self.__decrypting__(
+            __decrypt__,
+            [('Dismantling', __dismantle__), ('Reading entries', __trie__)],
+            self.__viewready__,
+            self.__restore__,
+        )
+        return None
 
+    def __viewready__(self, pathtree) -> None:
         # Handle any dismantling errors
-        if not hasattr(self, '__dismantlefailure__') or (hasattr(self, '__dismantlefailure__') and getattr(self, '__dismantlefailure__') is True):
+        if pathtree is None:
             # securely delete the thisfile
-            _ = secure_delete.SecureDelete(str(getattr(self, '__thisfile__')), getattr(self, '__overwrites__'))
+            return self.__wipe__()
+
+        self.__pathtree__ = pathtree
 
         # Create the master here
 
@@ -87,9 +114,9 @@ class segmenter(preproc, dismantler, dirtools, mastertools):
         self.__pannedwindow__.add(self.__pannedleft__)
         self.__pannedwindow__.add(self.__pannedright__)
 
-        # Generate metadata to show
-        self.__metadata__ = bundle.Structure.get(__dismantled__)
-        self.__dirmap__ = self.generate_dirmap(self.__metadata__)
+        # Export only what is selected in the tree
+        self.__exportselectionbutton__ = CTkButton(self.__pannedleft__, text='Export selection', command=self.__exportselection__)
+        self.__exportselectionbutton__.pack(side='bottom', fill='x', padx=4, pady=4)
 
         # Create the filesystem tree
         self.__tree__ = FilesystemTree(self.__pannedleft__)
@@ -100,50 +127,104 @@ class segmenter(preproc, dismantler, dirtools, mastertools):
 
         # set the interactive clicks
         self.__tree__.bind('<<TreeviewSelect>>', self.__nav__)
+        # folders are filled when they are first opened
+        self.__tree__.bind('<<TreeviewOpen>>', self.__open__)
+
+        # trie node ids are used as the item ids (root: 0), so every
+        # click maps straight back to its node.
+        self.__tree__.insert('', 'end', iid='0', text='  /', open=False, image=self.__tree__.__archivetype__)
+        self.__populated__ = set()
+        self.__populate__(0)
+        return None
+
+    def __busy__(self, stages, done, cancelled=None, critical=False) -> None:
+        # Show a progress bar (with a cancel button unless the stages
+        # are critical) over the window while the stages run in the
+        # background
+        __overlay__ = CTkFrame(self.__master__)
+        __overlay__.place(relx=0.5, rely=0.5, anchor='center')
+        __label__ = CTkLabel(__overlay__, text='')
+        __label__.pack(padx=12, pady=(12, 4))
+        __bar__ = CTkProgressBar(__overlay__, width=240)
+        __bar__.set(0)
+        __bar__.pack(padx=12, pady=4)
+
+        def __progress__(fraction: float, label: str) -> None:
+            __bar__.set(fraction)
+            __label__.configure(text=label)
+
+        def __done__(result) -> None:
+            __overlay__.destroy()
+            done(result)
+
+        def __cancel__() -> None:
+            __cancelevent__.set()
+            __overlay__.destroy()
+            if cancelled is not None:
+                cancelled()
+
+        __cancelevent__ = self.background(stages, __done__, __progress__, critical)
+        if not critical:
+            CTkButton(__overlay__, text='Cancel', command=__cancel__).pack(padx=12, pady=(4, 12))
+        return None
+
+    def __decrypting__(self, decrypt, stages, done, cancelled=None) -> None:
+        # Decryption runs as a critical run of its own (a wrong passkey
+        # wipes thisfile from within it, which must never be abandoned),
+        # the stages after it get the decrypted payload and can be
+        # cancelled.
+        def __decrypted__(processed) -> None:
+            __stages__ = [
+                (__label__, (lambda _, stage=__stage__: stage(processed)) if __index__ == 0 else __stage__)
+                for __index__, (__label__, __stage__) in enumerate(stages)
+            ]
+            self.__busy__(__stages__, done, cancelled)
+
+        self.__busy__([('Decrypting', lambda _: decrypt())], __decrypted__, critical=True)
+        return None
+
+    def __restore__(self) -> None:
+        # back to the View/Export choice
+        self.__separator__.place(relx=0.5, rely=0.22, height=180)
+        self.__viewbutton__.place(rely=0.5, relx=0.25, anchor='center')
+        self.__exportbutton__.place(rely=0.5, relx=0.75, anchor='center')
+        return None
 
-        # store the nodes for lookup (default: root)
-        self.__nodes__ = {'/': self.__tree__.insert('', 'end', text='  /', open=False, image=self.__tree__.__archivetype__)}
-
-        # Create all directories in the first pass
-        # Use a sorted order for better readability
-        # and structure
-        for __path__ in sorted(self.__dirmap__.keys()):
-            if __path__ == '/':
-                continue
-
-            # Current path and parent path must be derived
-            *__parentparts__, __name__ = __path__.strip('/').split('/')
-            __parent__ = '/' + '/'.join(__parentparts__) if __parentparts__ else '/'
-            # find parent node ID ('' for root)
-            __parentnode__ = self.__nodes__.get(__parent__, '')
-            # define node structure
-            __node__ = self.__tree__.insert(
-                parent=__parentnode__,
+    def __populate__(self, node: int) -> None:
+        # only the children of the node are inserted, each folder gets a
+        # placeholder child (iid: '<id>.') so that it can be opened.
+        if node in self.__populated__:
+            return None
+        self.__populated__.add(node)
+
+        if self.__tree__.exists(f'{node}.'):
+            self.__tree__.delete(f'{node}.')
+        self.__insertbatch__(node, self.__pathtree__.children(node), 0)
+        return None
+
+    def __insertbatch__(self, parent: int, children: list, start: int) -> None:
+        # huge folders are inserted in batches, the rest is scheduled
+        # so the window stays responsive.
+        for __node__, __name__, __isdir__ in children[start:start + BATCHSIZE]:
+            self.__tree__.insert(
+                parent=str(parent),
                 index='end',
+                iid=str(__node__),
                 text='  ' + __name__,
                 open=False,
-                image=self.__tree__.__foldertype__,
+                image=self.__tree__.__foldertype__ if __isdir__ else self.__tree__.__filetype__,
             )
-            # Insert into lookup
-            self.__nodes__[__path__] = __node__
-        # Add all contents (files and directories) inside the created directories
-        for __path__, __contents__ in sorted(self.__dirmap__.items()):
-            # get parent node ('' for root)
-            __parentnode__ = self.__nodes__.get(__path__, '')
-
-            for __item__ in sorted(__contents__):
-                # Construct full path for the item
-                __itemfullpath__ = f"{__path__.rstrip('/')}/{__item__}" if __path__ != '/' else f"/{__item__}"
-                # If item is already in directory map, it is a directory and was
-                # handled above (in first pass)
-                if __itemfullpath__ not in self.__dirmap__:
-                    self.__tree__.insert(
-                        parent=__parentnode__,
-                        index='end',
-                        text='  ' + __item__,
-                        open=False,
-                        image=self.__tree__.__filetype__
-                    )
+            if __isdir__:
+                self.__tree__.insert(str(__node__), 'end', iid=f'{__node__}.', text='')
+
+        if start + BATCHSIZE < len(children):
+            self.__master__.after(1, self.__insertbatch__, parent, children, start + BATCHSIZE)
+        return None
+
+    def __open__(self, event=None, /) -> None:
+        __opened__ = self.__tree__.focus()
+        if __opened__.isdigit():
+            self.__populate__(int(__opened__))
         return None
 
     def __nav__(self, event=None, /) -> None:
@@ -155,39 +236,30 @@ class segmenter(preproc, dismantler, dirtools, mastertools):
         for __child__ in self.__pannedright__.winfo_children():
             __child__.destroy()
         
-        # Derive absolute text of the selected field from the tree
-        __text__ = self.__tree__.item(__selected__[0], 'text').strip()
-
-        # Try to find full path from the metadata map 
-        # (determine if the selected item is a file or directory)
-        __sfile__ = None
-        if hasattr(self, '__metadata__'):
-            for __path__ in self.__metadata__.keys():
-                if __path__.endswith(__text__):
-                    __sfile__ = __path__
-                    break
-            
+        # The item id is the trie node of the selection
+        if not __selected__[0].isdigit(): return None
+        __node__ = int(__selected__[0])
+
+        if hasattr(self, '__pathtree__'):
             # if selection is a file
-            if __sfile__:
-                __content__ = self.__metadata__.get(__sfile__, None)
-                if __content__:
-                    # Create a TextBox under right paned window
-                    __textbox__ = CTkTextbox(self.__pannedright__, height=500, wrap='word')
-                    __textbox__.pack(fill='both', expand=True)
-
-                    # Try to decode the content from the bytes to str
-                    try:
-                        __content__ = __content__.decode()
-                        __textbox__.insert('1.0', __content__)
-                    except Exception:
-                        __textbox__.insert('1.0', 'Currently Supports Text Files Only! This file contains un-convert-able binary data.')
-                    finally:
-                        __textbox__.configure(state='disabled')
+            if not self.__pathtree__.is_dir(__node__):
+                __sfile__ = self.__pathtree__.path(__node__).lstrip('/')
+                __size__ = self.__pathtree__.size(__node__)
+                if __size__:
+                    # Show the file page by page, reading windows of it
+                    # on demand (hex mode for binary content)
+                    __viewer__ = FileViewer(
+                        self.__pannedright__,
+                        lambda offset, length: getattr(self, '__handle__').read(__sfile__, offset, length),
+                        __size__,
+                    )
+                    __viewer__.pack(fill='both', expand=True)
             else:
                 # If selection is not a file, trigger opena and close behaviour
                 if self.__tree__.item(__selected__[0], 'open'):
                     self.__tree__.item(__selected__[0], open=False)
                 else:
+                    self.__populate__(__node__)
                     self.__tree__.item(__selected__[0], open=True)
         return None
     
@@ -201,23 +273,93 @@ class segmenter(preproc, dismantler, dirtools, mastertools):
         if not extloc:
             return None
 
-        __processed__ = self.preproc(self.__content__)
-        
-        if self.dismantle2(__processed__, extloc) is False:
-            _ = secure_delete.SecureDelete(str(getattr(self, '__thisfile__')), getattr(self, '__overwrites__'))
+        __decrypt__ = self.prepare(self.__content__)
+
+        self.__decrypting__(
+            __decrypt__,
+            [('Exporting', lambda processed: self.dismantle2(processed, extloc))],
+            self.__exported__,
+        )
     
+    def __exportselection__(self) -> None:
+        # selected files and folders (folders with everything beneath)
+        __selection__ = [self.__pathtree__.path(int(__node__)) for __node__ in self.__tree__.selection() if __node__.isdigit()]
+        if not __selection__:
+            return None
+
+        # Get the export location
+        self.__master__.attributes('-topmost', False)
+        extloc = askdirectory(initialdir=Path.cwd(), mustexist=True, title='Select export location', parent=self.__master__)
+        self.__master__.attributes('-topmost', True)
+        self.__master__.focus_force()
+
+        if not extloc:
+            return None
+
+        __decrypt__ = self.prepare(self.__content__)
+
+        self.__decrypting__(
+            __decrypt__,
+            [('Exporting', lambda processed: self.dismantle2(processed, extloc, paths=__selection__))],
+            self.__exported__,
+        )
+
+    def __exported__(self, exported) -> None:
+        if exported is False:
+            self.__wipe__()
+
+    def __wipe__(self) -> None:
+        # securely delete the thisfile in the background, the window
+        # closes once it is gone. The wipe cannot be cancelled or
+        # abandoned (focus out, watchman and closing the window do not
+        # quit while it runs).
+        if getattr(self, '__wiping__', False):
+            return None
+        setattr(self, '__wiping__', True)
+        self.__master__.protocol('WM_DELETE_WINDOW', lambda: None)
+
+        def __progress__(files: int, written: int, total: int) -> None:
+            # the total is known once the tree has been walked
+            self.report(written / total if total else 0.0)
+
+        self.__busy__(
+            [('Wiping', lambda _: secure_delete.SecureDelete(str(getattr(self, '__thisfile__')), getattr(self, '__overwrites__'), 'legacy', None, 'pass', __progress__))],
+            self.__wiped__,
+            critical=True,
+        )
+        return None
+
+    def __wiped__(self, report) -> None:
+        if not report.ok:
+            __path__, __error__ = report.errors[0]
+            return NYEDASEG(NYEDAException, f'{len(report.errors)} entries could not be wiped ({__path__}: {__error__}).')
+        self.__quitmainloop__()
+        return None
+
     def __watchmanpatrol__(self, event=None, /) -> None:
         if sys.platform == 'darwin' and self.__watchman__.detect():
             self.__watchman__.kill()
-            # Normal quit
-            self.__quitmainloop__(event)
+            # Normal quit (unless a wipe is running)
+            if not self.critical():
+                self.__quitmainloop__(event)
         self.__master__.after(1, self.__watchmanpatrol__)
     
     def __quitmainloop__(self, event=None, /) -> str:
+        # nothing decrypted outlives the session
+        self.__clearsession__()
         self.__quitmaster__(event)
         return 'break'
+
+    def __quitmaster__(self, event=None, /) -> None:
+        # a running wipe is finished before quitting
+        self.join()
+        super().__quitmaster__(event)
+        return None
     
     def __focusout__(self, event=None, /) -> None:
+        # a running wipe is never abandoned
+        if self.critical():
+            return None
         __focus__ = self.__master__.focus_get()
         if __focus__ is None:
             # this is focusout quit
@@ -0,0 +1,116 @@
+
+from nyeda.exceptions import NYEDASEG, NYEDAException
+from nyeda.types.archive import ArchByte, ArchByteInt
+from nyeda.types.abc import Feature
+from nyeda.features.encdec import Cryptogram
+from typing import Any, Optional, Union
+from pathlib import Path
+import struct
+import mmap
+import zlib
+
+class payloadtools(Feature):
+    # trailer layout (little endian, 32 bytes):
+    # magic (8) | offset (8) | length (8) | crc32 (4) | kind (1) | reserved (3)
+    TRAILER = struct.Struct('<8sQQIB3x')
+    MAGIC = b'NYEDAPL1'
+    KIND_BUNDLE = 0
+    KIND_CRYPTOGRAM = 1
+    # every bundle starts with this (sharedobject, all engine versions)
+    BUNDLE_MAGIC = b'CODENAME-NT'
+    CHUNKSIZE = 1 << 20
+    # raw resource location inside a macos .app bundle
+    RESOURCE = ('Contents', 'Resources', 'payload.nyeda')
+
+    @staticmethod
+    def embed(target: Path, payload: Union[ArchByte[ArchByteInt], bytes], kind: int) -> None:
+        # the payload is appended to the end of the target as it is,
+        # followed by the trailer which points back at it.
+        __view__ = memoryview(payload).cast('B')
+        __checksum__ = 0
+
+        with open(target, 'ab') as ref:
+            __offset__ = ref.seek(0, 2)
+
+            # write in chunks so that the checksum can be computed
+            # on the go without an extra pass over the payload.
+            for __start__ in range(0, len(__view__), payloadtools.CHUNKSIZE):
+                __chunk__ = __view__[__start__:__start__ + payloadtools.CHUNKSIZE]
+                __checksum__ = zlib.crc32(__chunk__, __checksum__)
+                ref.write(__chunk__)
+
+            ref.write(payloadtools.TRAILER.pack(
+                payloadtools.MAGIC,
+                __offset__,
+                len(__view__),
+                __checksum__,
+                kind,
+            ))
+
+    @staticmethod
+    def seal(target: Path, offset: int, kind: int) -> None:
+        # the payload was already written into the target (from offset
+        # to the end), only the trailer is appended.
+        __checksum__ = 0
+
+        with open(target, 'rb+') as ref:
+            ref.seek(offset)
+            while __chunk__ := ref.read(payloadtools.CHUNKSIZE):
+                __checksum__ = zlib.crc32(__chunk__, __checksum__)
+
+            __end__ = ref.tell()
+            ref.write(payloadtools.TRAILER.pack(
+                payloadtools.MAGIC,
+                offset,
+                __end__ - offset,
+                __checksum__,
+                kind,
+            ))
+
+    @staticmethod
+    def detect(payload: Any) -> Optional[int]:
+        # the kind of a payload from its header alone, whatever its size
+        if Cryptogram.is_packed(payload):
+            return payloadtools.KIND_CRYPTOGRAM
+        try:
+            __view__ = memoryview(payload)
+        except TypeError:
+            return None
+        if __view__[:len(payloadtools.BUNDLE_MAGIC)] == payloadtools.BUNDLE_MAGIC:
+            return payloadtools.KIND_BUNDLE
+        # legacy cryptograms are base64 text (checked when decoded)
+        if isinstance(payload, bytes):
+            return payloadtools.KIND_CRYPTOGRAM
+        return None
+
+    @staticmethod
+    def locate(target: Path) -> Union[ArchByte[ArchByteInt], bytes]:
+        # map the whole target read-only, the payload is served
+        # directly from the page cache.
+        with open(target, 'rb') as ref:
+            try:
+                __map__ = mmap.mmap(ref.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return NYEDASEG(NYEDAException, 'no payload found! (via. payloadtools)')
+
+        if len(__map__) < payloadtools.TRAILER.size:
+            return NYEDASEG(NYEDAException, 'no payload found! (via. payloadtools)')
+
+        __magic__, __offset__, __length__, __checksum__, __kind__ = payloadtools.TRAILER.unpack_from(
+            __map__, len(__map__) - payloadtools.TRAILER.size
+        )
+
+        # the trailer must be authentic and point inside the target
+        if __magic__ != payloadtools.MAGIC or __offset__ + __length__ > len(__map__) - payloadtools.TRAILER.size:
+            return NYEDASEG(NYEDAException, 'no payload found! (via. payloadtools)')
+
+        __view__ = memoryview(__map__)[__offset__:__offset__ + __length__]
+
+        if zlib.crc32(__view__) != __checksum__:
+            return NYEDASEG(NYEDAException, 'payload is corrupted! (via. payloadtools)')
+
+        # legacy cryptograms are base64 text, binary ones are parsed
+        # in place like bundles.
+        if __kind__ == payloadtools.KIND_CRYPTOGRAM and not Cryptogram.is_packed(__view__):
+            return bytes(__view__)
+        return ArchByte(__view__)
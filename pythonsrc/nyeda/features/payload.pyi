@@ -0,0 +1,47 @@
+
+from nyeda.types.archive import ArchByte, ArchByteInt
+from nyeda.types.abc import Feature
+from typing import Any, Optional, Union, Tuple
+from pathlib import Path
+import struct
+
+class payloadtools(Feature):
+    """[`payloadtools`] Feature.
+
+    This feature provides tools to embed archive data into an executable
+    as a raw binary payload and to locate it back at runtime.
+
+    The payload is appended to the executable (or to a raw resource
+    inside the `.app` bundle on macos) and followed by a fixed size
+    trailer (magic, offset, length, checksum and kind).
+    """
+    TRAILER: struct.Struct
+    MAGIC: bytes
+    KIND_BUNDLE: int
+    KIND_CRYPTOGRAM: int
+    BUNDLE_MAGIC: bytes
+    CHUNKSIZE: int
+    RESOURCE: Tuple[str, ...]
+
+    @staticmethod
+    def embed(target: Path, payload: Union[ArchByte[ArchByteInt], bytes], kind: int) -> None:
+        """Appends the payload to the target along with a trailer
+        describing it."""
+
+    @staticmethod
+    def seal(target: Path, offset: int, kind: int) -> None:
+        """Appends the trailer for a payload that was already written
+        into the target (from `offset` to the end)."""
+
+    @staticmethod
+    def detect(payload: Any) -> Optional[int]:
+        """Returns the kind (`KIND_BUNDLE` or `KIND_CRYPTOGRAM`) of the
+        payload from its header (magic bytes) alone, in constant time.
+        `bytes` without a known header are taken as legacy base64
+        cryptograms. Returns `None` for anything else."""
+
+    @staticmethod
+    def locate(target: Path) -> Union[ArchByte[ArchByteInt], bytes]:
+        """Memory-maps the target, verifies the trailer checksum and
+        returns the embedded payload (`ArchByte` for bundles and binary
+        cryptograms, `bytes` for legacy base64 cryptograms)."""
@@ -4,33 +4,59 @@ from nyeda.types.abc import Feature
 from nyeda.exceptions import NYEDAException, NYEDASEG
 from nyeda.features.interface import popup, icons
 from nyeda.features.encdec import decrypter, base64tools, Cryptogram
-from typing import Any, Iterable
+from nyeda.features.payload import payloadtools
+from typing import Any, Callable
 import pickle
 
 class preproc(decrypter, popup, Feature):
     def preproc(self, content: Any) -> ArchByte[ArchByteInt]:
-        # return the content itself if it is in iterable
-        # format
-        if not isinstance(content, bytes) and isinstance(content, Iterable) \
-            and all(isinstance(element, int) for \
-                     element in content):
-            return content
+        return self.prepare(content)()
 
-        # The default encrypted content will be encoded serialized cryptogram.
-        # Therefore it will be url-safe base64 encoded bytes
-        # Proceed further only if the content is url-safe base64 encoded
-        # bytes
-        if not isinstance(content, bytes) or not base64tools.is_urlsafe_b64encoded(content):
+    def prepare(self, content: Any) -> Callable[[], ArchByte[ArchByteInt]]:
+        # everything that needs the gui (validation and the passkey
+        # popup) runs right away, the returned callable does the slow
+        # part (decryption) and is safe to run on a worker thread.
+
+        # the payload decrypted earlier in this session is reused,
+        # nothing is validated, asked or decrypted again.
+        if getattr(self, '__sessionsource__', None) is content:
+            __payload__ = getattr(self, '__sessionpayload__')
+            return lambda: __payload__
+        __source__ = content
+
+        # the kind is told by the header of the content alone
+        __kind__ = payloadtools.detect(content)
+        if __kind__ is None:
             return NYEDASEG(NYEDAException, 'content is invalid! (via. preproc)')
-        
-        # At this point the content will be url-safe base64 encoded bytes
-        # There will be two things that can happen
-        # 1. The decoded content cannot be unpickled
-        # 2. The decoded content successfully unpickles
-        try:
-            content = pickle.loads(base64tools.decode(content))
-        except Exception:
-            return NYEDASEG(NYEDAException, 'content cannot be de-serialized! (via. preproc)')
+
+        # return the content itself if it is a bundle
+        if __kind__ == payloadtools.KIND_BUNDLE:
+            return lambda: content
+
+        # Binary cryptograms (the default) are parsed in place, the
+        # ciphertext stays a view over the content.
+        if Cryptogram.is_packed(content):
+            content = Cryptogram.load(content)
+            if content is None:
+                return NYEDASEG(NYEDAException, 'content is corrupted! (via. preproc)')
+
+        else:
+            # The legacy encrypted content is an encoded serialized cryptogram.
+            # Therefore it will be url-safe base64 encoded bytes
+            # Proceed further only if the content is url-safe base64 encoded
+            # bytes (checked and decoded in a single pass)
+            __decoded__ = base64tools.try_decode(content)
+            if __decoded__ is None:
+                return NYEDASEG(NYEDAException, 'content is invalid! (via. preproc)')
+
+            # At this point the content is decoded
+            # There will be two things that can happen
+            # 1. The decoded content cannot be unpickled
+            # 2. The decoded content successfully unpickles
+            try:
+                content = pickle.loads(__decoded__)
+            except Exception:
+                return NYEDASEG(NYEDAException, 'content cannot be de-serialized! (via. preproc)')
 
         # Validate the content to be a valid Cryptogram
         if not Cryptogram.validate(content):
@@ -41,6 +67,11 @@ class preproc(decrypter, popup, Feature):
         # Before decrypting, get the __thisfile__ and __overwrites__
         # from the child class and set the decryption failsafe.
         self.__decryptionfailsafe__(getattr(self, '__thisfile__'), getattr(self, '__overwrites__'))
+
+        # a key verified earlier in this session needs no passkey
+        if getattr(self, '__sessionsalt__', None) == content['salt']:
+            return self.__sessiondecrypt__(__source__, content, None)
+
         __passkey__ = self.getpasscode(
             title='preproc -> decrypt',
             icon=icons.passcode,
@@ -66,4 +97,28 @@ class preproc(decrypter, popup, Feature):
             )
             self.__master__.attributes('-topmost', True)
         
-        return self.decrypt(content, __passkey__)
+        return self.__sessiondecrypt__(__source__, content, __passkey__)
+
+    def __sessiondecrypt__(self, source: Any, cryptogram: Cryptogram, passkey: Any) -> Callable[[], ArchByte[ArchByteInt]]:
+        def __decrypt__() -> ArchByte[ArchByteInt]:
+            __payload__ = self.decrypt(cryptogram, passkey)
+            # kept for the session (as a bytearray so that it can be
+            # zeroized, see __clearsession__). Raw plaintexts already are
+            # the bytearray decrypt_into filled, bytes (Fernet) and
+            # ArchBytes (unpickled from older cryptograms) are copied.
+            if isinstance(__payload__, (bytes, memoryview, ArchByte)):
+                __payload__ = bytearray(__payload__)
+            setattr(self, '__sessionpayload__', __payload__)
+            setattr(self, '__sessionsource__', source)
+            return __payload__
+        return __decrypt__
+
+    def __clearsession__(self) -> None:
+        # zeroize the payload and the key of the session
+        __payload__ = getattr(self, '__sessionpayload__', None)
+        for __attr__ in ('__sessionpayload__', '__sessionsource__', '__handle__', '__handlesource__'):
+            if hasattr(self, __attr__):
+                delattr(self, __attr__)
+        if isinstance(__payload__, bytearray):
+            __payload__[:] = bytes(len(__payload__))
+        self.__clearkey__()
@@ -1,7 +1,7 @@
 
 from nyeda.types.archive import ArchByte, ArchByteInt
 from nyeda.types.abc import Feature
-from typing import Any
+from typing import Any, Callable
 
 class preproc(Feature):
     """[`preproc`] Feature.
@@ -11,4 +11,14 @@ class preproc(Feature):
     """
     def preproc(self, content: Any) -> ArchByte[ArchByteInt]:
         """Makes the data processable if necessary before moving
-        on to further processing."""
\ No newline at end of file
+        on to further processing."""
+    def prepare(self, content: Any) -> Callable[[], ArchByte[ArchByteInt]]:
+        """Validates the content and asks for the passkey if needed,
+        returns a callable doing the decryption (safe to run on a
+        worker thread). `preproc` is the same run in one go.
+
+        The decrypted payload is kept for the session, preparing the
+        same content again costs nothing."""
+    def __clearsession__(self) -> None:
+        """Zeroizes and drops the decrypted payload and the key kept
+        for the session, the next `prepare` starts over."""
@@ -0,0 +1,93 @@
+from nyeda.exceptions import NYEDAException, NYEDASEG
+from nyeda.types.abc import Feature
+from threading import Thread, Event, local
+from queue import Queue, Empty
+
+# the progress reporter of the stage running on this thread
+__stage__ = local()
+
+class worker(Feature):
+    # milliseconds between two polls of the result queue
+    POLL_INTERVAL = 50
+
+    def background(self, stages, done, progress=None, critical=False) -> Event:
+        # the stages ((label, callable) pairs, each callable takes the
+        # result of the stage before) run on a worker thread, progress
+        # and the result come back through a queue polled with after(),
+        # so the mainloop never blocks. A critical run is never
+        # abandoned: its thread is not a daemon and join() waits for it.
+        __queue__ = Queue()
+        __cancel__ = Event()
+
+        def __run__() -> None:
+            __result__ = None
+            try:
+                for __index__, (__label__, __callable__) in enumerate(stages):
+                    # a running stage cannot be interrupted, the rest
+                    # are skipped once cancelled
+                    if __cancel__.is_set():
+                        return None
+                    __queue__.put(('progress', (__index__ / len(stages), __label__)))
+                    # the stage may report its own progress via report()
+                    __stage__.report = lambda fraction, index=__index__, label=__label__: __queue__.put(
+                        ('progress', ((index + min(max(fraction, 0.0), 1.0)) / len(stages), label))
+                    )
+                    __result__ = __callable__(__result__)
+                __queue__.put(('done', __result__))
+            except BaseException as e:
+                # includes the SystemExit of NYEDASEG
+                __queue__.put(('error', e))
+            finally:
+                __stage__.report = None
+
+        def __poll__() -> None:
+            if __cancel__.is_set():
+                return None
+            try:
+                while True:
+                    __kind__, __value__ = __queue__.get_nowait()
+                    if __kind__ == 'progress':
+                        if progress is not None:
+                            progress(*__value__)
+                    elif __kind__ == 'done':
+                        if progress is not None:
+                            progress(1.0, '')
+                        done(__value__)
+                        return None
+                    else:
+                        if isinstance(__value__, SystemExit):
+                            raise __value__
+                        return NYEDASEG(NYEDAException, f'{__value__} (via. background)')
+            except Empty:
+                pass
+            getattr(self, '__master__').after(self.POLL_INTERVAL, __poll__)
+
+        __thread__ = Thread(target=__run__, daemon=not critical)
+        if critical:
+            setattr(self, '__critical__', [*self.__criticalthreads__(), __thread__])
+        __thread__.start()
+        getattr(self, '__master__').after(self.POLL_INTERVAL, __poll__)
+        return __cancel__
+
+    def __criticalthreads__(self) -> list:
+        return [__thread__ for __thread__ in getattr(self, '__critical__', []) if __thread__.is_alive()]
+
+    def critical(self) -> bool:
+        # True while a critical run is in flight
+        return bool(self.__criticalthreads__())
+
+    def join(self) -> None:
+        # wait for the critical runs to finish
+        for __thread__ in self.__criticalthreads__():
+            __thread__.join()
+        setattr(self, '__critical__', [])
+        return None
+
+    @staticmethod
+    def report(fraction: float) -> None:
+        # progress (0 to 1) of the running stage, called from the stage
+        # itself (on the worker thread), a no-op elsewhere
+        __report__ = getattr(__stage__, 'report', None)
+        if __report__ is not None:
+            __report__(fraction)
+        return None
@@ -0,0 +1,37 @@
+from nyeda.types.abc import Feature
+from threading import Event
+from typing import Any, Callable, List, Tuple, Union
+
+class worker(Feature):
+    """[`worker`] Feature.
+
+    This feature runs slow work (decryption, dismantling, exporting)
+    off the Tk thread so that the mainloop never blocks.
+    """
+    POLL_INTERVAL: int
+    def background(
+            self,
+            stages: List[Tuple[str, Callable[[Any], Any]]],
+            done: Callable[[Any], None],
+            progress: Union[Callable[[float, str], None], None] = None,
+            critical: bool = False,
+    ) -> Event:
+        """Runs the `stages` (`(label, callable)` pairs, each callable
+        takes the result of the stage before) one after the other on a
+        worker thread.
+
+        `progress` (fraction done, label of the running stage) and `done`
+        (result of the last stage) are called on the Tk thread. Errors
+        are raised there too. Setting the returned event cancels the
+        remaining stages, `done` is never called then.
+
+        A `critical` run is never abandoned: its thread is not a daemon
+        (the interpreter waits for it at exit) and `join` waits for it."""
+    def critical(self) -> bool:
+        """Returns `True` while a critical run is in flight."""
+    def join(self) -> None:
+        """Waits for the critical runs to finish."""
+    @staticmethod
+    def report(fraction: float) -> None:
+        """Reports the progress (`0` to `1`) of the running stage. Called
+        from within a stage (on the worker thread), a no-op elsewhere."""
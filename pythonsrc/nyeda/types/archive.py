@@ -1,8 +1,8 @@
 
-from typing import Iterator, Generic, TypeVar, NewType
-from base64 import urlsafe_b64encode
+from typing import Iterator, Generic, TypeVar, NewType, Union
 from collections.abc import Sequence
-import pickle
+from pathlib import Path
+import mmap
 
 ArchByteInt = NewType('ArchByteInt', int)
 
@@ -11,32 +11,62 @@ T = TypeVar('T', bound=ArchByteInt)
 class ArchByte(Sequence, Generic[T]):
     def __init__(self, items: T = None) -> None:
         if items is None:
-            self.__bytes__ = bytearray()
-        else:
-            self.__bytes__ = bytearray(items)
-    
+            items = b''
+
+        # anything that exports a buffer is viewed as it is (no copy),
+        # only plain iterables of ints (literals) are materialized.
+        try:
+            __view__ = memoryview(items)
+        except TypeError:
+            __view__ = memoryview(bytes(items))
+
+        if not __view__.c_contiguous:
+            __view__ = memoryview(__view__.tobytes())
+
+        self.__view__ = __view__.cast('B').toreadonly()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], offset: int = 0, length: Union[int, None] = None) -> 'ArchByte[ArchByteInt]':
+        # map the file read-only, the view keeps the map alive.
+        with open(path, 'rb') as ref:
+            try:
+                __map__ = mmap.mmap(ref.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files cannot be mapped
+                return cls()
+
+        __end__ = len(__map__) if length is None else offset + length
+        return cls(memoryview(__map__)[offset:__end__])
+
     def __len__(self) -> int:
-        return len(self.__bytes__)
-    
+        return len(self.__view__)
+
     def __getitem__(self, index, /):
-        if isinstance(index, slice):
-            return [x for x in self.__bytes__[index]]
-        return self.__bytes__[index]
-    
+        # slices are views over the same memory
+        return self.__view__[index]
+
     def __setitem__(self, index, value, /) -> None:
         return None
-    
+
     def __delitem__(self, index, /) -> None:
         return None
-    
+
     def __iter__(self) -> Iterator[int]:
-        return iter(self.__bytes__)
-    
+        return iter(self.__view__)
+
     def __repr__(self) -> str:
-        return urlsafe_b64encode(pickle.dumps(self.__bytes__)).decode()
-    
+        return f'{self.__class__.__name__}({len(self.__view__)} bytes)'
+
     def __str__(self) -> str:
-        return str([x for x in self.__bytes__])
-    
-    def __buffer__(self) -> memoryview:
-        return memoryview(self.__bytes__)
\ No newline at end of file
+        return self.__repr__()
+
+    def __reduce__(self):
+        return (self.__class__, (self.__view__.tobytes(),))
+
+    def __setstate__(self, state) -> None:
+        # pickles of the former ArchByte (cryptograms of older builds)
+        # only restore its bytearray: {'__bytes__': bytearray(...)}
+        self.__init__(state.get('__bytes__', b'') if isinstance(state, dict) else b'')
+
+    def __buffer__(self, flags: int, /) -> memoryview:
+        return self.__view__
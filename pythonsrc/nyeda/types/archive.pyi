@@ -1,7 +1,9 @@
 # type: ignore
 
-from typing import Iterator, Iterable, NewType, Generic, TypeVar
+from typing import Iterator, Iterable, NewType, Generic, TypeVar, Union
 from typing import overload
+from collections.abc import Buffer
+from pathlib import Path
 
 ArchByteInt = NewType('ArchByteInt', int)
 
@@ -11,7 +13,23 @@ class ArchByte(Generic[T]):
     """ArchByte DataType.
     
     This data-type resembles raw bytes of bundled archive data. The data is
-    stored in a sequence of bytes
+    stored as a read-only view over the memory it was created from (bytes,
+    memoryview, mmap or any other buffer) and is never copied. Only plain
+    iterables of ints are materialized.
     """
-    def __init__(self, items: Iterable[T]) -> None: ...
-    def __iter__(self) -> Iterator[T]: ...
\ No newline at end of file
+    def __init__(self, items: Union[Buffer, Iterable[T], None] = None) -> None: ...
+    @classmethod
+    def from_file(cls, path: Union[str, Path], offset: int = 0, length: Union[int, None] = None) -> 'ArchByte[ArchByteInt]':
+        """Creates an `ArchByte` over a read-only memory map of the file
+        (or a region of it)."""
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, index: int, /) -> T: ...
+    @overload
+    def __getitem__(self, index: slice, /) -> memoryview:
+        """Slices are `memoryview`s over the same memory (O(1))."""
+    def __iter__(self) -> Iterator[T]: ...
+    def __buffer__(self, flags: int, /) -> memoryview: ...
+    def __setstate__(self, state: dict) -> None:
+        """Restores pickles of the former (bytearray based) `ArchByte`,
+        as found in the cryptograms of older builds."""
@@ -0,0 +1,133 @@
+use std::os::raw::{c_char, c_int, c_void};
+use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::PyBufferError;
+use pyo3::types::PyMemoryView;
+use pyo3::ffi;
+use zeroize::Zeroize;
+
+// helper functions
+pub fn as_slice(buffer: &PyBuffer<u8>) -> PyResult<&[u8]> {
+    if !buffer.is_c_contiguous() {
+        return Err(PyBufferError::new_err(format!("Buffer must be contiguous.")))
+    }
+
+    if buffer.len_bytes() == 0 {
+        return Ok(&[])
+    }
+
+    // the exporter keeps the memory alive for as long as the PyBuffer
+    // is held, so the slice can safely borrow from it.
+    Ok(unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, buffer.len_bytes()) })
+}
+
+pub fn as_mut_slice(buffer: &PyBuffer<u8>) -> PyResult<&mut [u8]> {
+    if buffer.readonly() {
+        return Err(PyBufferError::new_err(format!("Buffer must be writable.")))
+    }
+
+    if !buffer.is_c_contiguous() {
+        return Err(PyBufferError::new_err(format!("Buffer must be contiguous.")))
+    }
+
+    if buffer.len_bytes() == 0 {
+        return Ok(&mut [])
+    }
+
+    // same as above, the exporter cannot resize the memory while it
+    // is exported.
+    Ok(unsafe { std::slice::from_raw_parts_mut(buffer.buf_ptr() as *mut u8, buffer.len_bytes()) })
+}
+
+pub fn memoryview<'py>(py: Python<'py>, data: Vec<u8>) -> PyResult<Bound<'py, PyMemoryView>> {
+    let buffer = Bound::new(py, Buffer::from(data))?;
+    PyMemoryView::from_bound(buffer.as_any())
+}
+
+// same as memoryview, the data is zeroized once released (plaintexts)
+pub fn secret_memoryview<'py>(py: Python<'py>, data: Vec<u8>) -> PyResult<Bound<'py, PyMemoryView>> {
+    let buffer = Bound::new(py, Buffer { data, secret: true })?;
+    PyMemoryView::from_bound(buffer.as_any())
+}
+
+
+// Read-only Rust owned memory exported through the buffer protocol,
+// so that large data never gets copied into python objects.
+#[pyclass(frozen)]
+pub struct Buffer {
+    data: Vec<u8>,
+    secret: bool,
+}
+
+impl From<Vec<u8>> for Buffer {
+    fn from(data: Vec<u8>) -> Self {
+        Self { data, secret: false }
+    }
+}
+
+impl Drop for Buffer {
+    fn drop(&mut self) {
+        if self.secret {
+            self.data.zeroize();
+        }
+    }
+}
+
+impl Buffer {
+    pub fn as_slice(&self) -> &[u8] {
+        &self.data
+    }
+}
+
+#[pymethods]
+impl Buffer {
+    fn __len__(&self) -> usize {
+        self.data.len()
+    }
+
+    unsafe fn __getbuffer__(slf: Bound<'_, Self>, view: *mut ffi::Py_buffer, flags: c_int) -> PyResult<()> {
+        if view.is_null() {
+            return Err(PyBufferError::new_err(format!("View is null.")))
+        }
+
+        if (flags & ffi::PyBUF_WRITABLE) == ffi::PyBUF_WRITABLE {
+            return Err(PyBufferError::new_err(format!("Object is not writable.")))
+        }
+
+        let data = &slf.get().data;
+
+        (*view).buf = data.as_ptr() as *mut c_void;
+        (*view).len = data.len() as isize;
+        (*view).readonly = 1;
+        (*view).itemsize = 1;
+
+        (*view).format = if (flags & ffi::PyBUF_FORMAT) == ffi::PyBUF_FORMAT {
+            b"B\0".as_ptr() as *mut c_char
+        } else {
+            std::ptr::null_mut()
+        };
+
+        (*view).ndim = 1;
+        (*view).shape = if (flags & ffi::PyBUF_ND) == ffi::PyBUF_ND {
+            &mut (*view).len
+        } else {
+            std::ptr::null_mut()
+        };
+
+        (*view).strides = if (flags & ffi::PyBUF_STRIDES) == ffi::PyBUF_STRIDES {
+            &mut (*view).itemsize
+        } else {
+            std::ptr::null_mut()
+        };
+
+        (*view).suboffsets = std::ptr::null_mut();
+        (*view).internal = std::ptr::null_mut();
+
+        // the view holds a strong reference to the exporter
+        (*view).obj = slf.into_any().into_ptr();
+
+        Ok(())
+    }
+
+    unsafe fn __releasebuffer__(&self, _view: *mut ffi::Py_buffer) {}
+}
@@ -0,0 +1,509 @@
+use std::collections::VecDeque;
+use std::io::{self, Read, Write};
+use std::path::Path;
+use std::sync::mpsc::{self, Receiver, Sender, SyncSender};
+use std::sync::{Arc, Mutex};
+use std::thread::{self, JoinHandle};
+use flate2::bufread::{GzDecoder, MultiGzDecoder};
+use flate2::write::GzEncoder;
+use flate2::Compression;
+use serde::{Serialize, Deserialize};
+
+// uncompressed size of every independently compressed block.
+pub const BLOCK_SIZE: usize = 1 << 20;
+
+// codec (1) | uncompressed size (4) | stored size (4)
+const FRAME_HEADER: usize = 9;
+
+// files smaller than this are never worth a block boundary.
+pub const SAMPLE_SIZE: usize = 64 * 1024;
+
+// above this many bits per byte, a sample is considered incompressible.
+const ENTROPY_THRESHOLD: f64 = 7.5;
+
+// already compressed formats, stored as they are.
+const STORED_EXTENSIONS: &[&str] = &[
+    "jpg", "jpeg", "png", "gif", "webp", "heic", "heif", "avif",
+    "mp3", "m4a", "aac", "ogg", "opus", "flac",
+    "mp4", "m4v", "mov", "avi", "mkv", "webm",
+    "zip", "gz", "tgz", "bz2", "xz", "zst", "lz4", "7z", "rar",
+    "jar", "apk", "docx", "xlsx", "pptx", "woff", "woff2",
+];
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Codec {
+    None = 0,
+    Gzip = 1,
+    Zstd = 2,
+    Lz4 = 3,
+}
+
+impl Codec {
+    pub fn from_id(id: u8) -> Option<Self> {
+        match id {
+            0 => Some(Codec::None),
+            1 => Some(Codec::Gzip),
+            2 => Some(Codec::Zstd),
+            3 => Some(Codec::Lz4),
+            _ => None,
+        }
+    }
+
+    pub fn from_name(name: &str) -> Option<Self> {
+        match name.to_ascii_lowercase().as_str() {
+            "none" => Some(Codec::None),
+            "gzip" => Some(Codec::Gzip),
+            "zstd" => Some(Codec::Zstd),
+            "lz4" => Some(Codec::Lz4),
+            _ => None,
+        }
+    }
+
+    pub fn id(self) -> u8 {
+        self as u8
+    }
+
+    pub fn name(self) -> &'static str {
+        match self {
+            Codec::None => "none",
+            Codec::Gzip => "gzip",
+            Codec::Zstd => "zstd",
+            Codec::Lz4 => "lz4",
+        }
+    }
+
+    pub fn default_level(self) -> i32 {
+        match self {
+            Codec::Gzip => 9,
+            Codec::Zstd => 3,
+            Codec::None | Codec::Lz4 => 0,
+        }
+    }
+
+    fn encode(self, data: &[u8], level: i32) -> io::Result<Vec<u8>> {
+        match self {
+            Codec::None => Ok(data.to_vec()),
+            Codec::Gzip => compress_member(data, Compression::new(level.clamp(0, 9) as u32)),
+            Codec::Zstd => zstd::bulk::compress(data, level),
+            Codec::Lz4 => Ok(lz4_flex::block::compress(data)),
+        }
+    }
+
+    fn decode(self, data: &[u8], size: usize) -> io::Result<Vec<u8>> {
+        match self {
+            Codec::None => Ok(data.to_vec()),
+            Codec::Gzip => {
+                // inflating stops one byte past the size (blocks come
+                // from untrusted archives)
+                let mut output = Vec::with_capacity(size);
+                GzDecoder::new(data).take(size as u64 + 1).read_to_end(&mut output)?;
+                if output.len() != size {
+                    return Err(io::Error::new(io::ErrorKind::InvalidData, "Block size mismatch."))
+                }
+                Ok(output)
+            }
+            Codec::Zstd => zstd::bulk::decompress(data, size),
+            Codec::Lz4 => lz4_flex::block::decompress(data, size)
+                .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e)),
+        }
+    }
+}
+
+// helper functions
+pub fn default_workers() -> usize {
+    thread::available_parallelism().map(|n| n.get()).unwrap_or(1)
+}
+
+fn compress_member(data: &[u8], level: Compression) -> io::Result<Vec<u8>> {
+    let mut encoder = GzEncoder::new(Vec::with_capacity(data.len() / 2), level);
+    encoder.write_all(data)?;
+    encoder.finish()
+}
+
+fn disconnected() -> io::Error {
+    io::Error::new(io::ErrorKind::BrokenPipe, "Compression workers are gone.")
+}
+
+fn entropy(sample: &[u8]) -> f64 {
+    let mut histogram = [0usize; 256];
+    for byte in sample {
+        histogram[*byte as usize] += 1;
+    }
+
+    let total = sample.len() as f64;
+    histogram
+        .iter()
+        .filter(|count| **count > 0)
+        .map(|count| {
+            let p = *count as f64 / total;
+            -p * p.log2()
+        })
+        .sum()
+}
+
+// Decides (by extension, else by sampling the start of the file) if
+// compressing the file is a waste of time. Small files are never singled
+// out.
+pub fn incompressible(path: &Path, size: u64, sample: &[u8]) -> bool {
+    if size < SAMPLE_SIZE as u64 || sample.len() < SAMPLE_SIZE {
+        return false
+    }
+
+    let extension = path
+        .extension()
+        .and_then(|extension| extension.to_str())
+        .map(|extension| extension.to_ascii_lowercase());
+
+    if let Some(extension) = extension {
+        if STORED_EXTENSIONS.contains(&extension.as_str()) {
+            return true
+        }
+    }
+
+    entropy(&sample[..SAMPLE_SIZE]) > ENTROPY_THRESHOLD
+}
+
+// Returns a reader over archive data of any version. Version 1 data is
+// a (multi member) gzip stream, anything later is a stream of framed
+// blocks.
+pub fn reader<'a>(data: &'a [u8]) -> Box<dyn Read + 'a> {
+    if data.starts_with(&[0x1f, 0x8b]) {
+        Box::new(MultiGzDecoder::new(data))
+    } else {
+        Box::new(BlockReader::new(data))
+    }
+}
+
+// Reader over the decompressed stream from `position` on. The framed
+// blocks before it are skipped by their headers, without being decoded;
+// a gzip stream has to be decompressed up to it.
+pub fn reader_at<'a>(data: &'a [u8], position: u64) -> io::Result<Box<dyn Read + 'a>> {
+    if data.starts_with(&[0x1f, 0x8b]) {
+        let mut reader = MultiGzDecoder::new(data);
+        io::copy(&mut (&mut reader).take(position), &mut io::sink())?;
+        return Ok(Box::new(reader))
+    }
+
+    let (mut rest, mut start) = (data, 0u64);
+    while rest.len() >= FRAME_HEADER {
+        let size = u32::from_le_bytes(rest[1..5].try_into().unwrap()) as u64;
+        let stored = u32::from_le_bytes(rest[5..9].try_into().unwrap()) as usize;
+        if start + size > position {
+            break
+        }
+        if FRAME_HEADER + stored > rest.len() {
+            return Err(io::Error::new(io::ErrorKind::UnexpectedEof, "Block is truncated."))
+        }
+
+        rest = &rest[FRAME_HEADER + stored..];
+        start += size;
+    }
+
+    let mut reader = BlockReader::new(rest);
+    io::copy(&mut (&mut reader).take(position - start), &mut io::sink())?;
+    Ok(Box::new(reader))
+}
+
+// position of an encoded block in the output (offset) and of its first
+// byte in the input (start).
+#[derive(Debug, Clone, Copy, Serialize, Deserialize)]
+pub struct Block {
+    pub offset: u64,
+    pub start: u64,
+}
+
+#[derive(Clone, Copy)]
+struct Encoding {
+    codec: Codec,
+    level: i32,
+    framed: bool,
+}
+
+fn encode_block(encoding: Encoding, data: &[u8], store: bool) -> io::Result<Vec<u8>> {
+    // plain gzip stream, incompressible data goes into stored members
+    if !encoding.framed {
+        let level = if store { Compression::none() } else { Compression::new(encoding.level.clamp(0, 9) as u32) };
+        return compress_member(data, level)
+    }
+
+    let mut codec = if store { Codec::None } else { encoding.codec };
+    let mut payload = Vec::new();
+
+    if codec != Codec::None {
+        payload = codec.encode(data, encoding.level)?;
+
+        // keep the block raw if compression did not pay off
+        if payload.len() >= data.len() {
+            codec = Codec::None;
+        }
+    }
+
+    let stored: &[u8] = if codec == Codec::None { data } else { &payload };
+
+    let mut block = Vec::with_capacity(FRAME_HEADER + stored.len());
+    block.push(codec.id());
+    block.extend_from_slice(&(data.len() as u32).to_le_bytes());
+    block.extend_from_slice(&(stored.len() as u32).to_le_bytes());
+    block.extend_from_slice(stored);
+    Ok(block)
+}
+
+struct Job {
+    data: Vec<u8>,
+    store: bool,
+    result: Sender<io::Result<Vec<u8>>>,
+}
+
+// Block parallel encoder.
+//
+// The input is cut into blocks of BLOCK_SIZE bytes, every block is
+// compressed independently by a pool of workers and written out in
+// order. In gzip mode every block is its own gzip member; concatenated
+// members are a valid gzip stream (RFC 1952), readable by gzip, pigz and
+// MultiGzDecoder. In framed mode every block is prefixed with its codec
+// and sizes, so raw and compressed blocks can be mixed freely.
+//
+// At most twice as many blocks as there are workers are in flight, so
+// the memory stays bounded and the producer (reading files into the
+// tar stream) runs in parallel with the compression.
+pub struct ParallelEncoder<W: Write> {
+    inner: Option<W>,
+    block: Vec<u8>,
+    store: bool,
+    jobs: Option<SyncSender<Job>>,
+    pending: VecDeque<(u64, Receiver<io::Result<Vec<u8>>>)>,
+    dispatched: u64,
+    written: u64,
+    blocks: Vec<Block>,
+    workers: Vec<JoinHandle<()>>,
+    max_pending: usize,
+}
+
+impl<W: Write> ParallelEncoder<W> {
+    pub fn gzip(inner: W, level: i32, workers: usize) -> Self {
+        Self::new(inner, Encoding { codec: Codec::Gzip, level, framed: false }, workers)
+    }
+
+    pub fn framed(inner: W, codec: Codec, level: i32, workers: usize) -> Self {
+        Self::new(inner, Encoding { codec, level, framed: true }, workers)
+    }
+
+    fn new(inner: W, encoding: Encoding, workers: usize) -> Self {
+        let workers = workers.max(1);
+        let (jobs, queue) = mpsc::sync_channel::<Job>(workers);
+        let queue = Arc::new(Mutex::new(queue));
+
+        let handles = (0..workers)
+            .map(|_| {
+                let queue = Arc::clone(&queue);
+                thread::spawn(move || loop {
+                    let job = {
+                        let queue = queue.lock().unwrap_or_else(|e| e.into_inner());
+                        queue.recv()
+                    };
+
+                    match job {
+                        Ok(job) => {
+                            let _ = job.result.send(encode_block(encoding, &job.data, job.store));
+                        }
+                        Err(_) => break,
+                    }
+                })
+            })
+            .collect();
+
+        Self {
+            inner: Some(inner),
+            block: Vec::with_capacity(BLOCK_SIZE),
+            store: false,
+            jobs: Some(jobs),
+            pending: VecDeque::new(),
+            dispatched: 0,
+            written: 0,
+            blocks: Vec::new(),
+            workers: handles,
+            max_pending: workers * 2,
+        }
+    }
+
+    // Switches between compressing and storing what comes next. The
+    // current block is cut short so that it keeps its own mode.
+    pub fn set_store(&mut self, store: bool) -> io::Result<()> {
+        if store != self.store {
+            self.dispatch()?;
+            self.store = store;
+        }
+
+        Ok(())
+    }
+
+    fn dispatch(&mut self) -> io::Result<()> {
+        if self.block.is_empty() {
+            return Ok(())
+        }
+
+        let data = std::mem::replace(&mut self.block, Vec::with_capacity(BLOCK_SIZE));
+        let data_len = data.len() as u64;
+        let (result, receiver) = mpsc::channel();
+
+        self.jobs
+            .as_ref()
+            .ok_or_else(disconnected)?
+            .send(Job { data, store: self.store, result })
+            .map_err(|_| disconnected())?;
+        self.pending.push_back((self.dispatched, receiver));
+        self.dispatched += data_len;
+
+        while self.pending.len() > self.max_pending {
+            self.drain_one()?;
+        }
+
+        Ok(())
+    }
+
+    fn drain_one(&mut self) -> io::Result<()> {
+        if let Some((start, receiver)) = self.pending.pop_front() {
+            let block = receiver.recv().map_err(|_| disconnected())??;
+            self.inner.as_mut().ok_or_else(disconnected)?.write_all(&block)?;
+
+            self.blocks.push(Block { offset: self.written, start });
+            self.written += block.len() as u64;
+        }
+
+        Ok(())
+    }
+
+    fn shutdown(&mut self) {
+        // closing the queue stops the workers once it is empty
+        self.jobs.take();
+        for worker in self.workers.drain(..) {
+            let _ = worker.join();
+        }
+    }
+
+    // number of input bytes taken so far.
+    pub fn position(&self) -> u64 {
+        self.dispatched + self.block.len() as u64
+    }
+
+    pub fn finish(self) -> io::Result<W> {
+        self.finish_blocks().map(|(inner, _)| inner)
+    }
+
+    // Same as finish, along with the position of every block written.
+    pub fn finish_blocks(mut self) -> io::Result<(W, Vec<Block>)> {
+        self.dispatch()?;
+        while !self.pending.is_empty() {
+            self.drain_one()?;
+        }
+        self.shutdown();
+
+        let mut inner = self.inner.take().ok_or_else(disconnected)?;
+        inner.flush()?;
+        Ok((inner, std::mem::take(&mut self.blocks)))
+    }
+}
+
+impl<W: Write> Write for ParallelEncoder<W> {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        let take = buf.len().min(BLOCK_SIZE - self.block.len());
+        self.block.extend_from_slice(&buf[..take]);
+
+        if self.block.len() == BLOCK_SIZE {
+            self.dispatch()?;
+        }
+
+        Ok(take)
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        // blocks are only complete once they are full (or on finish),
+        // flushing early would only hurt the ratio.
+        Ok(())
+    }
+}
+
+impl<W: Write> Drop for ParallelEncoder<W> {
+    fn drop(&mut self) {
+        self.shutdown();
+    }
+}
+
+// Reader over a stream of framed blocks.
+pub struct BlockReader<R: Read> {
+    inner: R,
+    block: Vec<u8>,
+    position: usize,
+}
+
+impl<R: Read> BlockReader<R> {
+    pub fn new(inner: R) -> Self {
+        Self { inner, block: Vec::new(), position: 0 }
+    }
+
+    // reads the next block, false at the end of the stream.
+    fn next_block(&mut self) -> io::Result<bool> {
+        match read_block(&mut self.inner)? {
+            Some(block) => {
+                self.block = block;
+                self.position = 0;
+                Ok(true)
+            }
+            None => Ok(false),
+        }
+    }
+}
+
+// Reads and decodes one framed block, None at the end of the stream.
+pub fn read_block<R: Read>(inner: &mut R) -> io::Result<Option<Vec<u8>>> {
+    let mut header = [0u8; FRAME_HEADER];
+
+    // the stream may only end on a block boundary
+    if inner.read(&mut header[..1])? == 0 {
+        return Ok(None)
+    }
+    inner.read_exact(&mut header[1..])?;
+
+    let codec = Codec::from_id(header[0])
+        .ok_or_else(|| io::Error::new(io::ErrorKind::InvalidData, "Unknown block codec."))?;
+    let size = u32::from_le_bytes(header[1..5].try_into().unwrap()) as usize;
+    let stored = u32::from_le_bytes(header[5..9].try_into().unwrap()) as usize;
+
+    // blocks never decode to more than BLOCK_SIZE, and the payload is
+    // read as it arrives (a corrupt header cannot make it allocate
+    // more than the input holds).
+    if size > BLOCK_SIZE {
+        return Err(io::Error::new(io::ErrorKind::InvalidData, "Block size out of range."))
+    }
+    let mut payload = Vec::with_capacity(stored.min(BLOCK_SIZE));
+    inner.take(stored as u64).read_to_end(&mut payload)?;
+    if payload.len() != stored {
+        return Err(io::Error::new(io::ErrorKind::UnexpectedEof, "Block is truncated."))
+    }
+
+    let block = match codec {
+        Codec::None => payload,
+        _ => codec.decode(&payload, size)?,
+    };
+
+    if block.len() != size {
+        return Err(io::Error::new(io::ErrorKind::InvalidData, "Block size mismatch."))
+    }
+
+    Ok(Some(block))
+}
+
+impl<R: Read> Read for BlockReader<R> {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        while self.position == self.block.len() {
+            if !self.next_block()? {
+                return Ok(0)
+            }
+        }
+
+        let count = buf.len().min(self.block.len() - self.position);
+        buf[..count].copy_from_slice(&self.block[self.position..self.position + count]);
+        self.position += count;
+        Ok(count)
+    }
+}
@@ -0,0 +1,665 @@
+use std::fs::{File, OpenOptions};
+use std::io::{self, Read, Write};
+use std::thread;
+use aes_gcm::Aes256Gcm;
+use aes_gcm::aead::{AeadInPlace, KeyInit, generic_array::GenericArray};
+use chacha20poly1305::ChaCha20Poly1305;
+use zeroize::Zeroize;
+use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::types::PyMemoryView;
+use crate::buffer;
+use crate::compress;
+
+// Chunked AEAD stream:
+//
+// algorithm (u8) | chunk size (u32) | nonce prefix (8) | chunks
+//
+// The plaintext is cut into chunks of `chunk size` bytes (the last one
+// may be shorter, an empty plaintext is a single empty chunk), every
+// chunk is sealed on its own as ciphertext | tag (16). The nonce of a
+// chunk is the random prefix followed by its index (u32 BE), and its
+// index (u64 LE) and a final flag (u8) are authenticated along with it,
+// so chunks cannot be reordered, dropped or the stream truncated. Since
+// chunk i lies at a fixed position, any range can be decrypted alone and
+// chunks are sealed and opened in parallel.
+pub const HEADER_SIZE: usize = 13;
+pub const TAG_SIZE: usize = 16;
+pub const DEFAULT_CHUNK_SIZE: usize = 1 << 20;
+// the chunk index in the nonce is 32 bit, a stream never has more chunks
+// (nonces would repeat)
+pub const MAX_CHUNKS: u64 = 1 << 32;
+const KEY_SIZE: usize = 32;
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Algorithm {
+    AesGcm,
+    ChaCha20Poly1305,
+}
+
+impl Algorithm {
+    pub fn from_id(id: u8) -> Option<Self> {
+        match id {
+            1 => Some(Algorithm::AesGcm),
+            2 => Some(Algorithm::ChaCha20Poly1305),
+            _ => None,
+        }
+    }
+
+    pub fn from_name(name: &str) -> PyResult<Self> {
+        match name.to_ascii_lowercase().as_str() {
+            "aes-256-gcm" | "aes-gcm" | "aesgcm" => Ok(Algorithm::AesGcm),
+            "chacha20-poly1305" | "chacha20poly1305" | "chacha" => Ok(Algorithm::ChaCha20Poly1305),
+            _ => Err(pyo3::exceptions::PyValueError::new_err(format!("Unknown algorithm: {} (aes-256-gcm or chacha20-poly1305).", name))),
+        }
+    }
+
+    pub fn id(&self) -> u8 {
+        match self {
+            Algorithm::AesGcm => 1,
+            Algorithm::ChaCha20Poly1305 => 2,
+        }
+    }
+
+    pub fn name(&self) -> &'static str {
+        match self {
+            Algorithm::AesGcm => "aes-256-gcm",
+            Algorithm::ChaCha20Poly1305 => "chacha20-poly1305",
+        }
+    }
+}
+
+enum Engine {
+    AesGcm(Aes256Gcm),
+    ChaCha20Poly1305(ChaCha20Poly1305),
+}
+
+impl Engine {
+    fn new(algorithm: Algorithm, key: &[u8]) -> PyResult<Self> {
+        let invalid = |_| pyo3::exceptions::PyValueError::new_err(format!("Key must be {} bytes long.", KEY_SIZE));
+        Ok(match algorithm {
+            Algorithm::AesGcm => Engine::AesGcm(Aes256Gcm::new_from_slice(key).map_err(invalid)?),
+            Algorithm::ChaCha20Poly1305 => Engine::ChaCha20Poly1305(ChaCha20Poly1305::new_from_slice(key).map_err(invalid)?),
+        })
+    }
+
+    // seals the chunk in place, returns its tag.
+    fn seal(&self, nonce: &[u8; 12], aad: &[u8], chunk: &mut [u8]) -> Option<[u8; TAG_SIZE]> {
+        let nonce = GenericArray::from_slice(nonce);
+        let tag = match self {
+            Engine::AesGcm(cipher) => cipher.encrypt_in_place_detached(nonce, aad, chunk).ok()?,
+            Engine::ChaCha20Poly1305(cipher) => cipher.encrypt_in_place_detached(nonce, aad, chunk).ok()?,
+        };
+
+        let mut output = [0u8; TAG_SIZE];
+        output.copy_from_slice(&tag);
+        Some(output)
+    }
+
+    // opens the chunk in place, false if it is not authentic.
+    fn open(&self, nonce: &[u8; 12], aad: &[u8], chunk: &mut [u8], tag: &[u8]) -> bool {
+        let (nonce, tag) = (GenericArray::from_slice(nonce), GenericArray::from_slice(tag));
+        match self {
+            Engine::AesGcm(cipher) => cipher.decrypt_in_place_detached(nonce, aad, chunk, tag).is_ok(),
+            Engine::ChaCha20Poly1305(cipher) => cipher.decrypt_in_place_detached(nonce, aad, chunk, tag).is_ok(),
+        }
+    }
+}
+
+// parsed stream header
+#[derive(Clone, Copy)]
+struct Header {
+    algorithm: Algorithm,
+    chunk_size: usize,
+    prefix: [u8; 8],
+}
+
+impl Header {
+    fn new(algorithm: Algorithm, chunk_size: usize) -> Self {
+        Self { algorithm, chunk_size, prefix: rand::random() }
+    }
+
+    fn parse(data: &[u8]) -> io::Result<Self> {
+        if data.len() < HEADER_SIZE {
+            return Err(invalid("Encrypted stream is truncated."))
+        }
+
+        let algorithm = Algorithm::from_id(data[0]).ok_or_else(|| invalid("Unknown encryption algorithm."))?;
+        let chunk_size = u32::from_le_bytes(data[1..5].try_into().unwrap()) as usize;
+        if chunk_size == 0 {
+            return Err(invalid("Invalid chunk size."))
+        }
+
+        Ok(Self { algorithm, chunk_size, prefix: data[5..13].try_into().unwrap() })
+    }
+
+    fn bytes(&self) -> [u8; HEADER_SIZE] {
+        let mut header = [0u8; HEADER_SIZE];
+        header[0] = self.algorithm.id();
+        header[1..5].copy_from_slice(&(self.chunk_size as u32).to_le_bytes());
+        header[5..13].copy_from_slice(&self.prefix);
+        header
+    }
+
+    fn nonce(&self, index: u64) -> [u8; 12] {
+        let mut nonce = [0u8; 12];
+        nonce[..8].copy_from_slice(&self.prefix);
+        nonce[8..].copy_from_slice(&(index as u32).to_be_bytes());
+        nonce
+    }
+
+    // number of chunks for the plaintext size
+    fn chunks(&self, size: u64) -> io::Result<u64> {
+        let chunks = (size.div_ceil(self.chunk_size as u64)).max(1);
+        if chunks > MAX_CHUNKS {
+            return Err(invalid("Too many chunks, the chunk size is too small."))
+        }
+        Ok(chunks)
+    }
+
+    // plaintext size of the ciphertext body size
+    fn plaintext_size(&self, body: u64) -> io::Result<u64> {
+        let sealed = (self.chunk_size + TAG_SIZE) as u64;
+        let chunks = body.div_ceil(sealed).max(1);
+        let last = body - (chunks - 1) * sealed;
+
+        if last < TAG_SIZE as u64 || (chunks > 1 && last == TAG_SIZE as u64) {
+            return Err(invalid("Encrypted stream is truncated."))
+        }
+        Ok(body - chunks * TAG_SIZE as u64)
+    }
+}
+
+// helper functions
+fn invalid(message: &str) -> io::Error {
+    io::Error::new(io::ErrorKind::InvalidData, message.to_string())
+}
+
+fn not_authentic(index: u64) -> io::Error {
+    invalid(&format!("Decryption failed: chunk {} is not authentic.", index))
+}
+
+fn aad(index: u64, last: bool) -> [u8; 9] {
+    let mut aad = [0u8; 9];
+    aad[..8].copy_from_slice(&index.to_le_bytes());
+    aad[8] = last as u8;
+    aad
+}
+
+// Seals consecutive chunks (starting at chunk `first`, the last of them
+// being the final chunk of the stream if `last` is set) from the input
+// into the output, spread over the workers.
+fn seal_chunks(engine: &Engine, header: &Header, first: u64, last: bool, input: &[u8], output: &mut [u8], workers: usize) -> io::Result<()> {
+    let mut jobs: Vec<(u64, &[u8], &mut [u8])> = Vec::new();
+    let count = input.len().div_ceil(header.chunk_size).max(1) as u64;
+    if first + count > MAX_CHUNKS {
+        return Err(invalid("Too many chunks, the chunk size is too small."))
+    }
+    let sealed = output.chunks_mut(header.chunk_size + TAG_SIZE);
+    let plain = input.chunks(header.chunk_size).chain((input.is_empty()).then_some(&input[..0]));
+
+    for (position, (plain, sealed)) in plain.zip(sealed).enumerate() {
+        jobs.push((first + position as u64, plain, sealed));
+    }
+
+    let per_worker = jobs.len().div_ceil(workers.max(1)).max(1);
+    thread::scope(|scope| {
+        let tasks: Vec<_> = jobs
+            .chunks_mut(per_worker)
+            .map(|jobs| scope.spawn(move || -> io::Result<()> {
+                for (index, plain, sealed) in jobs.iter_mut() {
+                    let final_chunk = last && *index == first + count - 1;
+                    let (body, tag) = sealed.split_at_mut(plain.len());
+                    body.copy_from_slice(plain);
+                    tag.copy_from_slice(&engine.seal(&header.nonce(*index), &aad(*index, final_chunk), body)
+                        .ok_or_else(|| invalid("Encryption failed."))?);
+                }
+                Ok(())
+            }))
+            .collect();
+
+        tasks.into_iter().try_for_each(|task| task.join().unwrap_or_else(|_| Err(invalid("Worker panicked."))))
+    })
+}
+
+// Opens consecutive sealed chunks (starting at chunk `first`, `total`
+// chunks in the whole stream) from the input into the output, spread
+// over the workers.
+fn open_chunks(engine: &Engine, header: &Header, first: u64, total: u64, input: &[u8], output: &mut [u8], workers: usize) -> io::Result<()> {
+    let mut jobs: Vec<(u64, &[u8], &mut [u8])> = Vec::new();
+    let mut plain = output;
+
+    if input.is_empty() {
+        return Err(invalid("Encrypted stream is truncated."))
+    }
+    if total > MAX_CHUNKS {
+        return Err(invalid("Too many chunks, the chunk size is too small."))
+    }
+
+    for (position, sealed) in input.chunks(header.chunk_size + TAG_SIZE).enumerate() {
+        if sealed.len() < TAG_SIZE || sealed.len() - TAG_SIZE > plain.len() {
+            return Err(invalid("Encrypted stream is truncated."))
+        }
+        let (chunk, rest) = std::mem::take(&mut plain).split_at_mut(sealed.len() - TAG_SIZE);
+        plain = rest;
+        jobs.push((first + position as u64, sealed, chunk));
+    }
+
+    let per_worker = jobs.len().div_ceil(workers.max(1)).max(1);
+    thread::scope(|scope| {
+        let tasks: Vec<_> = jobs
+            .chunks_mut(per_worker)
+            .map(|jobs| scope.spawn(move || -> io::Result<()> {
+                for (index, sealed, chunk) in jobs.iter_mut() {
+                    let (body, tag) = sealed.split_at(sealed.len() - TAG_SIZE);
+                    chunk.copy_from_slice(body);
+                    if !engine.open(&header.nonce(*index), &aad(*index, *index == total - 1), chunk, tag) {
+                        chunk.zeroize();
+                        return Err(not_authentic(*index))
+                    }
+                }
+                Ok(())
+            }))
+            .collect();
+
+        tasks.into_iter().try_for_each(|task| task.join().unwrap_or_else(|_| Err(invalid("Worker panicked."))))
+    })
+}
+
+// reads until the buffer is full or the reader ends.
+fn read_full<R: Read>(reader: &mut R, buffer: &mut [u8]) -> io::Result<usize> {
+    let mut filled = 0;
+    while filled < buffer.len() {
+        match reader.read(&mut buffer[filled..])? {
+            0 => break,
+            count => filled += count,
+        }
+    }
+    Ok(filled)
+}
+
+pub fn encrypt(key: &[u8], algorithm: Algorithm, chunk_size: usize, data: &[u8], workers: usize) -> PyResult<Vec<u8>> {
+    let engine = Engine::new(algorithm, key)?;
+    let header = Header::new(algorithm, chunk_size);
+    let chunks = header.chunks(data.len() as u64)? as usize;
+
+    let mut output = vec![0u8; HEADER_SIZE + data.len() + chunks * TAG_SIZE];
+    output[..HEADER_SIZE].copy_from_slice(&header.bytes());
+    seal_chunks(&engine, &header, 0, true, data, &mut output[HEADER_SIZE..], workers)?;
+    Ok(output)
+}
+
+// plaintext size of the encrypted stream
+pub fn size(data: &[u8]) -> io::Result<u64> {
+    let header = Header::parse(data)?;
+    header.plaintext_size((data.len() - HEADER_SIZE) as u64)
+}
+
+// Decrypts into the output (exactly the plaintext size long), which is
+// zeroized if the stream is not authentic.
+pub fn decrypt_into(key: &[u8], data: &[u8], output: &mut [u8], workers: usize) -> PyResult<()> {
+    let header = Header::parse(data)?;
+    let engine = Engine::new(header.algorithm, key)?;
+    let body = &data[HEADER_SIZE..];
+    let size = header.plaintext_size(body.len() as u64)?;
+    if output.len() as u64 != size {
+        return Err(pyo3::exceptions::PyValueError::new_err(format!("Output must be {} bytes long.", size)))
+    }
+
+    if let Err(e) = header.chunks(size).and_then(|total| open_chunks(&engine, &header, 0, total, body, output, workers)) {
+        output.zeroize();
+        return Err(e.into())
+    }
+    Ok(())
+}
+
+pub fn decrypt(key: &[u8], data: &[u8], workers: usize) -> PyResult<Vec<u8>> {
+    let mut output = vec![0u8; size(data)? as usize];
+    decrypt_into(key, data, &mut output, workers)?;
+    Ok(output)
+}
+
+// Decrypts `length` bytes of the plaintext from `offset` on, only the
+// chunks the range spans are opened.
+pub fn read(key: &[u8], data: &[u8], offset: u64, length: u64) -> PyResult<Vec<u8>> {
+    let header = Header::parse(data)?;
+    let engine = Engine::new(header.algorithm, key)?;
+    let body = &data[HEADER_SIZE..];
+    let size = header.plaintext_size(body.len() as u64)?;
+
+    let offset = offset.min(size);
+    let length = length.min(size - offset);
+    if length == 0 {
+        return Ok(Vec::new())
+    }
+
+    let (chunk_size, sealed) = (header.chunk_size as u64, (header.chunk_size + TAG_SIZE) as u64);
+    let (first, last) = (offset / chunk_size, (offset + length - 1) / chunk_size);
+    let end = ((last + 1) * sealed).min(body.len() as u64);
+    let input = &body[(first * sealed) as usize..end as usize];
+
+    let mut output = vec![0u8; input.len() - (last - first + 1) as usize * TAG_SIZE];
+    if let Err(e) = header.chunks(size).and_then(|total| open_chunks(&engine, &header, first, total, input, &mut output, 1)) {
+        output.zeroize();
+        return Err(e.into())
+    }
+
+    // the range is moved to the front, the rest is zeroized
+    let from = (offset - first * chunk_size) as usize;
+    output.copy_within(from..from + length as usize, 0);
+    output[length as usize..].zeroize();
+    output.truncate(length as usize);
+    Ok(output)
+}
+
+// Streams the source file through the cipher into the output file (it is
+// appended to, so a header may be written before). Only a batch of
+// chunks per worker is held at a time. Returns the bytes written.
+pub fn encrypt_file(key: &[u8], algorithm: Algorithm, chunk_size: usize, source: &str, output: &str, workers: usize) -> PyResult<u64> {
+    let engine = Engine::new(algorithm, key)?;
+    let header = Header::new(algorithm, chunk_size);
+
+    let mut reader = File::open(source)?;
+    let size = reader.metadata()?.len();
+    let total = header.chunks(size)?;
+    let mut writer = OpenOptions::new().create(true).append(true).open(output)?;
+    writer.write_all(&header.bytes())?;
+
+    let batch = workers.max(1) as u64;
+    let mut plain = vec![0u8; batch as usize * chunk_size];
+    let mut sealed = vec![0u8; batch as usize * (chunk_size + TAG_SIZE)];
+    let mut written = HEADER_SIZE as u64;
+    let mut first = 0;
+
+    let result = (|| -> io::Result<()> {
+        while first < total {
+            let count = batch.min(total - first);
+            let filled = read_full(&mut reader, &mut plain[..count as usize * chunk_size])?;
+            let length = filled + count as usize * TAG_SIZE;
+
+            seal_chunks(&engine, &header, first, first + count == total, &plain[..filled], &mut sealed[..length], workers)?;
+            writer.write_all(&sealed[..length])?;
+
+            written += length as u64;
+            first += count;
+        }
+        Ok(())
+    })();
+
+    plain.zeroize();
+    result?;
+    writer.flush()?;
+    Ok(written)
+}
+
+// Streams the encrypted source (from `offset` on) into the plaintext
+// output file. Returns the bytes written.
+pub fn decrypt_file(key: &[u8], source: &str, offset: u64, output: &str, workers: usize) -> PyResult<u64> {
+    let mut reader = File::open(source)?;
+    let body_size = reader.metadata()?.len().saturating_sub(offset + HEADER_SIZE as u64);
+
+    io::copy(&mut (&mut reader).take(offset), &mut io::sink())?;
+    let mut header = [0u8; HEADER_SIZE];
+    reader.read_exact(&mut header)?;
+    let header = Header::parse(&header)?;
+    let engine = Engine::new(header.algorithm, key)?;
+    let size = header.plaintext_size(body_size)?;
+
+    let mut writer = File::create(output)?;
+    let chunk_size = header.chunk_size;
+    let total = header.chunks(size)?;
+    let batch = workers.max(1) as u64;
+    let mut sealed = vec![0u8; batch as usize * (chunk_size + TAG_SIZE)];
+    let mut plain = vec![0u8; batch as usize * chunk_size];
+    let mut first = 0;
+
+    let result = (|| -> io::Result<()> {
+        while first < total {
+            let count = batch.min(total - first);
+            let filled = read_full(&mut reader, &mut sealed[..count as usize * (chunk_size + TAG_SIZE)])?;
+            let length = filled.saturating_sub(count as usize * TAG_SIZE);
+
+            open_chunks(&engine, &header, first, total, &sealed[..filled], &mut plain[..length], workers)?;
+            writer.write_all(&plain[..length])?;
+            first += count;
+        }
+        Ok(())
+    })();
+
+    plain.zeroize();
+    result?;
+    writer.flush()?;
+    Ok(size)
+}
+
+// Chunked AEAD cipher over a 256 bit key, see the stream layout above.
+#[pyclass]
+pub struct Cipher {
+    key: Vec<u8>,
+    algorithm: Algorithm,
+    chunk_size: usize,
+}
+
+impl Drop for Cipher {
+    fn drop(&mut self) {
+        self.key.zeroize();
+    }
+}
+
+#[pymethods]
+impl Cipher {
+    #[new]
+    #[pyo3(signature = (key, algorithm="aes-256-gcm", chunk_size=DEFAULT_CHUNK_SIZE))]
+    fn new(key: PyBuffer<u8>, algorithm: &str, chunk_size: usize) -> PyResult<Self> {
+        let key = buffer::as_slice(&key)?.to_vec();
+        if key.len() != KEY_SIZE {
+            return Err(pyo3::exceptions::PyValueError::new_err(format!("Key must be {} bytes long.", KEY_SIZE)))
+        }
+        if chunk_size == 0 || chunk_size > u32::MAX as usize {
+            return Err(pyo3::exceptions::PyValueError::new_err(format!("Invalid chunk size: {}", chunk_size)))
+        }
+
+        Ok(Self { key, algorithm: Algorithm::from_name(algorithm)?, chunk_size })
+    }
+
+    #[getter]
+    fn algorithm(&self) -> &'static str {
+        self.algorithm.name()
+    }
+
+    #[getter]
+    fn chunk_size(&self) -> usize {
+        self.chunk_size
+    }
+
+    #[pyo3(signature = (data, workers=None))]
+    fn encrypt<'py>(&self, py: Python<'py>, data: PyBuffer<u8>, workers: Option<usize>) -> PyResult<Bound<'py, PyMemoryView>> {
+        let data = buffer::as_slice(&data)?;
+        let output = py.allow_threads(|| encrypt(&self.key, self.algorithm, self.chunk_size, data, workers.unwrap_or_else(compress::default_workers)))?;
+        buffer::memoryview(py, output)
+    }
+
+    // plaintexts are handed out in buffers zeroized when released
+    #[pyo3(signature = (data, workers=None))]
+    fn decrypt<'py>(&self, py: Python<'py>, data: PyBuffer<u8>, workers: Option<usize>) -> PyResult<Bound<'py, PyMemoryView>> {
+        let data = buffer::as_slice(&data)?;
+        let output = py.allow_threads(|| decrypt(&self.key, data, workers.unwrap_or_else(compress::default_workers)))?;
+        buffer::secret_memoryview(py, output)
+    }
+
+    #[staticmethod]
+    fn size(data: PyBuffer<u8>) -> PyResult<u64> {
+        Ok(size(buffer::as_slice(&data)?)?)
+    }
+
+    #[pyo3(signature = (data, output, workers=None))]
+    fn decrypt_into(&self, py: Python<'_>, data: PyBuffer<u8>, output: PyBuffer<u8>, workers: Option<usize>) -> PyResult<()> {
+        let data = buffer::as_slice(&data)?;
+        let output = buffer::as_mut_slice(&output)?;
+        py.allow_threads(|| decrypt_into(&self.key, data, output, workers.unwrap_or_else(compress::default_workers)))
+    }
+
+    #[pyo3(signature = (data, offset=0, length=None))]
+    fn read<'py>(&self, py: Python<'py>, data: PyBuffer<u8>, offset: u64, length: Option<u64>) -> PyResult<Bound<'py, PyMemoryView>> {
+        let data = buffer::as_slice(&data)?;
+        let output = py.allow_threads(|| read(&self.key, data, offset, length.unwrap_or(u64::MAX)))?;
+        buffer::secret_memoryview(py, output)
+    }
+
+    #[pyo3(signature = (source, output, workers=None))]
+    fn encrypt_file(&self, py: Python<'_>, source: &str, output: &str, workers: Option<usize>) -> PyResult<u64> {
+        py.allow_threads(|| encrypt_file(&self.key, self.algorithm, self.chunk_size, source, output, workers.unwrap_or_else(compress::default_workers)))
+    }
+
+    #[pyo3(signature = (source, output, offset=0, workers=None))]
+    fn decrypt_file(&self, py: Python<'_>, source: &str, output: &str, offset: u64, workers: Option<usize>) -> PyResult<u64> {
+        py.allow_threads(|| decrypt_file(&self.key, source, offset, output, workers.unwrap_or_else(compress::default_workers)))
+    }
+}
+
+// run with `cargo test --no-default-features` (the extension module does
+// not link against libpython)
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const KEY: [u8; KEY_SIZE] = [7; KEY_SIZE];
+    const CHUNK_SIZE: usize = 16;
+    const SEALED: usize = CHUNK_SIZE + TAG_SIZE;
+
+    fn plaintext(size: usize) -> Vec<u8> {
+        (0..size).map(|i| (i * 31 % 251) as u8).collect()
+    }
+
+    fn sealed(size: usize) -> (Vec<u8>, Vec<u8>) {
+        let data = plaintext(size);
+        let output = encrypt(&KEY, Algorithm::AesGcm, CHUNK_SIZE, &data, 3).unwrap();
+        (data, output)
+    }
+
+    #[test]
+    fn round_trip() {
+        for algorithm in [Algorithm::AesGcm, Algorithm::ChaCha20Poly1305] {
+            for length in [0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 4 * CHUNK_SIZE, 100] {
+                let data = plaintext(length);
+                let output = encrypt(&KEY, algorithm, CHUNK_SIZE, &data, 3).unwrap();
+                assert_eq!(output.len(), HEADER_SIZE + length + length.div_ceil(CHUNK_SIZE).max(1) * TAG_SIZE);
+                assert_eq!(size(&output).unwrap(), length as u64);
+                assert_eq!(decrypt(&KEY, &output, 3).unwrap(), data);
+
+                let mut into = vec![0xff; length];
+                decrypt_into(&KEY, &output, &mut into, 2).unwrap();
+                assert_eq!(into, data);
+            }
+        }
+    }
+
+    #[test]
+    fn wrong_key() {
+        let (_, output) = sealed(40);
+        assert!(decrypt(&[8; KEY_SIZE], &output, 1).is_err());
+    }
+
+    #[test]
+    fn tamper() {
+        let (_, output) = sealed(40);
+        // every byte (header included) is authenticated
+        for position in 0..output.len() {
+            let mut tampered = output.clone();
+            tampered[position] ^= 1;
+            assert!(decrypt(&KEY, &tampered, 1).is_err(), "byte {} is not authenticated", position);
+        }
+    }
+
+    #[test]
+    fn tamper_zeroizes_output() {
+        let (_, mut output) = sealed(4 * CHUNK_SIZE);
+        let last = output.len() - 1;
+        output[last] ^= 1;
+
+        let mut into = vec![0xff; 4 * CHUNK_SIZE];
+        assert!(decrypt_into(&KEY, &output, &mut into, 4).is_err());
+        assert!(into.iter().all(|&byte| byte == 0));
+    }
+
+    #[test]
+    fn reorder() {
+        let (_, output) = sealed(4 * CHUNK_SIZE);
+        let mut reordered = output.clone();
+        let (first, second) = (HEADER_SIZE, HEADER_SIZE + SEALED);
+        reordered[first..first + SEALED].copy_from_slice(&output[second..second + SEALED]);
+        reordered[second..second + SEALED].copy_from_slice(&output[first..first + SEALED]);
+        assert!(decrypt(&KEY, &reordered, 1).is_err());
+    }
+
+    #[test]
+    fn truncation() {
+        let (_, output) = sealed(4 * CHUNK_SIZE);
+        // whole chunks dropped (the final flag is missing), a partial
+        // chunk, the header alone and less
+        for length in [output.len() - SEALED, output.len() - 2 * SEALED, output.len() - 1, HEADER_SIZE + TAG_SIZE - 1, HEADER_SIZE, HEADER_SIZE - 1, 0] {
+            assert!(decrypt(&KEY, &output[..length], 1).is_err(), "truncated to {}", length);
+        }
+
+        // neither can chunks be appended
+        let mut extended = output.clone();
+        extended.extend_from_slice(&output[HEADER_SIZE..HEADER_SIZE + SEALED]);
+        assert!(decrypt(&KEY, &extended, 1).is_err());
+    }
+
+    #[test]
+    fn ranges() {
+        let size = 4 * CHUNK_SIZE + 5;
+        let (data, output) = sealed(size);
+        for offset in [0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, 2 * CHUNK_SIZE + 3, size - 1, size, size + 10] {
+            for length in [0, 1, CHUNK_SIZE, CHUNK_SIZE + 1, 3 * CHUNK_SIZE, u64::MAX as usize] {
+                let from = offset.min(size);
+                let to = from.saturating_add(length).min(size);
+                let range = read(&KEY, &output, offset as u64, length as u64).unwrap();
+                assert_eq!(range, &data[from..to], "offset {} length {}", offset, length);
+            }
+        }
+
+        // only the chunks of the range are opened
+        let mut tampered = output.clone();
+        tampered[HEADER_SIZE] ^= 1;
+        assert!(read(&KEY, &tampered, 0, 1).is_err());
+        assert_eq!(read(&KEY, &tampered, CHUNK_SIZE as u64, 4).unwrap(), &data[CHUNK_SIZE..CHUNK_SIZE + 4]);
+    }
+
+    #[test]
+    fn chunk_limit() {
+        let header = Header::new(Algorithm::AesGcm, 1);
+        assert_eq!(header.chunks(MAX_CHUNKS).unwrap(), MAX_CHUNKS);
+        assert!(header.chunks(MAX_CHUNKS + 1).is_err());
+
+        let engine = Engine::new(Algorithm::AesGcm, &KEY).unwrap();
+        let mut output = [0u8; 1 + TAG_SIZE];
+        assert!(seal_chunks(&engine, &header, MAX_CHUNKS - 1, true, &[0], &mut output, 1).is_ok());
+        assert!(seal_chunks(&engine, &header, MAX_CHUNKS, true, &[0], &mut output, 1).is_err());
+        assert!(open_chunks(&engine, &header, 0, MAX_CHUNKS + 1, &output, &mut [0u8; 1], 1).is_err());
+    }
+
+    #[test]
+    fn files() {
+        let directory = std::env::temp_dir().join(format!("nyeda-crypt-{}", rand::random::<u64>()));
+        std::fs::create_dir_all(&directory).unwrap();
+        let (source, encrypted, opened) = (directory.join("source"), directory.join("encrypted"), directory.join("opened"));
+
+        let data = plaintext(10 * CHUNK_SIZE + 3);
+        std::fs::write(&source, &data).unwrap();
+        // a prefix before the stream is skipped with the offset
+        std::fs::write(&encrypted, b"prefix").unwrap();
+
+        let written = encrypt_file(&KEY, Algorithm::ChaCha20Poly1305, CHUNK_SIZE, source.to_str().unwrap(), encrypted.to_str().unwrap(), 3).unwrap();
+        let stream = std::fs::read(&encrypted).unwrap();
+        assert_eq!(written, stream.len() as u64 - 6);
+        assert_eq!(decrypt(&KEY, &stream[6..], 2).unwrap(), data);
+
+        let size = decrypt_file(&KEY, encrypted.to_str().unwrap(), 6, opened.to_str().unwrap(), 3).unwrap();
+        assert_eq!(size, data.len() as u64);
+        assert_eq!(std::fs::read(&opened).unwrap(), data);
+
+        std::fs::remove_dir_all(&directory).unwrap();
+    }
+}
@@ -0,0 +1,37 @@
+use base64::Engine;
+use base64::engine::general_purpose::URL_SAFE;
+use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::PyValueError;
+use pyo3::types::PyMemoryView;
+use crate::buffer;
+
+// Validates and decodes url-safe base64 (padded, canonical) in a
+// single pass over the data.
+pub fn urlsafe_decode(data: &[u8]) -> Result<Vec<u8>, String> {
+    if data.is_empty() {
+        return Err(format!("Data is empty."))
+    }
+
+    URL_SAFE.decode(data).map_err(|e| format!("Data is not url-safe base64 encoded: {}", e))
+}
+
+#[pyclass(frozen)]
+pub struct Base64;
+
+#[pymethods]
+impl Base64 {
+    #[staticmethod]
+    fn decode<'py>(py: Python<'py>, data: PyBuffer<u8>) -> PyResult<Bound<'py, PyMemoryView>> {
+        let data = buffer::as_slice(&data)?;
+        let output = py.allow_threads(|| urlsafe_decode(data)).map_err(PyValueError::new_err)?;
+        buffer::memoryview(py, output)
+    }
+
+    #[staticmethod]
+    fn encode<'py>(py: Python<'py>, data: PyBuffer<u8>) -> PyResult<Bound<'py, PyMemoryView>> {
+        let data = buffer::as_slice(&data)?;
+        let output = py.allow_threads(|| URL_SAFE.encode(data).into_bytes());
+        buffer::memoryview(py, output)
+    }
+}
@@ -0,0 +1,358 @@
+use std::fs::{self, File};
+use std::io::{self, Read, Write};
+use std::path::{Component, Path, PathBuf};
+use std::sync::mpsc::{self, Receiver, SyncSender};
+use std::thread::{self, JoinHandle};
+use pyo3::prelude::*;
+use crate::filter::Filter;
+
+// messages in flight per writer, bounds the memory held by the pipeline.
+const QUEUE_DEPTH: usize = 8;
+
+// size of the chunks read from tar entries.
+const CHUNK_SIZE: usize = 1 << 20;
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum SyncPolicy {
+    None,
+    End,
+    PerFile,
+}
+
+impl SyncPolicy {
+    pub fn from_name(name: &str) -> PyResult<Self> {
+        match name.to_ascii_lowercase().as_str() {
+            "none" => Ok(SyncPolicy::None),
+            "end" => Ok(SyncPolicy::End),
+            "per-file" | "perfile" => Ok(SyncPolicy::PerFile),
+            _ => Err(pyo3::exceptions::PyValueError::new_err(format!("Unknown sync policy: {} (none, end or per-file).", name))),
+        }
+    }
+}
+
+// helper functions
+#[cfg(unix)]
+pub fn set_mode(path: &Path, mode: u32) -> io::Result<()> {
+    use std::os::unix::fs::PermissionsExt;
+    fs::set_permissions(path, fs::Permissions::from_mode(mode))
+}
+
+#[cfg(not(unix))]
+pub fn set_mode(_path: &Path, _mode: u32) -> io::Result<()> {
+    Ok(())
+}
+
+#[cfg(unix)]
+fn make_symlink(points_to: &Path, link: &Path) -> io::Result<()> {
+    std::os::unix::fs::symlink(points_to, link)
+}
+
+#[cfg(windows)]
+fn make_symlink(points_to: &Path, link: &Path) -> io::Result<()> {
+    std::os::windows::fs::symlink_file(points_to, link)
+}
+
+#[cfg(windows)]
+fn sync_path(path: &Path) -> io::Result<()> {
+    fs::OpenOptions::new().write(true).open(path)?.sync_all()
+}
+
+#[cfg(not(windows))]
+fn sync_path(path: &Path) -> io::Result<()> {
+    File::open(path)?.sync_all()
+}
+
+// Joins an archive path to the output, entries must stay inside it: no
+// parent or root components, and no symlink on the way (symlinks of the
+// archive itself are only created once everything else is written).
+pub fn target(output: &Path, path: &str) -> io::Result<PathBuf> {
+    let escapes = || io::Error::new(io::ErrorKind::InvalidData, format!("Entry path escapes the output: {}", path));
+    let mut target = output.to_path_buf();
+    // nothing beneath a missing component can exist
+    let mut existing = true;
+
+    for component in Path::new(path.trim_start_matches('/')).components() {
+        match component {
+            Component::Normal(part) => {
+                target.push(part);
+                if existing {
+                    match fs::symlink_metadata(&target) {
+                        Ok(metadata) if metadata.file_type().is_symlink() => return Err(escapes()),
+                        Ok(_) => {}
+                        Err(_) => existing = false,
+                    }
+                }
+            }
+            Component::CurDir => {}
+            _ => return Err(escapes()),
+        }
+    }
+
+    Ok(target)
+}
+
+enum Message {
+    // size and crc32: checked once the file is written (removed on a
+    // mismatch)
+    Open { target: PathBuf, size: u64, mode: u32, crc32: Option<u32> },
+    Data(Vec<u8>),
+    Close,
+}
+
+fn writer(queue: Receiver<Message>, sync: SyncPolicy) -> io::Result<()> {
+    let mut current: Option<(File, PathBuf, u32)> = None;
+    let result = write_entries(queue, sync, &mut current);
+
+    // an entry that was opened and not closed successfully (this writer
+    // or the producer failed halfway) never stays on disk, preallocated
+    // or partial.
+    if let Some((file, target, _)) = current.take() {
+        drop(file);
+        let _ = fs::remove_file(&target);
+    }
+
+    result
+}
+
+fn write_entries(queue: Receiver<Message>, sync: SyncPolicy, current: &mut Option<(File, PathBuf, u32)>) -> io::Result<()> {
+    let mut checksum: Option<(u32, crc32fast::Hasher)> = None;
+    let mut remaining = 0u64;
+    let mut written = Vec::new();
+
+    for message in queue {
+        match message {
+            Message::Open { target, size, mode, crc32 } => {
+                if let Some(parent) = target.parent() {
+                    fs::create_dir_all(parent)?;
+                }
+
+                // preallocate, the file is written in one go afterwards
+                let file = current.insert((File::create(&target)?, target, mode));
+                if size > 0 {
+                    file.0.set_len(size)?;
+                }
+                checksum = crc32.map(|crc32| (crc32, crc32fast::Hasher::new()));
+                remaining = size;
+            }
+            Message::Data(chunk) => {
+                let (file, _, _) = current.as_mut()
+                    .ok_or_else(|| io::Error::new(io::ErrorKind::Other, "No file is open."))?;
+                remaining = remaining.checked_sub(chunk.len() as u64)
+                    .ok_or_else(|| io::Error::new(io::ErrorKind::InvalidData, "Entry is longer than recorded."))?;
+                file.write_all(&chunk)?;
+                if let Some((_, hasher)) = checksum.as_mut() {
+                    hasher.update(&chunk);
+                }
+            }
+            Message::Close => {
+                let (file, target, _) = current.as_ref()
+                    .ok_or_else(|| io::Error::new(io::ErrorKind::Other, "No file is open."))?;
+
+                // a corrupt or truncated (a short tar stream ends an entry
+                // early) file never stays on disk, it is still open, see
+                // writer
+                if remaining > 0 {
+                    return Err(io::Error::new(io::ErrorKind::UnexpectedEof, format!("Entry is truncated: {}", target.display())))
+                }
+                if let Some((crc32, hasher)) = checksum.take() {
+                    if hasher.finalize() != crc32 {
+                        return Err(io::Error::new(io::ErrorKind::InvalidData, format!("Entry is corrupted: {}", target.display())))
+                    }
+                }
+
+                if sync == SyncPolicy::PerFile {
+                    file.sync_all()?;
+                }
+
+                // closed successfully
+                let (file, target, mode) = current.take().unwrap();
+                drop(file);
+
+                set_mode(&target, mode)?;
+                if sync == SyncPolicy::End {
+                    written.push(target);
+                }
+            }
+        }
+    }
+
+    for target in written {
+        sync_path(&target)?;
+    }
+
+    Ok(())
+}
+
+// Pool of writer threads. The producer (decompressing and demuxing the
+// entries) hands every file to one writer, round robin, as an open, its
+// data and a close message. Every writer has its own bounded queue, so
+// the messages of a file stay in order and the memory stays bounded.
+pub struct Pool {
+    queues: Vec<SyncSender<Message>>,
+    writers: Vec<JoinHandle<io::Result<()>>>,
+    next: usize,
+    current: usize,
+    directories: Vec<(PathBuf, u32)>,
+    // (output, archive path, points to) created once all files are
+    // written, the paths are checked again then (see target)
+    symlinks: Vec<(PathBuf, String, PathBuf)>,
+    hardlinks: Vec<(PathBuf, String, String)>,
+}
+
+impl Pool {
+    pub fn new(threads: usize, sync: SyncPolicy) -> Self {
+        let (queues, writers) = (0..threads.max(1))
+            .map(|_| {
+                let (queue, receiver) = mpsc::sync_channel(QUEUE_DEPTH);
+                (queue, thread::spawn(move || writer(receiver, sync)))
+            })
+            .unzip();
+
+        Self { queues, writers, next: 0, current: 0, directories: Vec::new(), symlinks: Vec::new(), hardlinks: Vec::new() }
+    }
+
+    fn send(&mut self, message: Message) -> io::Result<()> {
+        let stopped = || io::Error::new(io::ErrorKind::BrokenPipe, "Writer stopped.");
+
+        if self.queues.get(self.current).ok_or_else(stopped)?.send(message).is_err() {
+            // the writer has stopped, report why
+            return Err(self.shutdown().err().unwrap_or_else(stopped))
+        }
+
+        Ok(())
+    }
+
+    // directories are created right away, their modes are applied at
+    // the end so that a read-only directory never blocks its contents.
+    pub fn directory(&mut self, target: PathBuf, mode: u32) -> io::Result<()> {
+        fs::create_dir_all(&target)?;
+        self.directories.push((target, mode));
+        Ok(())
+    }
+
+    // crc32 (if known) is checked by the writer, see Message::Open
+    pub fn open(&mut self, target: PathBuf, size: u64, mode: u32, crc32: Option<u32>) -> io::Result<()> {
+        self.current = self.next;
+        self.next = (self.next + 1) % self.queues.len().max(1);
+        self.send(Message::Open { target, size, mode, crc32 })
+    }
+
+    // links are deferred, so that no entry is ever written through a
+    // symlink of the archive.
+    pub fn symlink(&mut self, output: &Path, path: &str, points_to: PathBuf) -> io::Result<()> {
+        target(output, path)?;
+        self.symlinks.push((output.to_path_buf(), path.to_string(), points_to));
+        Ok(())
+    }
+
+    pub fn hardlink(&mut self, output: &Path, path: &str, original: &str) -> io::Result<()> {
+        target(output, path)?;
+        target(output, original)?;
+        self.hardlinks.push((output.to_path_buf(), path.to_string(), original.to_string()));
+        Ok(())
+    }
+
+    pub fn write(&mut self, chunk: &[u8]) -> io::Result<()> {
+        self.send(Message::Data(chunk.to_vec()))
+    }
+
+    pub fn close(&mut self) -> io::Result<()> {
+        self.send(Message::Close)
+    }
+
+    fn shutdown(&mut self) -> io::Result<()> {
+        // closing the queues stops the writers once they are drained
+        self.queues.clear();
+
+        let mut result = Ok(());
+        for writer in self.writers.drain(..) {
+            let outcome = writer.join()
+                .unwrap_or_else(|_| Err(io::Error::new(io::ErrorKind::Other, "Writer panicked.")));
+            if result.is_ok() {
+                result = outcome;
+            }
+        }
+
+        result
+    }
+
+    pub fn finish(mut self) -> io::Result<()> {
+        self.shutdown()?;
+
+        for (output, path, original) in std::mem::take(&mut self.hardlinks) {
+            fs::hard_link(target(&output, &original)?, target(&output, &path)?)?;
+        }
+        for (output, path, points_to) in std::mem::take(&mut self.symlinks) {
+            make_symlink(&points_to, &target(&output, &path)?)?;
+        }
+
+        for (target, mode) in self.directories.drain(..).rev() {
+            set_mode(&target, mode)?;
+        }
+
+        Ok(())
+    }
+}
+
+impl Drop for Pool {
+    fn drop(&mut self) {
+        let _ = self.shutdown();
+    }
+}
+
+// Exports the selected entries of a tar stream through the pool. Regular
+// files go to the writers, links are created at the end and anything
+// else is unpacked in place.
+pub fn unpack_tar<R: Read>(reader: R, output: &Path, filter: &Filter, pool: &mut Pool) -> io::Result<()> {
+    let mut archive = tar::Archive::new(reader);
+    archive.set_preserve_permissions(true);
+    archive.set_unpack_xattrs(true);
+
+    let mut chunk = vec![0u8; CHUNK_SIZE];
+
+    for entry in archive.entries()? {
+        let mut entry = entry?;
+        let path = entry.path()?.to_string_lossy().into_owned();
+
+        if !filter.matches(&path) {
+            continue
+        }
+
+        let kind = entry.header().entry_type();
+        let mode = entry.header().mode().unwrap_or(0o644);
+
+        if kind.is_dir() {
+            pool.directory(target(output, &path)?, mode)?;
+        } else if kind.is_file() {
+            pool.open(target(output, &path)?, entry.size(), mode, None)?;
+            loop {
+                let count = entry.read(&mut chunk)?;
+                if count == 0 {
+                    break
+                }
+                pool.write(&chunk[..count])?;
+            }
+            pool.close()?;
+        } else if kind.is_symlink() || kind.is_hard_link() {
+            let points_to = entry.link_name()?
+                .ok_or_else(|| io::Error::new(io::ErrorKind::InvalidData, format!("Link has no target: {}", path)))?
+                .into_owned();
+            if kind.is_symlink() {
+                pool.symlink(output, &path, points_to)?;
+            } else {
+                pool.hardlink(output, &path, &points_to.to_string_lossy())?;
+            }
+        } else {
+            // a partially unpacked entry is removed as well
+            let destination = target(output, &path).ok();
+            if let Err(e) = entry.unpack_in(output) {
+                if let Some(destination) = destination {
+                    let _ = fs::remove_file(destination);
+                }
+                return Err(e)
+            }
+        }
+    }
+
+    Ok(())
+}
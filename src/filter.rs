@@ -0,0 +1,70 @@
+use globset::{GlobBuilder, GlobSet, GlobSetBuilder};
+use pyo3::prelude::*;
+
+// Selects archive entries by glob pattern or literal path. A pattern or
+// path selects what it matches along with everything beneath it, so a
+// directory selects its whole subtree. Literal paths are compared as
+// they are (names with `[`, `*`, `?` or `{` are not globs there). No
+// patterns and no paths select everything.
+pub struct Filter {
+    set: Option<GlobSet>,
+    paths: Vec<String>,
+}
+
+impl Filter {
+    pub fn new(patterns: Option<Vec<String>>, paths: Option<Vec<String>>) -> PyResult<Self> {
+        let everything = || Ok(Self { set: None, paths: Vec::new() });
+        let (patterns, paths) = (patterns.unwrap_or_default(), paths.unwrap_or_default());
+        if patterns.is_empty() && paths.is_empty() {
+            return everything()
+        }
+
+        let paths: Vec<String> = paths.iter().map(|path| path.trim_matches('/').to_string()).collect();
+        // the root selects everything
+        if paths.iter().any(|path| path.is_empty()) {
+            return everything()
+        }
+
+        if patterns.is_empty() {
+            return Ok(Self { set: None, paths })
+        }
+
+        let mut builder = GlobSetBuilder::new();
+        for pattern in patterns {
+            let pattern = pattern.trim_matches('/');
+
+            // the root selects everything
+            if pattern.is_empty() {
+                return everything()
+            }
+
+            for pattern in [pattern.to_string(), format!("{}/**", pattern)] {
+                let glob = GlobBuilder::new(&pattern)
+                    .literal_separator(true)
+                    .build()
+                    .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("Invalid pattern: {}", e)))?;
+                builder.add(glob);
+            }
+        }
+
+        let set = builder
+            .build()
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("Invalid pattern: {}", e)))?;
+        Ok(Self { set: Some(set), paths })
+    }
+
+    pub fn selects_all(&self) -> bool {
+        self.set.is_none() && self.paths.is_empty()
+    }
+
+    pub fn matches(&self, path: &str) -> bool {
+        if self.selects_all() {
+            return true
+        }
+
+        let path = path.trim_matches('/');
+        self.paths.iter().any(|selected| {
+            path.strip_prefix(selected.as_str()).is_some_and(|rest| rest.is_empty() || rest.starts_with('/'))
+        }) || self.set.as_ref().is_some_and(|set| set.is_match(path))
+    }
+}
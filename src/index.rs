@@ -0,0 +1,319 @@
+use std::fs::{self, File};
+use std::io::{self, Read, Write};
+use std::path::Path;
+use serde::{Serialize, Deserialize};
+use bincode::{serialize_into, deserialize};
+use crate::compress::{self, Block, Codec, ParallelEncoder, BLOCK_SIZE};
+use crate::extract::{self, Pool};
+use crate::filter::Filter;
+
+// Indexed archive data (version 3):
+//
+// blocks | index | index size (u64) | INDEX_MAGIC
+//
+// The contents of all the files are concatenated into one stream which
+// is cut into independently compressed blocks (see compress.rs). The
+// index holds every entry (path, position in the stream, size, mode and
+// checksum) and the position of every block, so a single file can be
+// read by decoding only the blocks it spans.
+const INDEX_MAGIC: &[u8] = b"NYEDAIX1";
+
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct Entry {
+    pub path: String,
+    pub directory: bool,
+    pub mode: u32,
+    pub offset: u64,
+    pub size: u64,
+    pub crc32: u32,
+}
+
+#[derive(Serialize, Deserialize)]
+pub struct Index {
+    // sorted by path
+    entries: Vec<Entry>,
+    blocks: Vec<Block>,
+    // end of the blocks in the archive data (not stored)
+    #[serde(skip)]
+    end: usize,
+}
+
+// helper functions
+fn invalid(message: &str) -> io::Error {
+    io::Error::new(io::ErrorKind::InvalidData, message.to_string())
+}
+
+#[cfg(unix)]
+fn mode_of(metadata: &fs::Metadata, _default: u32) -> u32 {
+    use std::os::unix::fs::PermissionsExt;
+    metadata.permissions().mode() & 0o7777
+}
+
+#[cfg(not(unix))]
+fn mode_of(_metadata: &fs::Metadata, default: u32) -> u32 {
+    default
+}
+
+fn add_dir<W: Write>(encoder: &mut ParallelEncoder<W>, entries: &mut Vec<Entry>, source: &Path, base: &Path, chunk: &mut [u8]) -> io::Result<()> {
+    let mut children = fs::read_dir(source)?.collect::<io::Result<Vec<_>>>()?;
+    children.sort_by_key(|child| child.file_name());
+
+    for child in children {
+        let path = child.path();
+        let relative = path.strip_prefix(base)
+            .map_err(|_| io::Error::new(io::ErrorKind::InvalidInput, "Invalid Path"))?
+            .to_string_lossy()
+            .replace('\\', "/");
+        let metadata = fs::metadata(&path)?;
+
+        if metadata.is_dir() {
+            entries.push(Entry {
+                path: relative,
+                directory: true,
+                mode: mode_of(&metadata, 0o755),
+                offset: encoder.position(),
+                size: 0,
+                crc32: 0,
+            });
+            add_dir(encoder, entries, &path, base, chunk)?;
+            continue
+        }
+
+        let mut file = File::open(&path)?;
+        let offset = encoder.position();
+        let mut hasher = crc32fast::Hasher::new();
+        let mut size = 0u64;
+        let mut first = true;
+
+        loop {
+            let count = file.read(chunk)?;
+            if count == 0 {
+                break
+            }
+
+            // media, archives and the like are stored as they are
+            if first {
+                encoder.set_store(compress::incompressible(&path, metadata.len(), &chunk[..count]))?;
+                first = false;
+            }
+
+            hasher.update(&chunk[..count]);
+            encoder.write_all(&chunk[..count])?;
+            size += count as u64;
+        }
+
+        entries.push(Entry {
+            path: relative,
+            directory: false,
+            mode: mode_of(&metadata, 0o644),
+            offset,
+            size,
+            crc32: hasher.finalize(),
+        });
+    }
+
+    Ok(())
+}
+
+// Writes the indexed archive data of the source into the output.
+pub fn write<W: Write>(output: W, source: &Path, codec: Codec, level: i32, workers: usize) -> io::Result<W> {
+    let mut encoder = ParallelEncoder::framed(output, codec, level, workers);
+    let mut entries = Vec::new();
+    let mut chunk = vec![0u8; compress::SAMPLE_SIZE];
+
+    add_dir(&mut encoder, &mut entries, source, source, &mut chunk)?;
+
+    let (mut output, blocks) = encoder.finish_blocks()?;
+    entries.sort_by(|a, b| a.path.cmp(&b.path));
+
+    let index = Index { entries, blocks, end: 0 };
+    let mut encoded = Vec::new();
+    serialize_into(&mut encoded, &index).map_err(|e| io::Error::new(io::ErrorKind::Other, e))?;
+
+    output.write_all(&encoded)?;
+    output.write_all(&(encoded.len() as u64).to_le_bytes())?;
+    output.write_all(INDEX_MAGIC)?;
+    Ok(output)
+}
+
+impl Index {
+    // Parses the index of the archive data. It can be kept and reused for
+    // the same data, see `archive`.
+    pub fn parse(data: &[u8]) -> io::Result<Self> {
+        // the version in the bundle header tells indexed data apart, the
+        // magic at the end only checks its integrity
+        if !data.ends_with(INDEX_MAGIC) || data.len() < INDEX_MAGIC.len() + 8 {
+            return Err(invalid("Archive data is not indexed."))
+        }
+
+        let size_at = data.len() - INDEX_MAGIC.len() - 8;
+        let size = u64::from_le_bytes(data[size_at..size_at + 8].try_into().unwrap()) as usize;
+
+        if size > size_at {
+            return Err(invalid("Archive index is truncated."))
+        }
+
+        let mut index: Index = deserialize(&data[size_at - size..size_at])
+            .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e))?;
+        index.end = size_at - size;
+        index.check()?;
+        Ok(index)
+    }
+
+    // The index is not trusted: the blocks must follow each other inside
+    // the data, and every entry must lie within the stream they can hold
+    // (a block never decodes to more than BLOCK_SIZE). No read then
+    // allocates or preallocates more than the data can decode to.
+    fn check(&self) -> io::Result<()> {
+        let mut previous: Option<&Block> = None;
+
+        for block in &self.blocks {
+            if block.offset >= self.end as u64 {
+                return Err(invalid("Block lies outside the archive."))
+            }
+
+            let follows = match previous {
+                None => block.start == 0,
+                Some(previous) => block.offset > previous.offset
+                    && block.start > previous.start
+                    && block.start - previous.start <= BLOCK_SIZE as u64,
+            };
+            if !follows {
+                return Err(invalid("Archive index is corrupted."))
+            }
+            previous = Some(block);
+        }
+
+        let stream = previous.map_or(0, |last| last.start + BLOCK_SIZE as u64);
+        for entry in &self.entries {
+            if entry.offset.checked_add(entry.size).map_or(true, |end| end > stream) {
+                return Err(invalid("Entry lies outside the archive."))
+            }
+        }
+
+        Ok(())
+    }
+
+    pub fn archive<'a>(&'a self, data: &'a [u8]) -> Archive<'a> {
+        Archive { blocks: &data[..self.end.min(data.len())], index: self }
+    }
+
+    pub fn entries(&self) -> &[Entry] {
+        &self.entries
+    }
+
+    pub fn find(&self, path: &str) -> Option<&Entry> {
+        let path = path.trim_start_matches('/');
+        self.entries
+            .binary_search_by(|entry| entry.path.as_str().cmp(path))
+            .ok()
+            .map(|found| &self.entries[found])
+    }
+}
+
+// Read side of the indexed archive data, the blocks are decoded on
+// demand.
+pub struct Archive<'a> {
+    blocks: &'a [u8],
+    index: &'a Index,
+}
+
+impl<'a> Archive<'a> {
+
+    // decodes the block at the given position in the block table.
+    fn block(&self, position: usize) -> io::Result<Vec<u8>> {
+        let offset = self.index.blocks[position].offset as usize;
+        if offset > self.blocks.len() {
+            return Err(invalid("Block lies outside the archive."))
+        }
+
+        compress::read_block(&mut &self.blocks[offset..])?
+            .ok_or_else(|| invalid("Block lies outside the archive."))
+    }
+
+    // Feeds the bytes start..start + length of the stream to the sink,
+    // block by block. The last decoded block is kept in the cache, so
+    // neighbouring entries sharing a block decode it only once.
+    fn stream_range(&self, start: u64, length: u64, cache: &mut Option<(usize, Vec<u8>)>, mut sink: impl FnMut(&[u8]) -> io::Result<()>) -> io::Result<()> {
+        let end = start + length;
+        let blocks = &self.index.blocks;
+        let mut position = blocks.partition_point(|block| block.start <= start).saturating_sub(1);
+        let mut done = start;
+
+        while done < end {
+            if position >= blocks.len() {
+                return Err(invalid("Entry lies outside the archive."))
+            }
+
+            if cache.as_ref().map(|(cached, _)| *cached) != Some(position) {
+                *cache = Some((position, self.block(position)?));
+            }
+
+            let block = &cache.as_ref().unwrap().1;
+            let block_start = blocks[position].start;
+            let from = done.max(block_start) - block_start;
+            let to = (end - block_start).min(block.len() as u64);
+
+            if from < to {
+                sink(&block[from as usize..to as usize])?;
+                done = block_start + to;
+            }
+            position += 1;
+        }
+
+        Ok(())
+    }
+
+    // Reads `length` bytes of the entry from `offset` on, decoding only
+    // the blocks the range spans. A read of the whole entry is checked
+    // against its checksum.
+    pub fn read(&self, entry: &Entry, offset: u64, length: u64) -> io::Result<Vec<u8>> {
+        let offset = offset.min(entry.size);
+        let length = length.min(entry.size - offset);
+        // the buffer grows as the blocks are decoded, the recorded size
+        // is not trusted for more than a block up front
+        let mut output = Vec::with_capacity(length.min(BLOCK_SIZE as u64) as usize);
+
+        self.stream_range(entry.offset + offset, length, &mut None, |chunk| {
+            output.extend_from_slice(chunk);
+            Ok(())
+        })?;
+
+        if offset == 0 && length == entry.size && crc32fast::hash(&output) != entry.crc32 {
+            return Err(invalid("Entry is corrupted."))
+        }
+
+        Ok(output)
+    }
+
+    // Exports the entries the filter selects through the pool. Only the
+    // blocks spanned by selected files are decoded, each at most once.
+    pub fn export(&self, output: &Path, filter: &Filter, pool: &mut Pool) -> io::Result<()> {
+        let mut files = Vec::new();
+
+        for entry in &self.index.entries {
+            if !filter.matches(&entry.path) {
+                continue
+            }
+
+            let target = extract::target(output, &entry.path)?;
+            if entry.directory {
+                pool.directory(target, entry.mode)?;
+            } else {
+                files.push((entry, target));
+            }
+        }
+
+        files.sort_by_key(|(entry, _)| entry.offset);
+        let mut cache = None;
+
+        for (entry, target) in files {
+            // the writer checks the crc and removes a corrupt file
+            pool.open(target, entry.size, entry.mode, Some(entry.crc32))?;
+            self.stream_range(entry.offset, entry.size, &mut cache, |chunk| pool.write(chunk))?;
+            pool.close()?;
+        }
+
+        Ok(())
+    }
+}
@@ -2,7 +2,15 @@
 use pyo3::prelude::*;
 
 mod securedelete;
+mod buffer;
+mod compress;
+mod crypt;
+mod encoding;
+mod extract;
+mod filter;
+mod index;
 mod structure;
+mod trie;
 mod repack;
 mod macos;
 mod meta;
@@ -18,9 +26,22 @@ fn sharedobject(py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     let bundle = PyModule::new_bound(py, "bundle")?;
     bundle.add_class::<repack::Bundle>()?;
     bundle.add_class::<repack::Dismantle>()?;
+    bundle.add_class::<repack::ArchiveHandle>()?;
     bundle.add_class::<structure::Structure>()?;
+    bundle.add_class::<structure::EntryInfo>()?;
+    bundle.add_class::<structure::Entries>()?;
+    bundle.add_class::<trie::PathTree>()?;
+    bundle.add_class::<buffer::Buffer>()?;
     m.add_submodule(&bundle)?;
 
+    let crypto = PyModule::new_bound(py, "crypto")?;
+    crypto.add_class::<crypt::Cipher>()?;
+    m.add_submodule(&crypto)?;
+
+    let encoding = PyModule::new_bound(py, "encoding")?;
+    encoding.add_class::<encoding::Base64>()?;
+    m.add_submodule(&encoding)?;
+
     let secure_delete = PyModule::new_bound(py, "secure_delete")?;
     secure_delete.add_class::<securedelete::SecureDelete>()?;
     m.add_submodule(&secure_delete)?;
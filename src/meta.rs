@@ -1,4 +1,6 @@
 use std::error::Error;
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::{Duration, Instant};
 use mac_address::get_mac_address;
 use sysinfo::{System, Disks};
 use md5;
@@ -23,6 +25,87 @@ pub struct MetaData {
     pub collective_hash: String,
 }
 
+// Host fingerprint, every part is probed lazily (only once) and the
+// parts that are still missing can be probed concurrently.
+struct Fingerprint {
+    created: Instant,
+    username: OnceLock<String>,
+    mac_addresses: OnceLock<Vec<String>>,
+    machine_id: OnceLock<Option<String>>,
+    disk_serials: OnceLock<Vec<String>>,
+    cpu_info: OnceLock<String>,
+    motherboard_serial: OnceLock<Option<String>>,
+}
+
+impl Fingerprint {
+    fn new() -> Self {
+        Self {
+            created: Instant::now(),
+            username: OnceLock::new(),
+            mac_addresses: OnceLock::new(),
+            machine_id: OnceLock::new(),
+            disk_serials: OnceLock::new(),
+            cpu_info: OnceLock::new(),
+            motherboard_serial: OnceLock::new(),
+        }
+    }
+
+    fn username(&self) -> &String {
+        self.username.get_or_init(MetaData::get_username)
+    }
+
+    fn mac_addresses(&self) -> &Vec<String> {
+        self.mac_addresses.get_or_init(|| MetaData::get_mac_address().unwrap())
+    }
+
+    fn machine_id(&self) -> &Option<String> {
+        self.machine_id.get_or_init(MetaData::get_machine_id)
+    }
+
+    fn disk_serials(&self) -> &Vec<String> {
+        self.disk_serials.get_or_init(MetaData::get_disk_serials)
+    }
+
+    fn cpu_info(&self) -> &String {
+        self.cpu_info.get_or_init(|| MetaData::get_cpu_info().unwrap())
+    }
+
+    fn motherboard_serial(&self) -> &Option<String> {
+        self.motherboard_serial.get_or_init(MetaData::get_motherboard_serial)
+    }
+
+    fn probe(&self) {
+        // the probes are independent of each other (separate commands,
+        // files and system calls), so they run side by side.
+        std::thread::scope(|scope| {
+            scope.spawn(|| { self.mac_addresses(); });
+            scope.spawn(|| { self.machine_id(); });
+            scope.spawn(|| { self.disk_serials(); });
+            scope.spawn(|| { self.cpu_info(); });
+            scope.spawn(|| { self.motherboard_serial(); });
+            self.username();
+        });
+    }
+}
+
+// process wide fingerprint cache and its time to live (None = forever).
+static FINGERPRINT: Mutex<Option<Arc<Fingerprint>>> = Mutex::new(None);
+static FINGERPRINT_TTL: Mutex<Option<Duration>> = Mutex::new(None);
+
+fn fingerprint() -> Arc<Fingerprint> {
+    let ttl = *FINGERPRINT_TTL.lock().unwrap_or_else(|e| e.into_inner());
+    let mut cache = FINGERPRINT.lock().unwrap_or_else(|e| e.into_inner());
+
+    match cache.as_ref() {
+        Some(fingerprint) if ttl.map_or(true, |ttl| fingerprint.created.elapsed() < ttl) => fingerprint.clone(),
+        _ => {
+            let fingerprint = Arc::new(Fingerprint::new());
+            *cache = Some(fingerprint.clone());
+            fingerprint
+        }
+    }
+}
+
 impl<'a> FromPyObject<'a> for MetaData {
     fn extract_bound(ob: &Bound<'a, PyAny>) -> PyResult<Self> {
         let version: u8 = ob.getattr("version")?.extract()?;
@@ -128,7 +211,7 @@ impl MetaData {
                 .args(["-s", "system-serial-number"])
                 .output()
                 .ok()
-                .and_then(|ouput| String::from_utf8(output.stdout).ok())
+                .and_then(|output| String::from_utf8(output.stdout).ok())
                 .map(|s| s.trim().to_string())
         }
 
@@ -179,14 +262,17 @@ impl MetaData {
     }
 
     pub fn new(version: u8) -> Self {
+        let fingerprint = fingerprint();
+        fingerprint.probe();
+
         let mut metadata = Self {
             version,
-            username: Self::get_username(),
-            mac_addresses: Self::get_mac_address().unwrap(),
-            machine_id: Self::get_machine_id(),
-            disk_serials: Self::get_disk_serials(),
-            cpu_info: Self::get_cpu_info().unwrap(),
-            motherboard_serial: Self::get_motherboard_serial(),
+            username: fingerprint.username().clone(),
+            mac_addresses: fingerprint.mac_addresses().clone(),
+            machine_id: fingerprint.machine_id().clone(),
+            disk_serials: fingerprint.disk_serials().clone(),
+            cpu_info: fingerprint.cpu_info().clone(),
+            motherboard_serial: fingerprint.motherboard_serial().clone(),
             collective_hash: String::new(),
         };
 
@@ -202,5 +288,13 @@ impl MetaData {
     pub fn check_hash(hash: &str, version: u8) -> bool {
         MetaData::new(version).collective_hash == hash
     }
+
+    pub fn refresh() {
+        *FINGERPRINT.lock().unwrap_or_else(|e| e.into_inner()) = None;
+    }
+
+    pub fn set_ttl(ttl: Option<Duration>) {
+        *FINGERPRINT_TTL.lock().unwrap_or_else(|e| e.into_inner()) = ttl;
+    }
 }
 
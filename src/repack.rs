@@ -1,19 +1,133 @@
 use std::fs::{self, File};
-use std::io::{self, Read, Write, Cursor};
-use flate2::bufread::GzDecoder;
+use std::path::Path;
+use std::io::{self, BufWriter, Cursor, Read, Seek, SeekFrom, Write};
 use rustypath::RPath;
-use flate2::write::GzEncoder;
-use flate2::Compression;
 use tar::Builder;
 use serde::{Serialize, Deserialize};
-use bincode::{serialize, deserialize};
+use bincode::{serialize_into, deserialize};
 use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::types::{PyDict, PyMemoryView, PySlice};
+use crate::buffer::{self, Buffer};
+use crate::compress::{self, Codec, ParallelEncoder};
+use crate::extract::{self, Pool, SyncPolicy};
+use crate::filter::Filter;
+use crate::index;
 use crate::meta::MetaData;
+use crate::structure;
+use crate::trie::PathTree;
 
 const MAGIC: &[u8] = b"CODENAME-NT";
 
+// version 1: MAGIC | version | package size | package, gzip stream.
+// version 2: MAGIC | version | codec | level (i32) | package size | package,
+//            framed blocks (see compress.rs).
+// version 3: same header as version 2, indexed archive data (see index.rs).
+const VERSION_GZIP: u8 = 1;
+const VERSION_CODEC: u8 = 2;
+pub const VERSION_INDEXED: u8 = 3;
+
+// borrowed form of the package, the archive data is not copied out
+// of the buffer it is deserialized from.
+#[derive(Deserialize)]
+struct PackageRef<'a> {
+    metadata: MetaData,
+    #[serde(borrow)]
+    data: &'a [u8],
+}
+
+// parsed header of a bundle, the archive data lies at start..end of
+// the bundle it was parsed from.
+struct Header {
+    version: u8,
+    codec: Codec,
+    level: i32,
+    metadata: MetaData,
+    start: usize,
+    end: usize,
+}
+
+fn parse_header(data: &[u8]) -> PyResult<Header> {
+    if data.len() < MAGIC.len() + 1 + 8 {
+        return Err(pyo3::exceptions::PyUserWarning::new_err(format!("No Content Found.")))
+    }
+
+    if &data[..MAGIC.len()] != MAGIC {
+        return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system.")))
+    }
+
+    let version: u8 = data[MAGIC.len()];
+
+    let (codec, level, size_start) = match version {
+        VERSION_GZIP => (Codec::Gzip, Codec::Gzip.default_level(), MAGIC.len() + 1),
+        VERSION_CODEC | VERSION_INDEXED => {
+            if data.len() < MAGIC.len() + 1 + 5 + 8 {
+                return Err(pyo3::exceptions::PyUserWarning::new_err(format!("No Content Found.")))
+            }
+
+            let codec = Codec::from_id(data[MAGIC.len() + 1])
+                .ok_or_else(|| pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system. Unknown codec.")))?;
+            let level = i32::from_le_bytes(data[MAGIC.len() + 2..MAGIC.len() + 6].try_into().unwrap());
+            (codec, level, MAGIC.len() + 6)
+        }
+        _ => return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system. Version mismatch."))),
+    };
+
+    let size_end: usize = size_start + 8;
+    let package_size: usize = u64::from_le_bytes(data[size_start..size_end].try_into().unwrap()) as usize;
+
+    if data.len() - size_end < package_size {
+        return Err(pyo3::exceptions::PyValueError::new_err(format!("Invalid Data Found: Package is truncated.")))
+    }
+
+    let package: PackageRef = deserialize(&data[size_end..size_end + package_size])
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("Invalid Data Found: Cannot separate metadata: {}", e)))?;
+
+    if version != package.metadata.version {
+        return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system. Version mismatch.")))
+    }
+
+    let start = package.data.as_ptr() as usize - data.as_ptr() as usize;
+    Ok(Header {
+        version,
+        codec,
+        level,
+        start,
+        end: start + package.data.len(),
+        metadata: package.metadata,
+    })
+}
+
 // helper functions
-fn add_dir_to_archive<W: Write>(builder: &mut Builder<W>, source: RPath, base: RPath) -> io::Result<()> {
+// Exports the archive data through a pool of writer threads, this
+// thread decompresses and hands the entries out.
+fn export(data: &[u8], version: u8, index: Option<&index::Index>, output: &str, filter: &Filter, threads: usize, sync: SyncPolicy) -> PyResult<bool> {
+    fs::create_dir_all(output)?;
+
+    let output = Path::new(output);
+    let mut pool = Pool::new(threads, sync);
+
+    if version == VERSION_INDEXED {
+        let parsed;
+        let index = match index {
+            Some(index) => index,
+            None => {
+                parsed = index::Index::parse(data)?;
+                &parsed
+            }
+        };
+        index.archive(data).export(output, filter, &mut pool)?;
+    } else {
+        // tar based versions are decompressed up to the last entry, but
+        // only the selected entries are written.
+        extract::unpack_tar(compress::reader(data), output, filter, &mut pool)?;
+    }
+
+    pool.finish()?;
+    Ok(true)
+}
+
+fn add_dir_to_archive<W: Write>(builder: &mut Builder<ParallelEncoder<W>>, source: RPath, base: RPath) -> io::Result<()> {
     let _base = base.clone();
     for entry in source.read_dir().expect("Failed to read source directory!") {
         let entry = entry?;
@@ -24,16 +138,25 @@ fn add_dir_to_archive<W: Write>(builder: &mut Builder<W>, source: RPath, base: R
         if path.is_dir() {
             add_dir_to_archive(builder, RPath::from(path), _base.clone())?;
         } else {
-            let mut file = File::open(&path)?;
-            let mut contents = Vec::new();
-            file.read_to_end(&mut contents)?;
+            // the file is streamed into the archive, only a sample of
+            // its start is held in memory.
+            let file = File::open(&path)?;
+            let size = file.metadata()?.len();
+
+            let mut sample = Vec::with_capacity(compress::SAMPLE_SIZE.min(size as usize));
+            (&file).take(compress::SAMPLE_SIZE as u64).read_to_end(&mut sample)?;
+
+            // media, archives and the like are stored as they are
+            builder.get_mut().set_store(compress::incompressible(&path, size, &sample))?;
 
             let mut header = tar::Header::new_gnu();
-            header.set_size(contents.len() as u64);
+            header.set_size(size);
             
             header.set_mode(0o644);
 
-            builder.append_data(&mut header, relative, Cursor::new(contents))?;
+            // exactly `size` bytes, even if the file changes meanwhile
+            let contents = Cursor::new(sample).chain(file).chain(io::repeat(0)).take(size);
+            builder.append_data(&mut header, relative, contents)?;
         }
     }
 
@@ -56,6 +179,84 @@ impl<'a> FromPyObject<'a> for Bundle {
     }
 }
 
+// checks the codec against the version, returns it with its level.
+fn codec_options(version: u8, codec: &str, level: Option<i32>) -> PyResult<(Codec, i32)> {
+    let codec = Codec::from_name(codec)
+        .ok_or_else(|| pyo3::exceptions::PyValueError::new_err(format!("Unknown codec: {} (none, gzip, zstd or lz4).", codec)))?;
+
+    // lz4 (block format) and none have no levels
+    if level.is_some() && matches!(codec, Codec::None | Codec::Lz4) {
+        return Err(pyo3::exceptions::PyValueError::new_err(format!("Codec {} takes no level.", codec.name())))
+    }
+
+    match version {
+        VERSION_GZIP if codec != Codec::Gzip => {
+            Err(pyo3::exceptions::PyValueError::new_err(format!("Version {} only supports gzip.", VERSION_GZIP)))
+        }
+        VERSION_GZIP | VERSION_CODEC | VERSION_INDEXED => Ok((codec, level.unwrap_or_else(|| codec.default_level()))),
+        _ => Err(pyo3::exceptions::PyValueError::new_err(format!("Unsupported version: {}", version))),
+    }
+}
+
+impl Bundle {
+    // Writes the bundle into the output while it is being built, so the
+    // archive data is never held in memory on its own. The sizes in the
+    // header are only known at the end, they are written as placeholders
+    // and back-patched. Returns the number of bytes written.
+    fn _write_package<W: Write + Seek>(&self, output: &mut W, source: &str, version: u8, codec: Codec, level: i32, workers: usize) -> PyResult<u64> {
+        let start = output.stream_position()?;
+
+        output.write_all(MAGIC)?;
+        output.write_all(&[version])?;
+
+        if version != VERSION_GZIP {
+            output.write_all(&[codec.id()])?;
+            output.write_all(&level.to_le_bytes())?;
+        }
+
+        let package_at = output.stream_position()?;
+        output.write_all(&0u64.to_le_bytes())?;
+
+        // the package is the metadata followed by the archive data
+        // (length + bytes), exactly how bincode lays out `Bundle`.
+        // the metadata version must match the header.
+        let metadata = if self.metadata.version == version {
+            self.metadata.clone()
+        } else {
+            MetaData::new(version)
+        };
+
+        serialize_into(&mut *output, &metadata)
+            .map_err(|e| pyo3::exceptions::PyException::new_err(format!("Failed to serialize the package and metadata: {}", e)))?;
+
+        let data_at = output.stream_position()?;
+        output.write_all(&0u64.to_le_bytes())?;
+
+        if version == VERSION_INDEXED {
+            index::write(&mut *output, &RPath::from(source).expand().convert_to_pathbuf(), codec, level, workers)?;
+        } else {
+            let encoder = match version {
+                VERSION_GZIP => ParallelEncoder::gzip(&mut *output, level, workers),
+                _ => ParallelEncoder::framed(&mut *output, codec, level, workers),
+            };
+            let mut builder = Builder::new(encoder);
+            add_dir_to_archive(&mut builder, RPath::from(source).expand(), RPath::from(source).expand())?;
+            builder.into_inner()?.finish()?;
+        }
+
+        let end = output.stream_position()?;
+
+        output.seek(SeekFrom::Start(package_at))?;
+        output.write_all(&(end - package_at - 8).to_le_bytes())?;
+        output.seek(SeekFrom::Start(data_at))?;
+        output.write_all(&(end - data_at - 8).to_le_bytes())?;
+        output.seek(SeekFrom::Start(end))?;
+        output.flush()?;
+
+        Ok(end - start)
+    }
+}
+
 #[pymethods]
 impl Bundle {
     #[new]
@@ -66,53 +267,44 @@ impl Bundle {
         }
     }
 
-    fn _create_archive_data(&mut self, source: &str) -> PyResult<Vec<u8>> {
-        let mut buffer = Vec::new();
-        
-        {   
-            let gz_encoder = GzEncoder::new(&mut buffer, Compression::best());
-            let mut builder = Builder::new(gz_encoder);
-            add_dir_to_archive(&mut builder, RPath::from(source).expand(), RPath::from(source).expand())?;
-            builder.finish()?;
-        }
-
-        Ok(buffer)
-    }
-
-    fn create(&mut self, source: &str, version: u8) -> PyResult<Vec<u8>> {
+    #[pyo3(signature = (source, version, workers=None, codec="gzip", level=None))]
+    fn create<'py>(&mut self, py: Python<'py>, source: &str, version: u8, workers: Option<usize>, codec: &str, level: Option<i32>) -> PyResult<Bound<'py, PyMemoryView>> {
         // script path must be relative here. (/script => script)
         // where / represents the source dir.
         // check if the script exists inside the dir
+        let (codec, level) = codec_options(version, codec, level)?;
 
-        // create archive data
-        let archive = self._create_archive_data(source)?;
-
-        // create package
-        let package = Bundle {
-            metadata: self.metadata.clone(),
-            data: archive.clone(),
-        };
-
-        // Serialize the package
-        let mut output = Vec::new();
-        output.extend_from_slice(MAGIC);
-        output.push(version);
+        // the GIL is released while compressing
+        let output = py.allow_threads(|| -> PyResult<Vec<u8>> {
+            let mut output = Cursor::new(Vec::new());
+            self._write_package(&mut output, source, version, codec, level, workers.unwrap_or_else(compress::default_workers))?;
+            Ok(output.into_inner())
+        })?;
 
-        let serialized = serialize(&package)
-            .map_err(|e| pyo3::exceptions::PyException::new_err(format!("Failed to serialize the package and metadata: {}", e)))?;
+        buffer::memoryview(py, output)
+    }
 
-        output.extend_from_slice(&(serialized.len() as u64).to_le_bytes());
-        output.extend_from_slice(&serialized);
+    // Same as create, but the bundle is streamed into a file, the memory
+    // used stays bounded no matter how large the source is.
+    #[pyo3(signature = (source, output, version, workers=None, codec="gzip", level=None))]
+    fn create_to(&mut self, py: Python<'_>, source: &str, output: &str, version: u8, workers: Option<usize>, codec: &str, level: Option<i32>) -> PyResult<u64> {
+        let (codec, level) = codec_options(version, codec, level)?;
 
-        Ok(output)
+        py.allow_threads(|| {
+            let mut writer = BufWriter::with_capacity(compress::BLOCK_SIZE, File::create(output)?);
+            let written = self._write_package(&mut writer, source, version, codec, level, workers.unwrap_or_else(compress::default_workers))?;
+            writer.into_inner().map_err(|e| e.into_error())?;
 
+            Ok(written)
+        })
     }
 }
 
 
 #[pyclass]
 pub struct Dismantle {
-    data: Vec<u8>,
+    data: Py<Buffer>,
+    version: u8,
     #[allow(dead_code)]
     metadata: MetaData
 }
@@ -120,49 +312,30 @@ pub struct Dismantle {
 #[pymethods]
 impl Dismantle {
     #[new]
-    fn new(data: Vec<u8>) -> PyResult<Self> {
-        if data.len() < MAGIC.len() + 1 + 8 {
-            return Err(pyo3::exceptions::PyUserWarning::new_err(format!("No Content Found.")))
-        }
-
-        if &data[..MAGIC.len()] != MAGIC {
-            return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system.")))
-        }
-
-        let _version: u8 = data[MAGIC.len()];
-
-        let size_start: usize = MAGIC.len() + 1;
-        let size_end: usize = size_start + 8;
-        let _package_size = u64::from_le_bytes(data[size_start..size_end].try_into().unwrap()) as usize;
-
-        let package: Bundle = deserialize(&data[size_end..])
-            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("Invalid Data Found: Cannot separate metadata: {}", e)))?;
-
-
-        if _version != package.metadata.version {
-            return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system. Version mismatch.")))
-        }
+    fn new(py: Python<'_>, data: PyBuffer<u8>) -> PyResult<Self> {
+        let data = buffer::as_slice(&data)?;
+        let header = parse_header(data)?;
 
         Ok(Self{
-            data: package.data.clone(),
-            metadata: package.metadata.clone(),
+            data: Py::new(py, Buffer::from(data[header.start..header.end].to_vec()))?,
+            version: header.version,
+            metadata: header.metadata,
         })
     }
 
-    fn export(&self, output: &str) -> PyResult<bool> {
-        fs::create_dir_all(output)?;
+    #[pyo3(signature = (output, patterns=None, threads=None, sync="none", paths=None))]
+    fn export(&self, py: Python<'_>, output: &str, patterns: Option<Vec<String>>, threads: Option<usize>, sync: &str, paths: Option<Vec<String>>) -> PyResult<bool> {
+        let (data, version, filter, sync) = (self.data.get().as_slice(), self.version, Filter::new(patterns, paths)?, SyncPolicy::from_name(sync)?);
+        py.allow_threads(|| export(data, version, None, output, &filter, threads.unwrap_or_else(compress::default_workers), sync))
+    }
 
-        let cursor = Cursor::new(self.data.clone());
-        let tar = GzDecoder::new(cursor);
-        let mut archive = tar::Archive::new(tar);
-        archive.set_preserve_permissions(true);
-        archive.set_unpack_xattrs(true);
-        archive.unpack(output)?;
-        Ok(true)
+    #[getter]
+    fn version(&self) -> u8 {
+        self.version
     }
 
-    fn get(&self) -> PyResult<Vec<u8>> {
-        Ok(self.data.clone())
+    fn get<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyMemoryView>> {
+        PyMemoryView::from_bound(self.data.bind(py).as_any())
     }
 
     fn get_meta(&self) -> PyResult<String> {
@@ -181,33 +354,195 @@ impl Validation {
     }
 
     #[staticmethod]
-    pub fn validate_meta(data: Vec<u8>) -> PyResult<bool> {
-        if data.len() < MAGIC.len() + 1 + 8 {
-            return Err(pyo3::exceptions::PyUserWarning::new_err(format!("No Content Found.")))
-        }
+    pub fn validate_meta(data: PyBuffer<u8>) -> PyResult<bool> {
+        let header = parse_header(buffer::as_slice(&data)?)?;
+        Ok(MetaData::check(header.metadata))
+    }
 
-        if &data[..MAGIC.len()] != MAGIC {
+    #[staticmethod]
+    pub fn validate_meta_hash(version: u8, hash: &str) -> PyResult<bool> {
+        Ok(MetaData::check_hash(hash, version))
+    }
+
+    #[staticmethod]
+    pub fn refresh_fingerprint() -> PyResult<()> {
+        MetaData::refresh();
+        Ok(())
+    }
+
+    #[staticmethod]
+    #[pyo3(signature = (seconds=None))]
+    pub fn set_fingerprint_ttl(seconds: Option<f64>) -> PyResult<()> {
+        let ttl = match seconds {
+            Some(seconds) if seconds.is_finite() && seconds >= 0.0 => Some(std::time::Duration::from_secs_f64(seconds)),
+            Some(_) => return Err(pyo3::exceptions::PyValueError::new_err(format!("TTL must be a finite non-negative number of seconds."))),
+            None => None,
+        };
+        MetaData::set_ttl(ttl);
+        Ok(())
+    }
+}
+
+// Single parse handle over a bundle. The header is parsed and the
+// metadata is checked once, every view afterwards borrows the archive
+// data from the source buffer.
+#[pyclass]
+pub struct ArchiveHandle {
+    source: Py<PyAny>,
+    buffer: PyBuffer<u8>,
+    header: Header,
+    valid: bool,
+    // parsed once for indexed versions
+    index: Option<index::Index>,
+    // files of tar based versions looked up so far (see read_tar)
+    offsets: structure::Offsets,
+}
+
+impl ArchiveHandle {
+    fn data(&self) -> PyResult<&[u8]> {
+        if !self.valid {
             return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system.")))
         }
 
-        let _version: u8 = data[MAGIC.len()];
+        Ok(&buffer::as_slice(&self.buffer)?[self.header.start..self.header.end])
+    }
 
-        let size_start: usize = MAGIC.len() + 1;
-        let size_end: usize = size_start + 8;
-        let package_size: usize = u64::from_le_bytes(data[size_start..size_end].try_into().unwrap()) as usize;
+    // metadata of every entry, without the contents (the GIL is
+    // released while the tar based versions are scanned)
+    fn scan(&self, py: Python<'_>) -> PyResult<Vec<index::Entry>> {
+        match &self.index {
+            Some(index) => Ok(index.entries().to_vec()),
+            None => {
+                let data = self.data()?;
+                let mut entries = Vec::new();
+                py.allow_threads(|| structure::scan(data, |entry| {
+                    entries.push(entry);
+                    true
+                }))?;
+                Ok(entries)
+            }
+        }
+    }
+}
+
+#[pymethods]
+impl ArchiveHandle {
+    #[new]
+    fn new(source: &Bound<'_, PyAny>) -> PyResult<Self> {
+        let buffer = PyBuffer::<u8>::get_bound(source)?;
+        let bundle = buffer::as_slice(&buffer)?;
+
+        // parsing and checking run without the GIL
+        let (header, valid, index) = source.py().allow_threads(|| -> PyResult<_> {
+            let header = parse_header(bundle)?;
+            let valid = MetaData::check(header.metadata.clone());
+
+            let data = &bundle[header.start..header.end];
+            let index = if valid && header.version == VERSION_INDEXED {
+                Some(index::Index::parse(data)?)
+            } else {
+                None
+            };
+            Ok((header, valid, index))
+        })?;
+
+        Ok(Self {
+            source: source.clone().unbind(),
+            buffer,
+            header,
+            valid,
+            index,
+            offsets: Default::default(),
+        })
+    }
+
+    #[getter]
+    fn valid(&self) -> bool {
+        self.valid
+    }
+
+    #[getter]
+    fn version(&self) -> u8 {
+        self.header.version
+    }
+
+    #[getter]
+    fn codec(&self) -> &'static str {
+        self.header.codec.name()
+    }
+
+    #[getter]
+    fn level(&self) -> i32 {
+        self.header.level
+    }
+
+    fn get_meta(&self) -> String {
+        self.header.metadata.collective_hash.clone()
+    }
+
+    fn bytes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        self.data()?;
+
+        // a slice of a memoryview over the source is still a view
+        let view = PyMemoryView::from_bound(self.source.bind(py))?;
+        view.get_item(PySlice::new_bound(py, self.header.start as isize, self.header.end as isize, 1))
+    }
 
-        let package: Bundle = deserialize(&data[size_end..size_end + package_size])
-            .map_err(|e| pyo3::exceptions::PyValueError::new_err(format!("Invalid Data Found: Cannot separate metadata: {}", e)))?;
+    fn entries<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        structure::structure(py, self.data()?, self.header.version == VERSION_INDEXED)
+    }
 
-        if _version != package.metadata.version {
-            return Err(pyo3::exceptions::PyUserWarning::new_err(format!("Content is not compatible with system. Version mismatch.")))
+    // iterates over the entry metadata, the contents are never read.
+    // tar based versions are scanned lazily, as the iteration goes.
+    fn __iter__(&self, py: Python<'_>) -> PyResult<structure::Entries> {
+        match &self.index {
+            Some(index) => Ok(structure::Entries::from(index.entries().to_vec())),
+            None => {
+                self.data()?;
+                let buffer = PyBuffer::<u8>::get_bound(self.source.bind(py))?;
+                structure::Entries::scan(buffer, self.header.start..self.header.end)
+            }
         }
+    }
 
-        Ok(MetaData::check(package.metadata))
+    fn listing<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let dict = PyDict::new_bound(py);
+        for entry in self.scan(py)?.iter().filter(|entry| !entry.directory && !entry.path.starts_with('.')) {
+            dict.set_item(&entry.path, entry.size)?;
+        }
+        Ok(dict)
     }
 
-    #[staticmethod]
-    pub fn validate_meta_hash(version: u8, hash: &str) -> PyResult<bool> {
-        Ok(MetaData::check_hash(hash, version))
+    // path trie of the entries, built once for navigation.
+    fn tree(&self, py: Python<'_>) -> PyResult<PathTree> {
+        let entries = self.scan(py)?;
+        Ok(py.allow_threads(|| PathTree::build(&entries)))
+    }
+
+    #[pyo3(signature = (path, offset=0, length=None))]
+    fn read<'py>(&self, py: Python<'py>, path: &str, offset: u64, length: Option<u64>) -> PyResult<Bound<'py, PyMemoryView>> {
+        let (data, index, offsets) = (self.data()?, self.index.as_ref(), &self.offsets);
+
+        let contents = py.allow_threads(|| -> PyResult<_> {
+            Ok(match index {
+                Some(index) => match index.find(path) {
+                    Some(entry) if !entry.directory => Some(index.archive(data).read(entry, offset, length.unwrap_or(u64::MAX))?),
+                    _ => None,
+                },
+                None => structure::read_tar(data, path, offset, length, offsets)?,
+            })
+        })?;
+
+        match contents {
+            Some(contents) => buffer::memoryview(py, contents),
+            None => Err(pyo3::exceptions::PyKeyError::new_err(path.to_string())),
+        }
+    }
+
+    #[pyo3(signature = (output, patterns=None, threads=None, sync="none", paths=None))]
+    fn export(&self, py: Python<'_>, output: &str, patterns: Option<Vec<String>>, threads: Option<usize>, sync: &str, paths: Option<Vec<String>>) -> PyResult<bool> {
+        let (data, version, index) = (self.data()?, self.header.version, self.index.as_ref());
+        let (filter, sync) = (Filter::new(patterns, paths)?, SyncPolicy::from_name(sync)?);
+        py.allow_threads(|| export(data, version, index, output, &filter, threads.unwrap_or_else(compress::default_workers), sync))
     }
-}
\ No newline at end of file
+}
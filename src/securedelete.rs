@@ -1,14 +1,121 @@
-
 use rand::{distr::Alphanumeric, Rng};
 use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
 use rustypath::RPath;
-use std::path::Path;
+use std::fs::{self, OpenOptions};
+use std::io::{self, Seek, SeekFrom, Write};
+use std::path::{Path, PathBuf};
+use std::sync::Mutex;
+use std::sync::atomic::{AtomicBool, AtomicU64, AtomicUsize, Ordering};
+use std::time::Duration;
+use crate::compress;
+
+// Overwrites go through BUFFER_SIZE buffers aligned to PAGE_SIZE, the
+// fixed patterns are filled once and shared by every worker.
+const PAGE_SIZE: usize = 4096;
+const BUFFER_SIZE: usize = 1 << 20;
+// how often the progress callback is called
+const PROGRESS_INTERVAL: Duration = Duration::from_millis(100);
+
+#[repr(C, align(4096))]
+struct Page([u8; PAGE_SIZE]);
+
+struct AlignedBuffer {
+    pages: Vec<Page>,
+}
+
+impl AlignedBuffer {
+    fn filled(byte: u8) -> Self {
+        Self { pages: (0..BUFFER_SIZE / PAGE_SIZE).map(|_| Page([byte; PAGE_SIZE])).collect() }
+    }
+
+    fn as_slice(&self) -> &[u8] {
+        // the pages are laid out back to back without padding
+        unsafe { std::slice::from_raw_parts(self.pages.as_ptr() as *const u8, BUFFER_SIZE) }
+    }
+
+    fn as_mut_slice(&mut self) -> &mut [u8] {
+        unsafe { std::slice::from_raw_parts_mut(self.pages.as_mut_ptr() as *mut u8, BUFFER_SIZE) }
+    }
+}
+
+#[derive(Clone, Copy, PartialEq)]
+enum Pass {
+    Byte(u8),
+    Random,
+}
+
+#[derive(Clone, Copy, PartialEq)]
+enum SyncMode {
+    Pass,
+    End,
+    Off,
+}
+
+// The passes of a policy are cycled for as many overwrites as asked:
+// legacy (00, ff, aa, 55), dod (00, ff, random: DoD 5220.22-M with 3
+// overwrites), zero, random, or a comma separated list of hex bytes
+// and `random`.
+struct Policy {
+    passes: Vec<Pass>,
+    sync: SyncMode,
+}
+
+impl Policy {
+    fn new(name: &str, overwrites: usize, sync: &str) -> PyResult<Self> {
+        let cycle: Vec<Pass> = match name {
+            "legacy" => vec![Pass::Byte(0x00), Pass::Byte(0xFF), Pass::Byte(0xAA), Pass::Byte(0x55)],
+            "dod" => vec![Pass::Byte(0x00), Pass::Byte(0xFF), Pass::Random],
+            "zero" => vec![Pass::Byte(0x00)],
+            "random" => vec![Pass::Random],
+            custom => custom.split(',').map(|pass| match pass.trim() {
+                "random" => Ok(Pass::Random),
+                byte => u8::from_str_radix(byte.trim_start_matches("0x"), 16).map(Pass::Byte)
+                    .map_err(|_| PyValueError::new_err(format!("Unknown policy: {} (legacy, dod, zero, random or hex bytes).", name))),
+            }).collect::<PyResult<_>>()?,
+        };
+
+        let sync = match sync {
+            "pass" => SyncMode::Pass,
+            "end" => SyncMode::End,
+            "none" => SyncMode::Off,
+            _ => return Err(PyValueError::new_err(format!("Unknown sync mode: {} (pass, end or none).", sync))),
+        };
+
+        Ok(Self { passes: cycle.iter().cycle().take(overwrites).copied().collect(), sync })
+    }
+
+    fn bytes(&self) -> Vec<u8> {
+        let mut bytes: Vec<u8> = self.passes.iter().filter_map(|pass| match pass {
+            Pass::Byte(byte) => Some(*byte),
+            Pass::Random => None,
+        }).collect();
+        bytes.sort_unstable();
+        bytes.dedup();
+        bytes
+    }
+}
+
+#[derive(Default)]
+struct Progress {
+    files: AtomicUsize,
+    written: AtomicU64,
+    total: AtomicU64,
+    cancelled: AtomicBool,
+}
+
+#[derive(Default)]
+struct Report {
+    files: usize,
+    directories: usize,
+    bytes: u64,
+    errors: Vec<(String, String)>,
+}
 
 // Self Destruct Code
 struct SelfDestructUtils {}
 
 impl SelfDestructUtils {
-    #[allow(dead_code)]
     fn get_random_name(len: usize) -> String {
         use rand::rng;
         rng()
@@ -30,83 +137,225 @@ impl SelfDestructUtils {
         }
     }
 
-    fn secure_delete<P: AsRef<Path>>(path: P, overwrites: usize) -> std::io::Result<()> {
-        use std::io::{Write, Seek, SeekFrom};
-        
-        // If it's a directory, handle it recursively
-        if path.as_ref().is_dir() {
-            return Self::secure_delete_dir(path, overwrites);
+    // Runs f over the items on at most `workers` threads, every thread
+    // gets its own state from init.
+    fn for_each<T: Sync, S>(items: &[T], workers: usize, init: impl Fn() -> S + Sync, f: impl Fn(&mut S, &T) + Sync) {
+        let next = AtomicUsize::new(0);
+        std::thread::scope(|scope| {
+            for _ in 0..workers.clamp(1, items.len().max(1)) {
+                scope.spawn(|| {
+                    let mut state = init();
+                    loop {
+                        let index = next.fetch_add(1, Ordering::Relaxed);
+                        if index >= items.len() {
+                            break
+                        }
+                        f(&mut state, &items[index]);
+                    }
+                });
+            }
+        });
+    }
+
+    // Lists the tree level by level, the directories of a level are
+    // read in parallel. Symlinks are never followed (they are removed
+    // like files, without overwriting their targets).
+    fn walk(root: &Path, workers: usize, errors: &Mutex<Vec<(String, String)>>) -> (Vec<(PathBuf, u64)>, Vec<PathBuf>) {
+        let metadata = match fs::symlink_metadata(root) {
+            Ok(metadata) => metadata,
+            Err(e) => {
+                errors.lock().unwrap().push((root.display().to_string(), e.to_string()));
+                return (Vec::new(), Vec::new())
+            }
+        };
+        if !metadata.is_dir() {
+            return (vec![(root.to_path_buf(), if metadata.is_file() { metadata.len() } else { 0 })], Vec::new())
+        }
+
+        let files = Mutex::new(Vec::new());
+        let mut directories = Vec::new();
+        let mut level = vec![root.to_path_buf()];
+
+        while !level.is_empty() {
+            let next = Mutex::new(Vec::new());
+            Self::for_each(&level, workers, || (), |_, directory| {
+                let entries = match fs::read_dir(directory) {
+                    Ok(entries) => entries,
+                    Err(e) => return errors.lock().unwrap().push((directory.display().to_string(), e.to_string())),
+                };
+                for entry in entries {
+                    let entry = match entry {
+                        Ok(entry) => entry,
+                        Err(e) => {
+                            errors.lock().unwrap().push((directory.display().to_string(), e.to_string()));
+                            continue
+                        }
+                    };
+                    match entry.metadata() {
+                        Ok(metadata) if metadata.is_dir() => next.lock().unwrap().push(entry.path()),
+                        Ok(metadata) => files.lock().unwrap().push((entry.path(), if metadata.is_file() { metadata.len() } else { 0 })),
+                        Err(e) => errors.lock().unwrap().push((entry.path().display().to_string(), e.to_string())),
+                    }
+                }
+            });
+            directories.append(&mut level);
+            level = next.into_inner().unwrap();
         }
 
-        let file_size = path.as_ref().metadata()?.len();
+        (files.into_inner().unwrap(), directories)
+    }
+
+    fn overwrite(path: &Path, size: u64, policy: &Policy, patterns: &[(u8, AlignedBuffer)], random: &mut Option<AlignedBuffer>, progress: &Progress) -> io::Result<()> {
         // open the file for overwriting
-        let mut file = std::fs::OpenOptions::new()
-            .write(true)
-            .open(&path)?;
-
-        // Multiple writing patterns for security
-        let patterns: Vec<u8> = vec![0x00, 0xFF, 0xAA, 0x55];
-        
-        // perform multiple overwrites
-        for i in 0..overwrites {
-            let index = i % patterns.len();
-            let pattern = patterns[index];
+        let mut file = OpenOptions::new().write(true).open(path)?;
+
+        for pass in &policy.passes {
             file.seek(SeekFrom::Start(0))?;
-            let buffer = vec![pattern; 4096];
-            let mut remaining = file_size;
-            
+            let mut remaining = size;
+
             while remaining > 0 {
-                let write_size = std::cmp::min(remaining, 4096) as usize;
-                file.write_all(&buffer[..write_size])?;
-                remaining -= write_size as u64;
+                if progress.cancelled.load(Ordering::Relaxed) {
+                    return Err(io::Error::new(io::ErrorKind::Interrupted, "Cancelled."))
+                }
+
+                let length = remaining.min(BUFFER_SIZE as u64) as usize;
+                let buffer = match pass {
+                    Pass::Byte(byte) => patterns.iter().find(|(b, _)| b == byte).map(|(_, buffer)| buffer.as_slice()).unwrap(),
+                    Pass::Random => {
+                        let buffer = random.get_or_insert_with(|| AlignedBuffer::filled(0));
+                        rand::rng().fill(&mut buffer.as_mut_slice()[..length]);
+                        buffer.as_slice()
+                    }
+                };
+                file.write_all(&buffer[..length])?;
+                remaining -= length as u64;
+                progress.written.fetch_add(length as u64, Ordering::Relaxed);
             }
+
             file.flush()?;
-            #[cfg(unix)]
-            file.sync_all()?;
+            if policy.sync == SyncMode::Pass {
+                file.sync_data()?;
+            }
+        }
+
+        if policy.sync == SyncMode::End {
+            file.sync_data()?;
         }
-        
-        drop(file);
-        std::fs::remove_file(path)?;
         Ok(())
     }
 
-    fn secure_delete_dir<P: AsRef<Path>>(path: P, overwrites: usize) -> std::io::Result<()> {
-        let path = path.as_ref();
-        
-        // Ensure the path exists and is a directory
-        if !path.is_dir() {
-            return Ok(());
-        }
+    fn secure_delete(path: &Path, policy: &Policy, workers: usize, progress: &Progress) -> Report {
+        let errors = Mutex::new(Vec::new());
+        let (files, directories) = Self::walk(path, workers, &errors);
+
+        let bytes: u64 = files.iter().map(|(_, size)| size).sum();
+        progress.total.store(bytes * policy.passes.len() as u64, Ordering::Relaxed);
+
+        let patterns: Vec<(u8, AlignedBuffer)> = policy.bytes().into_iter().map(|byte| (byte, AlignedBuffer::filled(byte))).collect();
 
-        // First, recursively process all contents
-        for entry in std::fs::read_dir(path)? {
-            let entry = entry?;
-            let path = entry.path();
-            
-            if path.is_dir() {
-                Self::secure_delete_dir(&path, overwrites)?;
-            } else {
-                Self::secure_delete(&path, overwrites)?;
+        // every worker gets its own random buffer (allocated on the
+        // first random pass)
+        Self::for_each(&files, workers, || None, |random, (file, size)| {
+            let result = fs::symlink_metadata(file).and_then(|metadata| {
+                if metadata.is_file() {
+                    Self::overwrite(file, *size, policy, &patterns, random, progress)?;
+                }
+                // the name goes before the file does
+                let renamed = file.with_file_name(Self::get_random_name(16));
+                match fs::rename(file, &renamed) {
+                    Ok(()) => fs::remove_file(&renamed),
+                    Err(_) => fs::remove_file(file),
+                }
+            });
+            match result {
+                Ok(()) => { progress.files.fetch_add(1, Ordering::Relaxed); }
+                Err(e) => errors.lock().unwrap().push((file.display().to_string(), e.to_string())),
+            }
+        });
+
+        // After all contents are securely deleted, remove the empty
+        // directories (deepest first)
+        let mut removed = 0;
+        for directory in directories.iter().rev() {
+            match fs::remove_dir(directory) {
+                Ok(()) => removed += 1,
+                Err(e) => errors.lock().unwrap().push((directory.display().to_string(), e.to_string())),
             }
         }
 
-        // After all contents are securely deleted, remove the empty directory
-        std::fs::remove_dir(path)?;
-        Ok(())
+        Report {
+            files: progress.files.load(Ordering::Relaxed),
+            directories: removed,
+            bytes: progress.written.load(Ordering::Relaxed),
+            errors: errors.into_inner().unwrap(),
+        }
     }
 }
 
 #[pyclass]
-pub struct SecureDelete {}
+pub struct SecureDelete {
+    report: Report,
+}
 
 #[pymethods]
 impl SecureDelete {
     #[new]
-    fn new(path: &str, overwrites: usize) -> PyResult<Self> {
+    #[pyo3(signature = (path, overwrites, policy="legacy", workers=None, sync="pass", progress=None))]
+    fn new(py: Python<'_>, path: &str, overwrites: usize, policy: &str, workers: Option<usize>, sync: &str, progress: Option<PyObject>) -> PyResult<Self> {
         let path = RPath::from(path).convert_to_pathbuf();
-        SelfDestructUtils::secure_delete(path, overwrites).unwrap_or_else(|_e|{
-            eprintln!("{}", _e);
-        });
-        Ok(Self {})
+        let policy = Policy::new(policy, overwrites, sync)?;
+        let workers = workers.unwrap_or_else(compress::default_workers);
+        let state = Progress::default();
+
+        // this thread reports the progress while the workers wipe, an
+        // error in the callback cancels the rest.
+        let mut failure = None;
+        let report = py.allow_threads(|| std::thread::scope(|scope| {
+            let handle = scope.spawn(|| SelfDestructUtils::secure_delete(&path, &policy, workers, &state));
+            if let Some(callback) = &progress {
+                while !handle.is_finished() {
+                    std::thread::sleep(PROGRESS_INTERVAL);
+                    if failure.is_some() {
+                        continue
+                    }
+                    let args = (state.files.load(Ordering::Relaxed), state.written.load(Ordering::Relaxed), state.total.load(Ordering::Relaxed));
+                    if let Err(e) = Python::with_gil(|py| callback.call1(py, args).map(|_| ())) {
+                        state.cancelled.store(true, Ordering::Relaxed);
+                        failure = Some(e);
+                    }
+                }
+            }
+            handle.join().unwrap()
+        }));
+
+        if let Some(e) = failure {
+            return Err(e)
+        }
+        Ok(Self { report })
+    }
+
+    #[getter]
+    fn ok(&self) -> bool {
+        self.report.errors.is_empty()
     }
-}
\ No newline at end of file
+
+    #[getter]
+    fn files(&self) -> usize {
+        self.report.files
+    }
+
+    #[getter]
+    fn directories(&self) -> usize {
+        self.report.directories
+    }
+
+    #[getter]
+    fn bytes(&self) -> u64 {
+        self.report.bytes
+    }
+
+    #[getter]
+    fn errors(&self) -> Vec<(String, String)> {
+        self.report.errors.clone()
+    }
+}
@@ -1,78 +1,314 @@
 use std::collections::HashMap;
-use std::io::{Cursor, Read};
-use flate2::bufread::GzDecoder;
+use std::io::{self, Read};
+use std::ops::Range;
+use std::sync::Mutex;
+use std::sync::mpsc::{self, Receiver};
+use std::thread::{self, JoinHandle};
 use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
 use pyo3::types::{PyBytes, PyDict};
+use crate::buffer;
+use crate::compress;
+use crate::index;
 
-#[pyclass]
-pub struct Structure {}
+enum Item {
+    Directory(Vec<String>),
+    File(Vec<u8>),
+}
 
-#[pymethods]
-impl Structure {
-    #[staticmethod]
-    fn get<'py>(data: Vec<u8>, py: Python<'py>) -> PyResult<pyo3::Bound<'py, PyDict>> {
-        let dict = PyDict::new_bound(py);
+// Reads every entry (files with their contents, directories with their
+// children) without touching python objects, so the GIL can be released
+// meanwhile.
+fn collect(data: &[u8], indexed: bool) -> PyResult<Vec<(String, Item)>> {
+    let mut items = Vec::new();
 
-        let cursor = Cursor::new(data);
-        let tar = GzDecoder::new(cursor);
-        let mut archive = tar::Archive::new(tar);
+    if indexed {
+        let index = index::Index::parse(data)?;
+        let archive = index.archive(data);
+        for entry in index.entries().iter().filter(|entry| !entry.directory && !entry.path.starts_with('.')) {
+            items.push((entry.path.clone(), Item::File(archive.read(entry, 0, entry.size)?)));
+        }
+        return Ok(items)
+    }
 
-        let mut dir_contents: HashMap<String, Vec<String>> = HashMap::new();
+    let tar = compress::reader(data);
+    let mut archive = tar::Archive::new(tar);
 
-        for entry in archive.entries()? {
-            let mut entry = entry?;
-            let path = entry.path()?;
-            let path_str = path.to_string_lossy().into_owned();
+    let mut dir_contents: HashMap<String, Vec<String>> = HashMap::new();
 
-            if !path_str.starts_with('.') {
-                // Handle dirs
-                if entry.header().entry_type().is_dir() {
-                    dir_contents.insert(path_str.clone(), Vec::new());
-
-                    // Add this directory to its parent's contents
-                    if let Some(parent) = path.parent() {
-                        if let Some(parent_str) = parent.to_str() {
-                            if !parent_str.is_empty() {
-                                dir_contents
-                                    .entry(parent_str.to_string())
-                                    .or_insert_with(Vec::new)
-                                    .push(path_str.clone());
-                            }
-                        }
-                    }
+    for entry in archive.entries()? {
+        let mut entry = entry?;
+        let path = entry.path()?.into_owned();
+        let path_str = path.to_string_lossy().into_owned();
 
-                    dict.set_item(&path_str, Vec::<String>::new())?;
-                } else {
-                    // Handle Files
-                    // Add file to parent directory's contents
-                    if let Some(parent) = path.parent() {
-                        if let Some(parent_str) = parent.to_str() {
-                            if !parent_str.is_empty() {
-                                dir_contents
-                                    .entry(parent_str.to_string())
-                                    .or_insert_with(Vec::new)
-                                    .push(path_str.clone());
-                            }
-                        }
+        if !path_str.starts_with('.') {
+            // Add this entry to its parent's contents
+            if let Some(parent) = path.parent() {
+                if let Some(parent_str) = parent.to_str() {
+                    if !parent_str.is_empty() {
+                        dir_contents
+                            .entry(parent_str.to_string())
+                            .or_insert_with(Vec::new)
+                            .push(path_str.clone());
                     }
-
-                    // Read file contents
-                    let mut buffer = Vec::new();
-                    entry.read_to_end(&mut buffer)?;
-                    
-                    // Add file contents as PyBytes to dictionary
-                    dict.set_item(&path_str, PyBytes::new_bound(py, &buffer))?;
                 }
             }
+
+            if entry.header().entry_type().is_dir() {
+                // Handle dirs
+                dir_contents.entry(path_str.clone()).or_insert_with(Vec::new);
+                items.push((path_str, Item::Directory(Vec::new())));
+            } else {
+                // Handle Files, read file contents
+                let mut buffer = Vec::new();
+                entry.read_to_end(&mut buffer)?;
+                items.push((path_str, Item::File(buffer)));
+            }
+        }
+    }
+
+    // update directory entries with their contents
+    for (path, item) in items.iter_mut() {
+        if let Item::Directory(contents) = item {
+            *contents = dir_contents.remove(path.as_str()).unwrap_or_default();
         }
+    }
+
+    Ok(items)
+}
+
+pub fn structure<'py>(py: Python<'py>, data: &[u8], indexed: bool) -> PyResult<pyo3::Bound<'py, PyDict>> {
+    let items = py.allow_threads(|| collect(data, indexed))?;
+    let dict = PyDict::new_bound(py);
+
+    for (path, item) in items {
+        match item {
+            Item::Directory(contents) => dict.set_item(&path, contents)?,
+            Item::File(contents) => dict.set_item(&path, PyBytes::new_bound(py, &contents))?,
+        }
+    }
+
+    Ok(dict)
+}
+
+// Entry metadata of tar based versions, the contents are skipped. (the
+// index of indexed versions holds the same) Every entry is handed to
+// `visit` as soon as it is read, the scan stops once it returns false.
+pub fn scan(data: &[u8], mut visit: impl FnMut(index::Entry) -> bool) -> io::Result<()> {
+    let mut archive = tar::Archive::new(compress::reader(data));
+
+    for entry in archive.entries()? {
+        let entry = entry?;
+        let header = entry.header();
+        let directory = header.entry_type().is_dir();
+
+        let entry = index::Entry {
+            path: entry.path()?.to_string_lossy().trim_end_matches('/').to_string(),
+            directory,
+            mode: header.mode().unwrap_or(if directory { 0o755 } else { 0o644 }),
+            offset: 0,
+            size: entry.size(),
+            crc32: 0,
+        };
+        if !visit(entry) {
+            break
+        }
+    }
+
+    Ok(())
+}
+
+// Position of the data of every file in the tar stream and its size, by
+// path. Filled by read_tar as it scans, so a file is looked up once.
+pub type Offsets = Mutex<HashMap<String, (u64, u64)>>;
+
+// Scans the tar stream up to the file, recording every file passed on
+// the way.
+fn locate(data: &[u8], path: &str, offsets: &Offsets) -> io::Result<Option<(u64, u64)>> {
+    let mut offsets = offsets.lock().unwrap();
+    let mut archive = tar::Archive::new(compress::reader(data));
+
+    for entry in archive.entries()? {
+        let entry = entry?;
+        if entry.header().entry_type().is_dir() {
+            continue
+        }
+
+        // the first of duplicate paths wins, as in a plain scan
+        let name = entry.path()?.to_string_lossy().into_owned();
+        let found = *offsets.entry(name.clone()).or_insert((entry.raw_file_position(), entry.size()));
+        if name == path {
+            return Ok(Some(found))
+        }
+    }
+
+    Ok(None)
+}
+
+// Reads `length` bytes (default: the rest) of a file of a tar based
+// version from `offset` on, None if it is not in the archive. The file
+// is looked up once (see Offsets); afterwards a read skips the framed
+// blocks before the range without decoding them, while a gzip stream
+// is still decompressed from the start on every read.
+pub fn read_tar(data: &[u8], path: &str, offset: u64, length: Option<u64>, offsets: &Offsets) -> io::Result<Option<Vec<u8>>> {
+    let path = path.trim_start_matches('/');
+
+    let known = offsets.lock().unwrap().get(path).copied();
+    let (position, size) = match known {
+        Some(found) => found,
+        None => match locate(data, path, offsets)? {
+            Some(found) => found,
+            None => return Ok(None),
+        },
+    };
 
-        // update directory entries with their contents
-        for (dir_path, contents)  in dir_contents {
-            if dict.contains(&dir_path)? {
-                dict.set_item(&dir_path, contents)?;
+    let offset = offset.min(size);
+    let length = length.unwrap_or(u64::MAX).min(size - offset);
+
+    // the recorded size is not trusted for more than a block up front
+    let mut buffer = Vec::with_capacity(length.min(compress::BLOCK_SIZE as u64) as usize);
+    compress::reader_at(data, position + offset)?.take(length).read_to_end(&mut buffer)?;
+    Ok(Some(buffer))
+}
+
+// Metadata of a single entry.
+#[pyclass(frozen, name = "Entry")]
+pub struct EntryInfo {
+    #[pyo3(get)]
+    path: String,
+    #[pyo3(get)]
+    kind: &'static str,
+    #[pyo3(get)]
+    size: u64,
+    #[pyo3(get)]
+    mode: u32,
+}
+
+#[pymethods]
+impl EntryInfo {
+    fn __repr__(&self) -> String {
+        format!("Entry(path={:?}, kind={:?}, size={}, mode=0o{:o})", self.path, self.kind, self.size, self.mode)
+    }
+}
+
+// entries scanned ahead of the iteration
+const SCAN_DEPTH: usize = 256;
+
+// Lazy scan of a tar based version. A thread scans the stream into a
+// bounded queue, so only as much of the archive is decompressed as the
+// iteration asks for (plus the queue).
+struct Scanner {
+    receiver: Option<Receiver<io::Result<index::Entry>>>,
+    thread: Option<JoinHandle<()>>,
+    // keeps the scanned memory alive, released only after the thread
+    // is joined (see Drop)
+    _buffer: PyBuffer<u8>,
+}
+
+impl Scanner {
+    fn new(buffer: PyBuffer<u8>, range: Range<usize>) -> PyResult<Self> {
+        let data = buffer::as_slice(&buffer)?
+            .get(range)
+            .ok_or_else(|| pyo3::exceptions::PyValueError::new_err(format!("Archive lies outside the buffer.")))?;
+
+        // the thread borrows the exported memory, which stays in place
+        // for as long as the buffer is held (see buffer::as_slice).
+        let data: &'static [u8] = unsafe { std::slice::from_raw_parts(data.as_ptr(), data.len()) };
+
+        let (queue, receiver) = mpsc::sync_channel(SCAN_DEPTH);
+        let thread = thread::spawn(move || {
+            if let Err(e) = scan(data, |entry| queue.send(Ok(entry)).is_ok()) {
+                let _ = queue.send(Err(e));
             }
+        });
+
+        Ok(Self { receiver: Some(receiver), thread: Some(thread), _buffer: buffer })
+    }
+
+    // the next entry, waiting without the GIL
+    fn next(&mut self, py: Python<'_>) -> io::Result<Option<index::Entry>> {
+        let receiver = match self.receiver.take() {
+            Some(receiver) => receiver,
+            None => return Ok(None),
+        };
+
+        let (receiver, entry) = py.allow_threads(move || {
+            let entry = receiver.recv();
+            (receiver, entry)
+        });
+
+        match entry {
+            Ok(Ok(entry)) => {
+                self.receiver = Some(receiver);
+                Ok(Some(entry))
+            }
+            Ok(Err(e)) => Err(e),
+            Err(_) => Ok(None),
+        }
+    }
+}
+
+impl Drop for Scanner {
+    fn drop(&mut self) {
+        // closing the queue stops the scan at its next entry
+        self.receiver.take();
+        if let Some(thread) = self.thread.take() {
+            let _ = thread.join();
         }
+    }
+}
+
+// Iterator over entry metadata.
+#[pyclass]
+pub struct Entries {
+    entries: std::vec::IntoIter<index::Entry>,
+    scanner: Option<Scanner>,
+}
+
+impl From<Vec<index::Entry>> for Entries {
+    fn from(entries: Vec<index::Entry>) -> Self {
+        Self { entries: entries.into_iter(), scanner: None }
+    }
+}
+
+impl Entries {
+    // scans the tar based archive data at `range` of the buffer lazily
+    pub fn scan(buffer: PyBuffer<u8>, range: Range<usize>) -> PyResult<Self> {
+        Ok(Self { entries: Vec::new().into_iter(), scanner: Some(Scanner::new(buffer, range)?) })
+    }
+}
+
+#[pymethods]
+impl Entries {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
 
-        Ok(dict)
+    fn __next__(mut slf: PyRefMut<'_, Self>) -> PyResult<Option<EntryInfo>> {
+        let py = slf.py();
+        let entries = &mut *slf;
+        let entry = match entries.scanner.as_mut() {
+            Some(scanner) => scanner.next(py)?,
+            None => entries.entries.next(),
+        };
+
+        Ok(entry.map(|entry| EntryInfo {
+            kind: if entry.directory { "directory" } else { "file" },
+            path: entry.path,
+            size: entry.size,
+            mode: entry.mode,
+        }))
+    }
+}
+
+#[pyclass]
+pub struct Structure {}
+
+#[pymethods]
+impl Structure {
+    // the version of the bundle the data comes from (see Dismantle)
+    #[staticmethod]
+    fn get<'py>(data: PyBuffer<u8>, version: u8, py: Python<'py>) -> PyResult<pyo3::Bound<'py, PyDict>> {
+        structure(py, buffer::as_slice(&data)?, version == crate::repack::VERSION_INDEXED)
     }
 }
\ No newline at end of file
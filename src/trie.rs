@@ -0,0 +1,142 @@
+use std::collections::HashMap;
+use pyo3::prelude::*;
+use crate::index;
+
+struct Node {
+    name: String,
+    path: String,
+    parent: u32,
+    directory: bool,
+    size: u64,
+    children: Vec<u32>,
+}
+
+// Path trie over the entries of an archive. Every node has a numeric id
+// (the root is 0), children are kept per directory (directories first,
+// then by name) so any level can be listed directly and any id maps to
+// its full path in constant time.
+#[pyclass(frozen)]
+pub struct PathTree {
+    nodes: Vec<Node>,
+}
+
+impl PathTree {
+    pub fn build(entries: &[index::Entry]) -> Self {
+        let mut nodes = vec![Node {
+            name: String::from("/"),
+            path: String::from("/"),
+            parent: 0,
+            directory: true,
+            size: 0,
+            children: Vec::new(),
+        }];
+        let mut directories: HashMap<String, u32> = HashMap::from([(String::new(), 0)]);
+
+        for entry in entries.iter().filter(|entry| !entry.path.starts_with('.')) {
+            let path = entry.path.trim_matches('/');
+            if path.is_empty() {
+                continue
+            }
+
+            if entry.directory {
+                Self::directory(&mut nodes, &mut directories, path);
+                continue
+            }
+
+            let (parent_path, name) = path.rsplit_once('/').unwrap_or(("", path));
+            let parent = Self::directory(&mut nodes, &mut directories, parent_path);
+            let id = nodes.len() as u32;
+
+            nodes.push(Node {
+                name: name.to_string(),
+                path: format!("/{}", path),
+                parent,
+                directory: false,
+                size: entry.size,
+                children: Vec::new(),
+            });
+            nodes[parent as usize].children.push(id);
+        }
+
+        // directories first, then by name
+        for position in 0..nodes.len() {
+            let mut children = std::mem::take(&mut nodes[position].children);
+            children.sort_by(|a, b| {
+                let (a, b) = (&nodes[*a as usize], &nodes[*b as usize]);
+                (!a.directory, &a.name).cmp(&(!b.directory, &b.name))
+            });
+            nodes[position].children = children;
+        }
+
+        Self { nodes }
+    }
+
+    // id of the directory, created along with its parents if missing.
+    fn directory(nodes: &mut Vec<Node>, directories: &mut HashMap<String, u32>, path: &str) -> u32 {
+        if let Some(id) = directories.get(path) {
+            return *id
+        }
+
+        let (parent_path, name) = path.rsplit_once('/').unwrap_or(("", path));
+        let parent = Self::directory(nodes, directories, parent_path);
+        let id = nodes.len() as u32;
+
+        nodes.push(Node {
+            name: name.to_string(),
+            path: format!("/{}", path),
+            parent,
+            directory: true,
+            size: 0,
+            children: Vec::new(),
+        });
+        nodes[parent as usize].children.push(id);
+        directories.insert(path.to_string(), id);
+        id
+    }
+
+    fn node(&self, id: u32) -> PyResult<&Node> {
+        self.nodes
+            .get(id as usize)
+            .ok_or_else(|| pyo3::exceptions::PyIndexError::new_err(format!("No node with id {}.", id)))
+    }
+}
+
+#[pymethods]
+impl PathTree {
+    fn __len__(&self) -> usize {
+        self.nodes.len()
+    }
+
+    // (id, name, is directory) of every child of the node.
+    #[pyo3(signature = (id=0))]
+    fn children(&self, id: u32) -> PyResult<Vec<(u32, String, bool)>> {
+        Ok(self.node(id)?
+            .children
+            .iter()
+            .map(|child| {
+                let node = &self.nodes[*child as usize];
+                (*child, node.name.clone(), node.directory)
+            })
+            .collect())
+    }
+
+    fn path(&self, id: u32) -> PyResult<String> {
+        Ok(self.node(id)?.path.clone())
+    }
+
+    fn name(&self, id: u32) -> PyResult<String> {
+        Ok(self.node(id)?.name.clone())
+    }
+
+    fn parent(&self, id: u32) -> PyResult<u32> {
+        Ok(self.node(id)?.parent)
+    }
+
+    fn is_dir(&self, id: u32) -> PyResult<bool> {
+        Ok(self.node(id)?.directory)
+    }
+
+    fn size(&self, id: u32) -> PyResult<u64> {
+        Ok(self.node(id)?.size)
+    }
+}
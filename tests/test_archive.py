@@ -0,0 +1,32 @@
+import pickle
+
+from nyeda.types.archive import ArchByte
+
+# ArchByte(b'NYEDA\x00\xff') pickled by the former (bytearray based) class,
+# as stored in the cryptograms of older builds.
+LEGACY = (
+    b'\x80\x04\x95^\x00\x00\x00\x00\x00\x00\x00\x8c\x13nyeda.types.archive\x94'
+    b'\x8c\x08ArchByte\x94\x93\x94)\x81\x94}\x94\x8c\t__bytes__\x94\x8c\x08builtins'
+    b'\x94\x8c\tbytearray\x94\x93\x94C\x07NYEDA\x00\xff\x94\x85\x94R\x94sb.'
+)
+
+
+def test_unpickle_legacy():
+    __archbyte__ = pickle.loads(LEGACY)
+    assert isinstance(__archbyte__, ArchByte)
+    assert len(__archbyte__) == 7
+    assert bytes(memoryview(__archbyte__)) == b'NYEDA\x00\xff'
+    assert list(__archbyte__) == list(b'NYEDA\x00\xff')
+    assert bytes(__archbyte__[1:5]) == b'YEDA'
+
+
+def test_pickle_roundtrip():
+    __archbyte__ = pickle.loads(pickle.dumps(ArchByte(b'\x00\x01\x02')))
+    assert bytes(memoryview(__archbyte__)) == b'\x00\x01\x02'
+
+
+def test_zero_copy_view():
+    __data__ = bytearray(b'abc')
+    __archbyte__ = ArchByte(__data__)
+    __data__[0] = ord('x')
+    assert bytes(memoryview(__archbyte__)) == b'xbc'